@@ -0,0 +1,112 @@
+# arranque.py
+
+"""
+Control del tiempo de arranque en frío.
+
+    python arranque.py                 -> informe de imports (python -X importtime) de main
+    python arranque.py --check [ms]    -> exit 1 si el camino sólo-GA o `import main` superan
+                                          el presupuesto o cargan alguna librería pesada
+
+tests/test_arranque.py hace la misma comprobación con pytest.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+# Camino que usan los workers (sweep, corpus...) y cualquier ejecución sólo-GA
+CODIGO_GA = "import config, ga.motor"
+CODIGO_MAIN = "import main"
+
+PRESUPUESTO_GA_MS = 150.0
+PRESUPUESTO_MAIN_MS = 300.0
+MODULOS_PESADOS = ("music21", "matplotlib", "numpy")
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+
+def _python(args: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def medir_arranque(codigo: str = CODIGO_GA, repeticiones: int = 5) -> tuple[float, list[str]]:
+    """
+    Lanza un intérprete nuevo por repetición y mide el tiempo de los imports.
+    Devuelve (mejor tiempo en ms, módulos pesados cargados).
+    """
+    sonda = (
+        "import time, sys, json\n"
+        "t0 = time.perf_counter()\n"
+        f"{codigo}\n"
+        "ms = (time.perf_counter() - t0) * 1000.0\n"
+        f"print(json.dumps([ms, [m for m in {MODULOS_PESADOS!r} if m in sys.modules]]))\n"
+    )
+
+    mejor = float("inf")
+    pesados: list[str] = []
+    for _ in range(repeticiones):
+        ms, cargados = json.loads(_python(["-c", sonda]).stdout.strip().splitlines()[-1])
+        mejor = min(mejor, ms)
+        pesados = cargados
+    return mejor, pesados
+
+
+def informe_imports(codigo: str = CODIGO_MAIN, top: int = 15) -> list[tuple[int, int, str]]:
+    """
+    Ejecuta el código con -X importtime y muestra los módulos más caros (acumulado).
+    Devuelve [(self_us, acumulado_us, modulo), ...] ordenado por acumulado.
+    """
+    res = _python(["-X", "importtime", "-c", codigo])
+
+    filas = []
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        partes = line[len("import time:"):].split("|")
+        if len(partes) != 3:
+            continue
+        filas.append((int(partes[0]), int(partes[1]), partes[2].rstrip()))
+
+    filas.sort(key=lambda x: x[1], reverse=True)
+
+    print(f"⏱️ Imports de '{codigo}' (top {top} por tiempo acumulado)")
+    for self_us, acum_us, mod in filas[:top]:
+        print(f"   {acum_us / 1000:8.1f} ms acum | {self_us / 1000:7.1f} ms propio | {mod}")
+    return filas
+
+
+def comprobar_presupuesto(presupuesto_ms: float = PRESUPUESTO_GA_MS,
+                          presupuesto_main_ms: float = PRESUPUESTO_MAIN_MS) -> bool:
+    """
+    True si el camino sólo-GA y `import main` arrancan dentro de su presupuesto
+    y sin librerías pesadas (main sólo las carga dentro de main()).
+    """
+    ok = True
+    for nombre, codigo, limite in (("sólo-GA", CODIGO_GA, presupuesto_ms),
+                                   ("main", CODIGO_MAIN, presupuesto_main_ms)):
+        ms, pesados = medir_arranque(codigo)
+        ok_caso = ms <= limite and not pesados
+        ok = ok and ok_caso
+
+        estado = "✅" if ok_caso else "❌"
+        print(f"{estado} Arranque {nombre}: {ms:.1f} ms (presupuesto {limite:.0f} ms)")
+        if pesados:
+            print(f"   ⚠️ Librerías pesadas cargadas: {', '.join(pesados)}")
+    return ok
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--check":
+        presupuesto = float(sys.argv[2]) if len(sys.argv) > 2 else PRESUPUESTO_GA_MS
+        sys.exit(0 if comprobar_presupuesto(presupuesto) else 1)
+
+    informe_imports()
+    print()
+    comprobar_presupuesto()
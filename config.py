@@ -41,6 +41,43 @@ GENERACIONES = 120
 PROB_MUTACION = 0.08
 K_TORNEO = 3
 ELITISMO = 2
+INICIALIZADOR = "escalar"  # "escalar" | "vectorizado" | "musical" (ver Poblacion.crear_aleatorios)
+FRAC_ALEATORIA_SEMILLAS = 0.5  # con banco de semillas: fracción de la población inicial aleatoria
+
+REPRODUCCION_EN_SITIO = True   # hijos escritos en una población preasignada (doble buffer)
+PROCESOS_EVALUACION = 0        # >0: fitness de los hijos en N procesos con memoria compartida
+SUSTITUTO = False              # cribar hijos con un fitness sustituto aprendido (ga/sustituto.py).
+                               # Sólo compensa con términos de fitness caros: con el fitness actual
+                               # ahorra ~1/3 de las evaluaciones pero cuesta ~1.5x de CPU por ejecución
+HISTORIAL_COLUMNAR = True      # además del CSV, cada ejecución se añade a logs/historial (ga/historial.py)
+SEMILLA = None                 # None -> semilla nueva por ejecución (se guarda en logs/preset.txt);
+                               # int o "entropia/i/j" para repetir una ejecución exacta
+
+# =========================
+# PERFILADO (logs/perfil_*)
+# =========================
+
+PERFIL_FASES = False            # tiempos por fase y generación
+PERFIL_CPROFILE = False         # cProfile de toda la ejecución
+PERFIL_TRACEMALLOC_GENS = ()    # generaciones con snapshot de memoria, p. ej. (1, 90, 180)
+
+# =========================
+# SERVICIO (servicio.py)
+# =========================
+
+SERVICIO_HOST = "127.0.0.1"
+SERVICIO_PUERTO = 8765
+SERVICIO_PROCESOS = 2        # trabajos GA simultáneos (procesos del pool)
+SERVICIO_MAX_COLA = 64       # trabajos en vuelo (en curso + esperando); más -> 503
+SERVICIO_MAX_CACHE = 256     # resultados guardados (LRU)
+SERVICIO_MAX_GENERACIONES = 2000  # tope por petición; más -> 400
+SERVICIO_MAX_LOTE = 1000     # trabajos por petición a /lotes (un solo GA vectorizado)
+
+# =========================
+# EXPORTACIÓN
+# =========================
+
+TOP_K_EXPORT = 10  # melodías distintas exportadas por ejecución
 
 
 from typing import Optional, List
@@ -0,0 +1,377 @@
+# diferencial.py
+
+"""
+Banco diferencial: motores rápidos contra la referencia escalar.
+
+    python diferencial.py            -> informe completo (exit 1 si algún motor discrepa)
+    python diferencial.py 500        -> 500 genomas aleatorios por contexto (def 2000)
+
+Fitness: cada motor se compara con calcular_fitness_referencia en el total y, si
+da desglose, término a término en todos los casos, sobre genomas aleatorios y
+adversariales, en varios contextos armónicos y presets de pesos. Los presets con
+términos que la referencia no tiene (p. ej. w_cadencia) comparan los motores
+rápidos con el pipeline. Los motores por lotes puntúan todos los genomas de cada
+(contexto, preset) en una llamada, y esa llamada es la que se cronometra.
+Operadores: cada variante en sitio (*_en / *_en_sitio) debe producir exactamente
+los mismos hijos que su versión con copia con generadores de la misma semilla.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import random
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional
+
+import config as cfg
+
+from ga.individuo import Individuo
+from ga.fitness import PesosFitness, calcular_fitness_referencia
+from ga.presets import pesos_desde_sliders
+from ga import operadores as ops
+
+TOLERANCIA = 1e-9
+
+# (tonica, modo, acordes) sobre los que se repite todo el banco
+CONTEXTOS = [
+    ("C", "mayor", ["C", "G", "Am", "F", "C", "G", "F", "C"]),
+    ("A", "menor", ["Am", "Dm", "E", "Am", "F", "Bdim", "E", "Am"]),
+    ("Eb", "mayor", ["Eb", "Cm", "Ab", "Bb", "Gaug", "Cm", "Bb", "Eb"]),
+]
+
+
+# =========================================================
+# Registro de motores
+# =========================================================
+
+@dataclass
+class MotorFitness:
+    """fn puntúa un genoma; lote (si lo hay) puntúa una lista de genomas en una llamada."""
+    nombre: str
+    fn: Callable[[List[int], PesosFitness], float]
+    desglose: Optional[Callable[[List[int], PesosFitness], Dict[str, float]]] = None
+    lote: Optional[Callable[[List[List[int]], PesosFitness], List[float]]] = None
+
+    def puntuar(self, genomas: List[List[int]], pesos: PesosFitness) -> List[float]:
+        if self.lote is not None:
+            return list(self.lote(genomas, pesos))
+        return [self.fn(g, pesos) for g in genomas]
+
+
+MOTORES_FITNESS: Dict[str, MotorFitness] = {}
+
+
+def registrar_motor_fitness(
+    nombre: str,
+    fn: Callable[[List[int], PesosFitness], float],
+    desglose: Optional[Callable[[List[int], PesosFitness], Dict[str, float]]] = None,
+    lote: Optional[Callable[[List[List[int]], PesosFitness], List[float]]] = None,
+) -> None:
+    MOTORES_FITNESS[nombre] = MotorFitness(nombre, fn, desglose, lote)
+
+
+def _desglose_referencia(genes: List[int], pesos: PesosFitness) -> Dict[str, float]:
+    d: Dict[str, float] = {}
+    calcular_fitness_referencia(genes, pesos, desglose=d)
+    return d
+
+
+REFERENCIA = MotorFitness("referencia", calcular_fitness_referencia, _desglose_referencia)
+
+
+def _registrar_motores_incluidos() -> None:
+    from ga.fitness import calcular_fitness
+    from ga.terminos import compilar
+    registrar_motor_fitness("pipeline", calcular_fitness, lambda g, p: compilar(p).desglose(g))
+
+    try:
+        from ga.tensorial import fitness_genomas
+    except ImportError:
+        return
+
+    # Contexto de config; un lote = todos los genomas de un (contexto, preset)
+    registrar_motor_fitness("tensor", lambda g, p: float(fitness_genomas([g], p)[0]),
+                            lote=lambda gs, p: fitness_genomas(gs, p).tolist())
+
+
+# Pares (referencia con copia, variante en sitio)
+CRUCES = [
+    ("crossover_por_compas", ops.crossover_por_compas, ops.crossover_por_compas_en),
+    ("crossover_multicorte", ops.crossover_multicorte, ops.crossover_multicorte_en),
+    ("crossover_uniforme_compas", ops.crossover_uniforme_compas, ops.crossover_uniforme_compas_en),
+    ("crossover_motivo", ops.crossover_motivo, ops.crossover_motivo_en),
+]
+
+MUTACIONES = [
+    ("mutar", ops.mutar, ops.mutar_en_sitio),
+    ("mutar_ritmo", ops.mutar_ritmo, ops.mutar_ritmo_en_sitio),
+    ("mutar_transponer_compas", ops.mutar_transponer_compas, ops.mutar_transponer_compas_en_sitio),
+    ("mutar_duplicar_compas", ops.mutar_duplicar_compas, ops.mutar_duplicar_compas_en_sitio),
+]
+
+
+# =========================================================
+# Genomas
+# =========================================================
+
+def genomas_adversariales() -> List[List[int]]:
+    """Casos límite de la representación REST / HOLD / NOTE."""
+    L = cfg.LONGITUD_MELODIA
+    sub = cfg.SUBDIVISIONES_POR_COMPAS
+    R, H = cfg.REST, cfg.HOLD
+    mid = (cfg.RANGO_MIN + cfg.RANGO_MAX) // 2
+    casos = [
+        [H] * L,                                            # todo HOLD (sin nota previa)
+        [R] * L,                                            # todo REST
+        [mid] * L,                                          # todo ataques, misma nota
+        [mid] + [H] * (L - 1),                              # una nota sostenida
+        [cfg.RANGO_MIN - 12] * L,                           # fuera de rango por abajo
+        [cfg.RANGO_MAX + 12] * L,                           # fuera de rango por arriba
+        [0, 127] * (L // 2),                                # extremos MIDI
+        [R if i % sub == sub - 1 else H if i % sub == 0 else mid for i in range(L)],  # HOLD tras REST en la frontera
+        [mid if i % sub == 0 else H for i in range(L)],     # un ataque por compás
+        [mid + (i % 5) if i % 2 == 0 else R for i in range(L)],
+        [R] * (L - 1) + [mid],                              # única nota al final
+        [mid] + [R] * (L - 1),                              # única nota al principio
+        [H, mid] + [H] * (L - 2),                           # HOLD inicial huérfano
+        [cfg.RANGO_MIN + (i * 7) % 13 for i in range(L)],   # saltos grandes
+    ]
+    # Compases idénticos (máximo de repetición) y clímax al principio / al final
+    compas = [mid, H, mid + 2, R, mid + 4, H, mid + 2, R]
+    casos.append(compas * (L // sub))
+    casos.append([cfg.RANGO_MAX] + [mid] * (L - 1))
+    casos.append([mid] * (L - 1) + [cfg.RANGO_MAX])
+    return casos
+
+
+def genomas_aleatorios(n: int, rng: random.Random) -> List[List[int]]:
+    """Mezcla de genomas uniformes (como crear_aleatorio) y con densidades extremas de REST/HOLD."""
+    out = []
+    for k in range(n):
+        p_rest, p_hold = ((0.10, 0.15), (0.60, 0.10), (0.05, 0.80), (0.0, 0.0))[k % 4]
+        g = []
+        for _ in range(cfg.LONGITUD_MELODIA):
+            r = rng.random()
+            if r < p_rest:
+                g.append(cfg.REST)
+            elif r < p_rest + p_hold:
+                g.append(cfg.HOLD)
+            else:
+                g.append(rng.randint(cfg.RANGO_MIN - 2, cfg.RANGO_MAX + 2))
+        out.append(g)
+    return out
+
+
+def presets_pesos(rng: random.Random) -> List[PesosFitness]:
+    """Pesos por defecto, sliders aleatorios y presets con términos apagados."""
+    base = PesosFitness()
+    out = [base]
+    out += [pesos_desde_sliders(*[rng.randint(0, 100) for _ in range(5)])[0] for _ in range(3)]
+    out.append(pesos_desde_sliders(0, 0, 0, 0, 0)[0])
+    out.append(replace(base, w_movimiento=0.0, w_contorno=0.0, pen_fuera_rango=0.0, pen_hold_ratio=0.0))
+    out.append(replace(base, pen_inicio_compas_no_acorde=0.0, w_acorde=0.0, w_escala=0.0))
+    out.append(replace(base, w_cadencia=0.15))
+    return out
+
+
+def terminos_sin_referencia(pesos: PesosFitness) -> set:
+    """Términos activos del pipeline que calcular_fitness_referencia no implementa."""
+    from ga.terminos import compilar
+    return set(compilar(pesos).nombres) - set(_desglose_referencia([cfg.REST] * cfg.LONGITUD_MELODIA, pesos))
+
+
+# =========================================================
+# Comparación
+# =========================================================
+
+@dataclass
+class Informe:
+    nombre: str
+    casos: int = 0
+    fallos: int = 0
+    max_error: float = 0.0
+    t_ref: float = 0.0
+    t_motor: float = 0.0
+    terminos_con_error: Dict[str, int] = field(default_factory=dict)
+    ejemplo: Optional[str] = None
+
+    @property
+    def aceleracion(self) -> float:
+        return self.t_ref / self.t_motor if self.t_motor > 0 else float("inf")
+
+    def linea(self) -> str:
+        estado = "✅" if self.fallos == 0 else "❌"
+        out = (f"{estado} {self.nombre:28s} | casos={self.casos:7d} | fallos={self.fallos:5d} | "
+               f"max_err={self.max_error:.2e} | x{self.aceleracion:5.2f}")
+        if self.terminos_con_error:
+            out += f" | términos: {self.terminos_con_error}"
+        if self.ejemplo:
+            out += f"\n      ej.: {self.ejemplo}"
+        return out
+
+
+def _aplicar_contexto(tonica: str, modo: str, acordes: List[str]) -> None:
+    cfg.TONICA, cfg.MODO, cfg.ACORDES = tonica, modo, list(acordes)
+
+
+def comparar_fitness(
+    motor: MotorFitness,
+    genomas: List[List[int]],
+    presets: List[PesosFitness],
+    referencia: MotorFitness = REFERENCIA,
+) -> Informe:
+    nombre = motor.nombre if referencia is REFERENCIA else f"{motor.nombre} ~ {referencia.nombre}"
+    inf = Informe(nombre)
+    desgloses = motor.desglose is not None and referencia.desglose is not None
+    contexto_previo = (cfg.TONICA, cfg.MODO, cfg.ACORDES)
+    try:
+        for tonica, modo, acordes in CONTEXTOS:
+            _aplicar_contexto(tonica, modo, acordes)
+            for pesos in presets:
+                t0 = time.perf_counter()
+                ref = referencia.puntuar(genomas, pesos)
+                t1 = time.perf_counter()
+                res = motor.puntuar(genomas, pesos)
+                t2 = time.perf_counter()
+                inf.t_ref += t1 - t0
+                inf.t_motor += t2 - t1
+
+                for g, a, b in zip(genomas, ref, res):
+                    inf.casos += 1
+                    err = abs(a - b)
+                    inf.max_error = max(inf.max_error, err)
+                    fallo = err > TOLERANCIA
+
+                    # Término a término en todos los casos: errores que se compensan no llegan al total
+                    if desgloses:
+                        d_ref = referencia.desglose(g, pesos)
+                        d_mot = motor.desglose(g, pesos)
+                        for k in d_ref.keys() | d_mot.keys():
+                            err_k = abs(d_ref.get(k, 0.0) - d_mot.get(k, 0.0))
+                            if err_k > TOLERANCIA:
+                                fallo = True
+                                inf.max_error = max(inf.max_error, err_k)
+                                inf.terminos_con_error[k] = inf.terminos_con_error.get(k, 0) + 1
+
+                    if fallo:
+                        inf.fallos += 1
+                        if inf.ejemplo is None:
+                            inf.ejemplo = f"{tonica} {modo} | ref={a:.6f} motor={b:.6f} | genes={g}"
+    finally:
+        _aplicar_contexto(*contexto_previo)
+    return inf
+
+
+def _copias(genomas: List[List[int]]) -> List[Individuo]:
+    return [Individuo(list(g)) for g in genomas]
+
+
+def comparar_cruce(nombre: str, ref: Callable, en_sitio: Callable, genomas: List[List[int]], semilla: int) -> Informe:
+    inf = Informe(nombre)
+    padres = _copias(genomas)
+    pares = list(zip(padres[0::2], padres[1::2]))
+    originales = [list(p.genes) for p in padres]
+
+    rng = random.Random(semilla)
+    t0 = time.perf_counter()
+    hijos_ref = [ref(p1, p2, rng) for p1, p2 in pares]
+    inf.t_ref = time.perf_counter() - t0
+
+    buffers = [(Individuo([cfg.REST] * cfg.LONGITUD_MELODIA), Individuo([cfg.REST] * cfg.LONGITUD_MELODIA))
+               for _ in pares]
+    rng = random.Random(semilla)
+    t0 = time.perf_counter()
+    for (p1, p2), (h1, h2) in zip(pares, buffers):
+        en_sitio(p1, p2, h1, h2, rng)
+    inf.t_motor = time.perf_counter() - t0
+
+    for (r1, r2), (h1, h2) in zip(hijos_ref, buffers):
+        inf.casos += 1
+        if r1.genes != h1.genes or r2.genes != h2.genes:
+            inf.fallos += 1
+            inf.ejemplo = inf.ejemplo or f"ref={r1.genes} en_sitio={h1.genes}"
+    if [p.genes for p in padres] != originales:
+        inf.fallos += 1
+        inf.ejemplo = "un operador modificó a los padres"
+    return inf
+
+
+def comparar_mutacion(nombre: str, ref: Callable, en_sitio: Callable, genomas: List[List[int]],
+                      semilla: int, prob_gen: float = 0.2) -> Informe:
+    inf = Informe(nombre)
+    padres = _copias(genomas)
+    originales = [list(p.genes) for p in padres]
+
+    rng = random.Random(semilla)
+    t0 = time.perf_counter()
+    hijos_ref = [ref(p, prob_gen=prob_gen, rng=rng) for p in padres]
+    inf.t_ref = time.perf_counter() - t0
+
+    copias = _copias(genomas)
+    rng = random.Random(semilla)
+    t0 = time.perf_counter()
+    for c in copias:
+        en_sitio(c, prob_gen=prob_gen, rng=rng)
+    inf.t_motor = time.perf_counter() - t0
+
+    for r, c in zip(hijos_ref, copias):
+        inf.casos += 1
+        if r.genes != c.genes or c.fitness is not None:
+            inf.fallos += 1
+            inf.ejemplo = inf.ejemplo or f"ref={r.genes} en_sitio={c.genes}"
+    if [p.genes for p in padres] != originales:
+        inf.fallos += 1
+        inf.ejemplo = "la versión con copia modificó al original"
+    return inf
+
+
+def ejecutar_banco(n_aleatorios: int = 2000, semilla: int = 12345, verbose: bool = True) -> List[Informe]:
+    if not MOTORES_FITNESS:
+        _registrar_motores_incluidos()
+
+    rng = random.Random(semilla)
+    genomas = genomas_adversariales() + genomas_aleatorios(n_aleatorios, rng)
+    presets = presets_pesos(rng)
+    # Los términos sin referencia escalar (w_cadencia) se comparan entre motores rápidos
+    con_ref = [p for p in presets if not terminos_sin_referencia(p)]
+    sin_ref = [p for p in presets if terminos_sin_referencia(p)]
+
+    informes = []
+    if verbose:
+        print(f"🔬 Banco diferencial: {len(genomas)} genomas x {len(CONTEXTOS)} contextos x {len(presets)} presets "
+              f"({len(sin_ref)} sin referencia escalar)")
+
+    for motor in MOTORES_FITNESS.values():
+        informes.append(comparar_fitness(motor, genomas, con_ref))
+        if verbose:
+            print(informes[-1].linea())
+
+    base = MOTORES_FITNESS.get("pipeline")
+    if sin_ref and base is not None:
+        for motor in MOTORES_FITNESS.values():
+            if motor is base:
+                continue
+            informes.append(comparar_fitness(motor, genomas, sin_ref, referencia=base))
+            if verbose:
+                print(informes[-1].linea())
+
+    # Operadores en el contexto por defecto, con las notas recortadas al rango
+    validos = [[x if x < 0 else min(cfg.RANGO_MAX, max(cfg.RANGO_MIN, x)) for x in g] for g in genomas]
+    validos = validos[:len(validos) // 2 * 2]
+    for nombre, ref, en_sitio in CRUCES:
+        informes.append(comparar_cruce(nombre, ref, en_sitio, validos, semilla))
+        if verbose:
+            print(informes[-1].linea())
+    for nombre, ref, en_sitio in MUTACIONES:
+        informes.append(comparar_mutacion(nombre, ref, en_sitio, validos, semilla))
+        if verbose:
+            print(informes[-1].linea())
+
+    return informes
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    informes = ejecutar_banco(n)
+    sys.exit(0 if all(i.fallos == 0 for i in informes) else 1)
@@ -0,0 +1,81 @@
+# ga/aleatorio.py
+
+from __future__ import annotations
+
+import os
+import random
+import hashlib
+from dataclasses import dataclass
+from typing import List, Tuple, Union
+
+
+@dataclass(frozen=True)
+class SemillaRNG:
+    """
+    Semilla reproducible con derivación de sub-semillas (al estilo de numpy.random.SeedSequence).
+
+    (entropia, ruta) identifica un flujo: hija(i) / hijas(n) derivan flujos independientes
+    y reproducibles para cada worker, sección o trabajo de un lote, sin depender del
+    orden en que se ejecuten. generador() da el random.Random que recorre ejecutar_ga;
+    generador_numpy() un np.random.Generator (sólo carga numpy si se pide) para
+    ejecutar_ga_lote. Son flujos distintos: la misma semilla reproduce una ejecución
+    dentro de un motor, no entre motores.
+
+    Se guarda y se lee como texto: "entropia" o "entropia/i/j".
+    """
+    entropia: int
+    ruta: Tuple[int, ...] = ()
+
+    def __post_init__(self):
+        # SeedSequence sólo admite enteros >= 0 (y "-3" no sería una semilla distinta de 3 en texto)
+        if self.entropia < 0 or any(i < 0 for i in self.ruta):
+            raise ValueError(f"Semilla no válida: {self} (entropía e índices deben ser >= 0)")
+
+    @staticmethod
+    def nueva() -> "SemillaRNG":
+        """Semilla fresca del sistema (63 bits), para ejecuciones sin semilla explícita."""
+        return SemillaRNG(int.from_bytes(os.urandom(8), "little") >> 1)
+
+    @staticmethod
+    def desde_texto(texto: str) -> "SemillaRNG":
+        partes = texto.strip().split("/")
+        try:
+            return SemillaRNG(int(partes[0]), tuple(int(p) for p in partes[1:]))
+        except ValueError as e:
+            raise ValueError(f"Semilla no válida: '{texto}' (esperado 'entropia' o 'entropia/i/j', enteros >= 0)") from e
+
+    @staticmethod
+    def desde(valor: "SemillaLike") -> "SemillaRNG":
+        """None -> nueva(); int -> SemillaRNG(int); str -> desde_texto(); SemillaRNG -> tal cual."""
+        if valor is None:
+            return SemillaRNG.nueva()
+        if isinstance(valor, SemillaRNG):
+            return valor
+        if isinstance(valor, str):
+            return SemillaRNG.desde_texto(valor)
+        return SemillaRNG(int(valor))
+
+    def hija(self, i: int) -> "SemillaRNG":
+        return SemillaRNG(self.entropia, self.ruta + (int(i),))
+
+    def hijas(self, n: int) -> List["SemillaRNG"]:
+        return [self.hija(i) for i in range(n)]
+
+    def _entero(self) -> int:
+        # Hash de toda la ruta: hijas distintas -> estados de Mersenne Twister no correlacionados
+        h = hashlib.sha256(str(self).encode("ascii")).digest()
+        return int.from_bytes(h, "little")
+
+    def generador(self) -> random.Random:
+        return random.Random(self._entero())
+
+    def generador_numpy(self):
+        """np.random.Generator de SeedSequence(entropia, spawn_key=ruta); no sigue la secuencia de generador()."""
+        import numpy as np
+        return np.random.default_rng(np.random.SeedSequence(self.entropia, spawn_key=self.ruta))
+
+    def __str__(self) -> str:
+        return "/".join(str(x) for x in (self.entropia, *self.ruta))
+
+
+SemillaLike = Union[SemillaRNG, int, str, None]
@@ -0,0 +1,89 @@
+# ga/archivo_genes.py
+
+from __future__ import annotations
+
+import os
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Falta instalar numpy. Ejecuta: pip install numpy"
+    ) from e
+
+# Cabecera de 16 bytes: magic (8) + longitud del genoma (uint32) + reservado (uint32)
+MAGIC = b"GAGENES1"
+TAM_CABECERA = 16
+
+
+def dtype_fila(longitud: int) -> np.dtype:
+    """Fila de ancho fijo: fitness float32 + genes int8 (NOTE 0..127, REST -1, HOLD -2)."""
+    return np.dtype([("fitness", "<f4"), ("genes", "i1", (longitud,))])
+
+
+def _cabecera(longitud: int) -> bytes:
+    return MAGIC + int(longitud).to_bytes(4, "little") + bytes(4)
+
+
+def _leer_longitud(path: str) -> int:
+    with open(path, "rb") as f:
+        cab = f.read(TAM_CABECERA)
+    if len(cab) != TAM_CABECERA or cab[:8] != MAGIC:
+        raise ValueError(f"{path} no es un archivo de genes ({MAGIC!r})")
+    return int.from_bytes(cab[8:12], "little")
+
+
+def a_filas(genes: Sequence[Sequence[int]], fitness: Optional[Sequence[float]] = None) -> np.ndarray:
+    """Empaqueta genomas (todos de la misma longitud) en un array de filas."""
+    if not genes:
+        raise ValueError("No hay genomas que guardar")
+    longitud = len(genes[0])
+    filas = np.zeros(len(genes), dtype=dtype_fila(longitud))
+    filas["genes"] = np.asarray(genes, dtype=np.int8)
+    filas["fitness"] = np.nan if fitness is None else np.asarray(fitness, dtype=np.float32)
+    return filas
+
+
+def guardar_genes(
+    path: str,
+    genes: Sequence[Sequence[int]],
+    fitness: Optional[Sequence[float]] = None,
+    append: bool = False,
+) -> int:
+    """
+    Escribe (o añade) genomas al archivo binario en una sola escritura.
+    Devuelve el número total de filas del archivo.
+    """
+    filas = a_filas(genes, fitness)
+    longitud = filas.dtype["genes"].shape[0]
+
+    existe = append and os.path.exists(path)
+    if existe and _leer_longitud(path) != longitud:
+        raise ValueError(f"Longitud de genoma {longitud} incompatible con {path}")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "ab" if existe else "wb") as f:
+        if not existe:
+            f.write(_cabecera(longitud))
+        f.write(filas.tobytes())
+
+    return (os.path.getsize(path) - TAM_CABECERA) // filas.dtype.itemsize
+
+
+def abrir_genes(path: str, modo: str = "r") -> np.ndarray:
+    """
+    Memory-map del archivo: array estructurado con campos 'fitness' y 'genes'.
+    No carga nada en memoria hasta que se accede a las filas.
+    """
+    longitud = _leer_longitud(path)
+    dt = dtype_fila(longitud)
+    n = (os.path.getsize(path) - TAM_CABECERA) // dt.itemsize
+    if n == 0:
+        return np.zeros(0, dtype=dt)
+    return np.memmap(path, dtype=dt, mode=modo, offset=TAM_CABECERA, shape=(n,))
+
+
+def leer_genes(path: str) -> List[List[int]]:
+    """Genomas del archivo como listas de int (formato de Individuo.genes)."""
+    return abrir_genes(path)["genes"].astype(int).tolist()
@@ -0,0 +1,228 @@
+# ga/archivo_melodias.py
+
+from __future__ import annotations
+
+import os
+import csv
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Falta instalar numpy. Ejecuta: pip install numpy"
+    ) from e
+
+from ga.archivo_genes import guardar_genes, abrir_genes
+
+ARCHIVO_DIR = os.path.join("logs", "archivo")
+N_GRAMA = 4
+INTERVALO_MAX = 24   # semitonos (los saltos mayores se recortan)
+IOI_MAX = 16         # subdivisiones entre ataques (idem)
+
+COLUMNAS_META = ["tonica", "modo", "acordes", "n_gramas"]
+
+# Sube si cambia cómo se hashean los n-gramas: el índice se reconstruye desde genes.bin
+VERSION_INDICE = 3
+
+
+def _digest(datos: bytes, tipo: bytes) -> int:
+    # Digest estable (el índice vive en disco): blake2b de 8 bytes -> int64
+    return int.from_bytes(hashlib.blake2b(datos, digest_size=8, person=tipo).digest(), "little", signed=True)
+
+
+def gramas_melodia(genes: Sequence[int], n: int = N_GRAMA) -> set[int]:
+    """
+    Conjunto de n-gramas (hasheados) de la secuencia de ataques.
+    Cada token = (intervalo con el ataque anterior, distancia en subdivisiones),
+    así que el conjunto es invariante a transposición.
+    Con menos de n + 1 ataques no hay n-gramas: el conjunto es entonces un único
+    hash de los genes exactos (sólo coincide consigo misma, sin transponer).
+    """
+    ataques = [(i, g) for i, g in enumerate(genes) if g >= 0]
+    tokens = []
+    for (i0, p0), (i1, p1) in zip(ataques, ataques[1:]):
+        intervalo = max(-INTERVALO_MAX, min(INTERVALO_MAX, p1 - p0))
+        ioi = min(IOI_MAX, i1 - i0)
+        tokens.append((intervalo, ioi))
+    if len(tokens) < n:
+        return {_digest(bytes(g & 0xFF for g in genes), b"exacto")}
+    datos = bytes(x & 0xFF for token in tokens for x in token)   # 2 bytes por token
+    return {
+        _digest(datos[2 * k:2 * (k + n)], b"ngrama")
+        for k in range(len(tokens) - n + 1)
+    }
+
+
+class ArchivoMelodias:
+    """
+    Archivo persistente de melodías generadas entre ejecuciones:
+    - genes.bin  : filas de ancho fijo (fitness float32 + genes int8), memory-mapped
+    - meta.csv   : tonalidad, modo, progresión y nº de n-gramas por fila
+    - indice_hash_vN.npy / indice_fila_vN.npy : índice invertido (hash de n-grama -> fila),
+      ordenado por hash y memory-mapped
+
+    Las consultas de similitud usan searchsorted sobre el índice (sin recorrer el archivo).
+    Similitud = Jaccard entre conjuntos de n-gramas de intervalos (invariante a transposición).
+    """
+
+    def __init__(self, directorio: str = ARCHIVO_DIR, n: int = N_GRAMA):
+        self.directorio = directorio
+        self.n = n
+        self.path_genes = os.path.join(directorio, "genes.bin")
+        self.path_meta = os.path.join(directorio, "meta.csv")
+        self.path_hash = os.path.join(directorio, f"indice_hash_v{VERSION_INDICE}.npy")
+        self.path_fila = os.path.join(directorio, f"indice_fila_v{VERSION_INDICE}.npy")
+
+        self.meta: List[dict] = []
+        if os.path.exists(self.path_meta):
+            with open(self.path_meta, "r", encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    row["acordes"] = row["acordes"].split()
+                    row["n_gramas"] = int(row["n_gramas"])
+                    self.meta.append(row)
+
+        self._n_gramas = np.array([m["n_gramas"] for m in self.meta], dtype=np.int32)
+        self._cargar_indice()
+
+        # Altas aún no volcadas al índice en disco
+        self._pendientes: Dict[int, List[int]] = {}
+
+        if self.meta and not len(self._hashes):
+            self._reconstruir_indice()
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    def _cargar_indice(self) -> None:
+        if os.path.exists(self.path_hash) and os.path.exists(self.path_fila):
+            self._hashes = np.load(self.path_hash, mmap_mode="r")
+            self._filas = np.load(self.path_fila, mmap_mode="r")
+        else:
+            self._hashes = np.zeros(0, dtype=np.int64)
+            self._filas = np.zeros(0, dtype=np.int32)
+
+    def _reconstruir_indice(self) -> None:
+        """Índice de una versión anterior (o perdido): se rehace desde genes.bin, con meta.csv."""
+        print(f"🔁 Reconstruyendo índice de n-gramas del archivo ({len(self.meta)} melodías)")
+        for fila, registro in enumerate(abrir_genes(self.path_genes)[:len(self.meta)]):
+            gramas = gramas_melodia(registro["genes"].astype(int).tolist(), self.n)
+            for h in gramas:
+                self._pendientes.setdefault(h, []).append(fila)
+            self.meta[fila]["n_gramas"] = len(gramas)
+        self._n_gramas = np.array([m["n_gramas"] for m in self.meta], dtype=np.int32)
+
+        tmp = self.path_meta + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=COLUMNAS_META)
+            w.writeheader()
+            for m in self.meta:
+                w.writerow({**m, "acordes": " ".join(m["acordes"])})
+        os.replace(tmp, self.path_meta)
+        self.guardar()
+        for nombre in os.listdir(self.directorio):
+            path = os.path.join(self.directorio, nombre)
+            if nombre.startswith("indice_") and path not in (self.path_hash, self.path_fila):
+                os.remove(path)
+
+    # ---------------- altas ----------------
+
+    def añadir_lote(
+        self,
+        melodias: Sequence[List[int]],
+        fitness: Optional[Sequence[float]] = None,
+        tonica: Optional[str] = None,
+        modo: Optional[str] = None,
+        acordes: Optional[List[str]] = None,
+    ) -> List[int]:
+        """Añade melodías (misma tonalidad/progresión) y devuelve sus filas."""
+        if not melodias:
+            return []
+
+        guardar_genes(self.path_genes, list(melodias), fitness, append=True)
+
+        nuevo = not os.path.exists(self.path_meta)
+        filas = []
+        n_gramas = []
+        with open(self.path_meta, "a", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=COLUMNAS_META)
+            if nuevo:
+                w.writeheader()
+            for genes in melodias:
+                fila = len(self.meta)
+                gramas = gramas_melodia(genes, self.n)
+                for h in gramas:
+                    self._pendientes.setdefault(h, []).append(fila)
+                meta = {"tonica": tonica or "", "modo": modo or "", "acordes": list(acordes or []),
+                        "n_gramas": len(gramas)}
+                w.writerow({**meta, "acordes": " ".join(meta["acordes"])})
+                self.meta.append(meta)
+                filas.append(fila)
+                n_gramas.append(len(gramas))
+
+        self._n_gramas = np.concatenate([self._n_gramas, np.array(n_gramas, dtype=np.int32)])
+        return filas
+
+    def guardar(self) -> None:
+        """Vuelca las altas pendientes al índice en disco (ordenado por hash)."""
+        if not self._pendientes:
+            return
+        pares = [(h, fila) for h, filas in self._pendientes.items() for fila in filas]
+        hashes = np.concatenate([self._hashes, np.array([h for h, _ in pares], dtype=np.int64)])
+        filas = np.concatenate([self._filas, np.array([f for _, f in pares], dtype=np.int32)])
+        orden = np.argsort(hashes, kind="stable")
+
+        for path, arr in ((self.path_hash, hashes[orden]), (self.path_fila, filas[orden])):
+            tmp = path + ".tmp.npy"
+            np.save(tmp, arr)
+            os.replace(tmp, path)
+
+        self._cargar_indice()
+        self._pendientes = {}
+
+    # ---------------- consultas ----------------
+
+    def similares(self, genes: Sequence[int], umbral: float = 0.5, max_resultados: int = 10) -> List[Tuple[int, float]]:
+        """
+        Filas cuya similitud (Jaccard de n-gramas) con genes es >= umbral,
+        de más a menos similar.
+        """
+        gramas = gramas_melodia(genes, self.n)
+        if not gramas:
+            return []
+
+        q = np.fromiter(gramas, dtype=np.int64, count=len(gramas))
+        lo = np.searchsorted(self._hashes, q, side="left")
+        cnt = np.searchsorted(self._hashes, q, side="right") - lo
+
+        trozos = []
+        m = cnt > 0
+        if m.any():
+            # Concatenar los rangos [lo, lo+cnt) sin bucle Python
+            lo_m, cnt_m = lo[m], cnt[m]
+            base = np.repeat(lo_m - (np.cumsum(cnt_m) - cnt_m), cnt_m)
+            trozos.append(np.asarray(self._filas[base + np.arange(cnt_m.sum())]))
+        for h in gramas:
+            if h in self._pendientes:
+                trozos.append(np.asarray(self._pendientes[h], dtype=np.int32))
+        if not trozos:
+            return []
+
+        filas, comunes = np.unique(np.concatenate(trozos), return_counts=True)
+        sim = comunes / (len(gramas) + self._n_gramas[filas] - comunes)
+
+        orden = np.argsort(-sim, kind="stable")
+        return [(int(filas[i]), float(sim[i])) for i in orden[:max_resultados] if sim[i] >= umbral]
+
+    def es_duplicado(self, genes: Sequence[int], umbral: float = 0.8) -> bool:
+        return bool(self.similares(genes, umbral=umbral, max_resultados=1))
+
+    def contiene(self, genes: Sequence[int]) -> bool:
+        """True si los mismos genes exactos ya están archivados."""
+        genes = list(genes)
+        candidatas = self.similares(genes, umbral=1.0, max_resultados=len(self))
+        return any(self.genes(fila) == genes for fila, _ in candidatas)
+
+    def genes(self, fila: int) -> List[int]:
+        return abrir_genes(self.path_genes)[fila]["genes"].astype(int).tolist()
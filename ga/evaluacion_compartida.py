@@ -0,0 +1,126 @@
+# ga/evaluacion_compartida.py
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Falta instalar numpy. Ejecuta: pip install numpy"
+    ) from e
+
+import config as cfg
+
+from ga.individuo import Individuo
+from ga.fitness import PesosFitness, calcular_fitness
+
+# Contexto musical que los workers copian a su config al arrancar
+PARAMS_CONTEXTO = ("TONICA", "MODO", "ACORDES", "RANGO_MIN", "RANGO_MAX")
+
+# Estado por proceso worker (vistas NumPy sobre la memoria compartida)
+_worker: dict = {}
+
+
+def _inicializar_worker(nombre_genes: str, nombre_fitness: str, capacidad: int,
+                        contexto: dict, pesos: PesosFitness) -> None:
+    for k, v in contexto.items():
+        setattr(cfg, k, v)
+
+    # Los workers comparten el resource_tracker del padre: sólo el padre hace unlink
+    shm_genes = shared_memory.SharedMemory(name=nombre_genes)
+    shm_fit = shared_memory.SharedMemory(name=nombre_fitness)
+    _worker["shm"] = (shm_genes, shm_fit)
+    _worker["genes"] = np.ndarray((2, capacidad, cfg.LONGITUD_MELODIA), dtype=np.int16, buffer=shm_genes.buf)
+    _worker["fitness"] = np.ndarray((2, capacidad), dtype=np.float64, buffer=shm_fit.buf)
+    _worker["pesos"] = pesos
+
+
+def _evaluar_rango(buf: int, ini: int, fin: int) -> int:
+    """Evalúa las filas [ini, fin) del buffer buf y escribe su fitness en sitio."""
+    genes = _worker["genes"][buf]
+    fitness = _worker["fitness"][buf]
+    pesos = _worker["pesos"]
+    for i in range(ini, fin):
+        fitness[i] = calcular_fitness(genes[i].tolist(), pesos)
+    return fin - ini
+
+
+class EvaluadorCompartido:
+    """
+    Evaluación de fitness en varios procesos sobre memoria compartida.
+
+    Matriz de genes (2, capacidad, LONGITUD_MELODIA) int16 y vector de fitness
+    (2, capacidad) float64 en bloques multiprocessing.shared_memory. Cada llamada
+    a evaluar() escribe los genomas en el buffer libre, manda a los workers sólo
+    (buffer, inicio, fin) y lee el fitness que han escrito en sitio; las
+    generaciones alternan entre los dos buffers.
+
+    Los pesos y el contexto musical se fijan al crear el evaluador.
+    """
+
+    def __init__(
+        self,
+        capacidad: int,
+        pesos: Optional[PesosFitness] = None,
+        procesos: Optional[int] = None,
+        fragmentos: Optional[int] = None,
+    ):
+        self.capacidad = capacidad
+        self.pesos = pesos if pesos is not None else PesosFitness()
+        self.procesos = procesos or os.cpu_count() or 1
+        self.fragmentos = fragmentos or 2 * self.procesos
+        self._buf = 0
+
+        L = cfg.LONGITUD_MELODIA
+        self._shm_genes = shared_memory.SharedMemory(create=True, size=2 * capacidad * L * 2)
+        self._shm_fit = shared_memory.SharedMemory(create=True, size=2 * capacidad * 8)
+        self._genes = np.ndarray((2, capacidad, L), dtype=np.int16, buffer=self._shm_genes.buf)
+        self._fitness = np.ndarray((2, capacidad), dtype=np.float64, buffer=self._shm_fit.buf)
+
+        contexto = {k: getattr(cfg, k) for k in PARAMS_CONTEXTO}
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.procesos,
+            initializer=_inicializar_worker,
+            initargs=(self._shm_genes.name, self._shm_fit.name, capacidad, contexto, self.pesos),
+        )
+
+    def _rangos(self, n: int) -> List[tuple[int, int]]:
+        paso = max(1, -(-n // self.fragmentos))
+        return [(i, min(n, i + paso)) for i in range(0, n, paso)]
+
+    def evaluar(self, individuos: List[Individuo]) -> None:
+        """Asigna ind.fitness a cada individuo (como ind.evaluar(pesos))."""
+        n = len(individuos)
+        if n == 0:
+            return
+        if n > self.capacidad:
+            raise ValueError(f"{n} individuos superan la capacidad del evaluador ({self.capacidad})")
+
+        buf = self._buf
+        self._genes[buf, :n] = [ind.genes for ind in individuos]
+
+        rangos = self._rangos(n)
+        list(self._pool.map(_evaluar_rango, [buf] * len(rangos), *zip(*rangos)))
+
+        for ind, f in zip(individuos, self._fitness[buf, :n].tolist()):
+            ind.fitness = f
+        self._buf = 1 - buf
+
+    def cerrar(self) -> None:
+        self._pool.shutdown(wait=True)
+        # Soltar las vistas antes de cerrar los bloques
+        self._genes = self._fitness = None
+        for shm in (self._shm_genes, self._shm_fit):
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> "EvaluadorCompartido":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
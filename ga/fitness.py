@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 import config as cfg
 
@@ -117,14 +118,49 @@ def _penalizacion_ratio_rest(rest_ratio: float, obj: float, tol: float) -> float
     return (rest_ratio - hi) / max(1.0 - hi, 1e-9)
 
 
+@lru_cache(maxsize=64)
+def _contexto_armonico(tonica: str, modo: str, acordes: Tuple[str, ...]):
+    """Escala y acordes en pitch classes (cacheado: cambia sólo al cambiar config)."""
+    escala_pcs = frozenset(build_scale_pitch_classes(tonica, modo))
+    acordes_pcs = tuple(frozenset(chord_pitch_classes(ch)) for ch in acordes)
+    return escala_pcs, acordes_pcs
+
+
 def calcular_fitness(genes: List[int], pesos: PesosFitness = PesosFitness()) -> float:
+    """
+    Fitness por el pipeline compilado de ga/terminos.py: sólo se calculan los
+    términos con peso distinto de cero y sus intermedios (voz, ataques...) una vez.
+    """
     if len(genes) != cfg.LONGITUD_MELODIA:
         raise ValueError(f"Longitud de genes inválida: {len(genes)} != {cfg.LONGITUD_MELODIA}")
 
-    escala_pcs = build_scale_pitch_classes(cfg.TONICA, cfg.MODO)
-    acordes_pcs = [chord_pitch_classes(ch) for ch in cfg.ACORDES]
+    from ga.terminos import compilar
+    return compilar(pesos)(genes)
+
+
+def calcular_fitness_referencia(
+    genes: List[int],
+    pesos: PesosFitness = PesosFitness(),
+    desglose: Optional[Dict[str, float]] = None,
+) -> float:
+    """
+    Implementación escalar original (todos los términos), referencia para el pipeline compilado.
+    Si se pasa desglose, se rellena con la aportación de cada término (mismos nombres que
+    ga/terminos.py); el cálculo del fitness no cambia.
+    """
+    if len(genes) != cfg.LONGITUD_MELODIA:
+        raise ValueError(f"Longitud de genes inválida: {len(genes)} != {cfg.LONGITUD_MELODIA}")
+
+    escala_pcs, acordes_pcs = _contexto_armonico(cfg.TONICA, cfg.MODO, tuple(cfg.ACORDES))
 
     penalizaciones_duras = 0.0
+    antes = 0.0
+
+    def _anotar(nombre: str) -> None:
+        nonlocal antes
+        if desglose is not None:
+            desglose[nombre] = antes - penalizaciones_duras
+        antes = penalizaciones_duras
 
     # A1: Inicio de compás debe apoyar el acorde
     for compas in range(cfg.COMPASES):
@@ -132,11 +168,13 @@ def calcular_fitness(genes: List[int], pesos: PesosFitness = PesosFitness()) ->
         nota = _nota_sonando_en_posicion(genes, start)
         if nota is None or not note_in_chord(nota, acordes_pcs[compas]):
             penalizaciones_duras += pesos.pen_inicio_compas_no_acorde
+    _anotar("inicio_compas")
 
     # A2: Rango vocal
     for g in genes:
         if g >= 0 and (g < cfg.RANGO_MIN or g > cfg.RANGO_MAX):
             penalizaciones_duras += pesos.pen_fuera_rango
+    _anotar("fuera_rango")
 
     # A3: Exceso de ataques por compás
     LIM_ATAQUES = 6
@@ -144,11 +182,13 @@ def calcular_fitness(genes: List[int], pesos: PesosFitness = PesosFitness()) ->
         ataques = _contar_ataques_en_compas(genes, compas)
         exceso = max(0, ataques - LIM_ATAQUES)
         penalizaciones_duras += exceso * pesos.pen_exceso_ataques
+    _anotar("exceso_ataques")
 
     # ✅ A3b: Compases pobres (evita melodías vacías)
     ataques_por = _ataques_por_compas(genes)
     compases_pobres = sum(1 for a in ataques_por if a < pesos.min_ataques_por_compas)
     penalizaciones_duras += compases_pobres * pesos.pen_compas_pobre
+    _anotar("compases_pobres")
 
     # A4: Final no vacío y cierre estable
     ataques_ultimo = ataques_por[-1]
@@ -161,6 +201,7 @@ def calcular_fitness(genes: List[int], pesos: PesosFitness = PesosFitness()) ->
     else:
         if not note_in_chord(ultima, acordes_pcs[-1]):
             penalizaciones_duras += pesos.pen_ultima_nota_no_acorde
+    _anotar("final")
 
     # ✅ A5: Penalización por ratios REST/HOLD
     notes, rests, holds = _contar_tipos(genes)
@@ -175,10 +216,12 @@ def calcular_fitness(genes: List[int], pesos: PesosFitness = PesosFitness()) ->
         obj=pesos.rest_ratio_obj,
         tol=pesos.rest_ratio_tol,
     )
+    _anotar("ratio_rest")
 
     # HOLD: si nos pasamos de un máximo, castigamos fuerte
     if hold_ratio > pesos.hold_ratio_max:
         penalizaciones_duras += pesos.pen_hold_ratio * ((hold_ratio - pesos.hold_ratio_max) / (1.0 - pesos.hold_ratio_max))
+    _anotar("ratio_hold")
 
     # B) Puntuación suave
     score_acorde = 0.0
@@ -338,4 +381,15 @@ def calcular_fitness(genes: List[int], pesos: PesosFitness = PesosFitness()) ->
         pesos.w_densidad_ideal * score_dens_norm
     )
 
+    if desglose is not None:
+        desglose.update({
+            "acorde": 100.0 * pesos.w_acorde * score_acorde_norm,
+            "escala": 100.0 * pesos.w_escala * score_escala_norm,
+            "movimiento": 100.0 * pesos.w_movimiento * score_mov_norm,
+            "ritmo": 100.0 * pesos.w_ritmo_sincopa * score_ritmo_norm,
+            "hook": 100.0 * pesos.w_repeticion_hook * score_hook_norm,
+            "contorno": 100.0 * pesos.w_contorno * score_contorno_norm,
+            "densidad": 100.0 * pesos.w_densidad_ideal * score_dens_norm,
+        })
+
     return 100.0 - penalizaciones_duras + 100.0 * score_suave
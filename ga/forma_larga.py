@@ -0,0 +1,270 @@
+# ga/forma_larga.py
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import config as cfg
+
+from ga.aleatorio import SemillaRNG, SemillaLike
+from ga.fitness import PesosFitness, calcular_fitness
+from ga.motor import ejecutar_ga
+from musica.tonalidad import build_scale_pitch_classes
+from musica.acordes import chord_pitch_classes
+
+# Salto máximo (semitonos) entre la última nota de una sección y la primera de la siguiente
+MAX_SALTO_FRONTERA = 2
+PEN_FRONTERA = 8.0
+
+
+# =========================================================
+# Fronteras entre secciones
+# =========================================================
+
+def _notas_acorde(acorde: str) -> List[int]:
+    pcs = chord_pitch_classes(acorde)
+    return [n for n in range(cfg.RANGO_MIN, cfg.RANGO_MAX + 1) if n % 12 in pcs]
+
+
+def _mas_cercana(cands: List[int], objetivo: int) -> int:
+    return min(cands, key=lambda n: (abs(n - objetivo), n))
+
+
+def notas_ancla(primeros_acordes: List[str]) -> List[int]:
+    """
+    Primera nota de cada sección: nota del primer acorde de la sección,
+    la más cercana a la ancla anterior (la primera, la más cercana al centro del rango).
+    """
+    prev = (cfg.RANGO_MIN + cfg.RANGO_MAX) // 2
+    out = []
+    for acorde in primeros_acordes:
+        cands = _notas_acorde(acorde) or list(range(cfg.RANGO_MIN, cfg.RANGO_MAX + 1))
+        prev = _mas_cercana(cands, prev)
+        out.append(prev)
+    return out
+
+
+def _ultimo_ataque(genes: List[int]) -> Optional[int]:
+    for i in range(len(genes) - 1, -1, -1):
+        if genes[i] >= 0:
+            return i
+    return None
+
+
+@dataclass(frozen=True)
+class RestriccionFrontera:
+    """
+    Penalización para ejecutar_ga(penalizacion=...):
+    - el primer tick de la sección debe ser la nota de entrada
+    - la última nota atacada debe quedar a <= max_salto de la nota de salida
+      (la entrada de la sección siguiente); salida=None -> sin restricción final
+    """
+    entrada: int
+    salida: Optional[int]
+    max_salto: int = MAX_SALTO_FRONTERA
+    peso: float = PEN_FRONTERA
+
+    def __call__(self, genes: List[int]) -> float:
+        pen = 0.0
+        if genes[0] != self.entrada:
+            pen += self.peso
+        if self.salida is not None:
+            j = _ultimo_ataque(genes)
+            if j is None:
+                pen += self.peso
+            else:
+                exceso = abs(genes[j] - self.salida) - self.max_salto
+                if exceso > 0:
+                    pen += self.peso * min(1.0, exceso / 6.0)
+        return pen
+
+    def reparar(self, genes: List[int]) -> List[int]:
+        """Fuerza las dos condiciones cambiando como mucho el primer tick y el último ataque."""
+        g = list(genes)
+        g[0] = self.entrada
+        if self.salida is None:
+            return g
+
+        j = _ultimo_ataque(g)
+        if abs(g[j] - self.salida) <= self.max_salto:
+            return g
+        if j == 0:
+            # el único ataque es la entrada: se añade uno al inicio del último compás
+            j = cfg.LONGITUD_MELODIA - cfg.SUBDIVISIONES_POR_COMPAS
+
+        # Preferir notas del acorde del compás, luego de la escala, dentro del salto permitido
+        acorde = cfg.ACORDES[j // cfg.SUBDIVISIONES_POR_COMPAS]
+        acorde_pcs = chord_pitch_classes(acorde)
+        escala_pcs = build_scale_pitch_classes(cfg.TONICA, cfg.MODO)
+        cands = [n for n in range(cfg.RANGO_MIN, cfg.RANGO_MAX + 1)
+                 if abs(n - self.salida) <= self.max_salto and n % 12 in (acorde_pcs | escala_pcs)]
+        g[j] = min(cands, key=lambda n: (n % 12 not in acorde_pcs, abs(n - self.salida))) if cands else self.salida
+        return g
+
+
+# =========================================================
+# Plan de secciones
+# =========================================================
+
+@dataclass
+class Seccion:
+    etiqueta: str
+    acordes: List[str]
+    entrada: int
+    salida: Optional[int]
+    genes: List[int] = field(default_factory=list)
+    fitness: float = 0.0
+
+
+def planificar(acordes: List[str], forma: Optional[str] = None) -> Tuple[List[str], Dict[str, Seccion]]:
+    """
+    Divide la progresión en secciones de cfg.COMPASES compases.
+    forma: una letra por sección (p. ej. "ABAC"); las letras repetidas reutilizan la
+    misma sección y deben tener los mismos acordes. None -> todas las secciones distintas.
+    Devuelve (orden de etiquetas, secciones únicas por etiqueta).
+    """
+    c = cfg.COMPASES
+    if not acordes or len(acordes) % c != 0:
+        raise ValueError(f"La progresión debe tener un múltiplo de {c} compases (tiene {len(acordes)})")
+    n = len(acordes) // c
+
+    orden = list(forma) if forma else [f"S{i}" for i in range(n)]
+    if len(orden) != n:
+        raise ValueError(f"La forma '{forma}' tiene {len(orden)} secciones, la progresión {n}")
+
+    trozos = [acordes[i * c:(i + 1) * c] for i in range(n)]
+    for i, et in enumerate(orden):
+        primera = orden.index(et)
+        if trozos[i] != trozos[primera]:
+            raise ValueError(f"La sección {et} se repite con acordes distintos ({trozos[primera]} / {trozos[i]})")
+
+    anclas = notas_ancla([t[0] for t in trozos])
+    anclas = [anclas[orden.index(et)] for et in orden]   # una sección repetida entra siempre igual
+
+    secciones: Dict[str, Seccion] = {}
+    for i, et in enumerate(orden):
+        if et not in secciones:
+            salida = anclas[i + 1] if i + 1 < n else None
+            secciones[et] = Seccion(et, trozos[i], entrada=anclas[i], salida=salida)
+    return orden, secciones
+
+
+# =========================================================
+# Evolución por secciones
+# =========================================================
+
+def _evolucionar_seccion(
+    seccion: Seccion,
+    contexto: dict,
+    pesos: PesosFitness,
+    generaciones: int,
+    semilla: SemillaRNG,
+) -> Tuple[List[int], float]:
+    for k, v in contexto.items():
+        setattr(cfg, k, v)
+    cfg.ACORDES = list(seccion.acordes)
+
+    restr = RestriccionFrontera(seccion.entrada, seccion.salida)
+    genes, _ = ejecutar_ga(pesos, generaciones=generaciones, csv_path=None, verbose=False,
+                           penalizacion=restr, semilla=semilla)
+    genes = restr.reparar(genes)
+    return genes, calcular_fitness(genes, pesos)
+
+
+def _ajustar_repeticion(genes: List[int], sec: Seccion, salida: Optional[int]) -> List[int]:
+    """Una sección repetida que desemboca en otra nota: sólo se retoca su último ataque."""
+    if salida is None or salida == sec.salida:
+        return genes
+    acordes_previos = cfg.ACORDES
+    cfg.ACORDES = list(sec.acordes)
+    try:
+        return RestriccionFrontera(sec.entrada, salida).reparar(genes)
+    finally:
+        cfg.ACORDES = acordes_previos
+
+
+@dataclass
+class ResultadoFormaLarga:
+    genes: List[int]
+    orden: List[str]
+    secciones: Dict[str, Seccion]
+    semilla: str = ""
+
+    def resumen(self) -> str:
+        lineas = [f"Forma: {'-'.join(self.orden)} | {len(self.genes)} ticks | semilla={self.semilla}"]
+        for et, sec in self.secciones.items():
+            lineas.append(f"   {et:4s} | {' '.join(sec.acordes)} | entrada={sec.entrada} "
+                          f"salida={sec.salida} | fitness={sec.fitness:.3f}")
+        return "\n".join(lineas)
+
+
+def generar_forma_larga(
+    acordes: List[str],
+    forma: Optional[str] = None,
+    pesos: Optional[PesosFitness] = None,
+    generaciones: int = 120,
+    procesos: Optional[int] = None,
+    semilla: SemillaLike = None,
+    verbose: bool = True,
+) -> ResultadoFormaLarga:
+    """
+    Pieza larga por secciones de cfg.COMPASES compases:
+    1) notas de frontera fijadas de antemano (notas_ancla), así las secciones son independientes
+    2) cada sección única evoluciona en su propio proceso con RestriccionFrontera
+    3) se concatenan en el orden de la forma (A-B-A reutiliza A)
+
+    El coste crece linealmente con el número de secciones únicas y se reparte entre procesos.
+    Cada sección usa semilla.hija(i): el resultado no depende del número de procesos.
+    Tonalidad, modo y tempo se leen de config.
+    """
+    if pesos is None:
+        pesos = PesosFitness()
+
+    orden, secciones = planificar(acordes, forma)
+    unicas = list(secciones.values())
+    contexto = {"TONICA": cfg.TONICA, "MODO": cfg.MODO, "TEMPO": cfg.TEMPO}
+    raiz = SemillaRNG.desde(semilla)
+    semillas = raiz.hijas(len(unicas))
+
+    if verbose:
+        print(f"🧩 Forma larga: {len(orden)} secciones ({len(unicas)} únicas)")
+
+    if procesos == 1 or len(unicas) == 1:
+        acordes_previos = cfg.ACORDES
+        try:
+            resultados = [_evolucionar_seccion(s, contexto, pesos, generaciones, sem)
+                          for s, sem in zip(unicas, semillas)]
+        finally:
+            cfg.ACORDES = acordes_previos
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(
+                _evolucionar_seccion, unicas, [contexto] * len(unicas), [pesos] * len(unicas),
+                [generaciones] * len(unicas), semillas,
+            ))
+
+    for sec, (genes, fit) in zip(unicas, resultados):
+        sec.genes, sec.fitness = genes, fit
+        if verbose:
+            print(f"   ✅ Sección {sec.etiqueta}: fitness={fit:.3f}")
+
+    genes_pieza: List[int] = []
+    for i, et in enumerate(orden):
+        sec = secciones[et]
+        salida = secciones[orden[i + 1]].entrada if i + 1 < len(orden) else None
+        genes_pieza.extend(_ajustar_repeticion(sec.genes, sec, salida))
+
+    return ResultadoFormaLarga(genes_pieza, orden, secciones, semilla=str(raiz))
+
+
+if __name__ == "__main__":
+    from musica.smf_writer import genes_a_smf
+
+    progresion = cfg.ACORDES + ["Am", "F", "C", "G"] * 2 + cfg.ACORDES
+    res = generar_forma_larga(progresion, forma="ABA")
+    print(res.resumen())
+    with open("resultado_largo.mid", "wb") as f:
+        f.write(genes_a_smf(res.genes, bpm=cfg.TEMPO))
+    print("✅ Exportado: resultado_largo.mid")
@@ -0,0 +1,224 @@
+# ga/historial.py
+
+from __future__ import annotations
+
+import os
+import json
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Falta instalar numpy. Ejecuta: pip install numpy"
+    ) from e
+
+HISTORIAL_DIR = os.path.join("logs", "historial")
+
+# Cabecera de 16 bytes: magic (8) + dtype en ASCII (8, rellenado con espacios)
+MAGIC_COLUMNA = b"GAHCOL01"
+MAGIC_INDICE = b"GAHIDX01"
+TAM_CABECERA = 16
+
+# Tipos de las columnas que escribe ejecutar_ga; cualquier otra (p. ej. las del portafolio) es float64
+TIPOS_COLUMNA = {
+    "gen": "<i4",
+    "sin_mejora_global": "<i4",
+    "best_global": "<f8",
+    "best_gen": "<f8",
+    "p_mut": "<f4",
+}
+TIPO_DEFECTO = "<f8"
+
+# Valor para las filas de runs que no tienen la columna
+RELLENO_ENTERO = -1
+
+DTYPE_INDICE = np.dtype([("run", "<i4"), ("inicio", "<i8"), ("filas", "<i8")])
+
+
+def _cabecera(magic: bytes, dtype: str) -> bytes:
+    return magic + dtype.encode("ascii").ljust(8)
+
+
+def _leer_cabecera(path: str, magic: bytes) -> str:
+    with open(path, "rb") as f:
+        cab = f.read(TAM_CABECERA)
+    if len(cab) != TAM_CABECERA or cab[:8] != magic:
+        raise ValueError(f"{path} no es un archivo de historial ({magic!r})")
+    return cab[8:].decode("ascii").strip()
+
+
+def _relleno(dtype: np.dtype):
+    return np.nan if dtype.kind == "f" else RELLENO_ENTERO
+
+
+def reducir_minmax(x: np.ndarray, y: np.ndarray, cubos: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce una curva a como mucho 2*cubos puntos: el mínimo y el máximo de cada cubo
+    (un cubo por píxel de ancho). Los picos y valles se conservan, a diferencia de
+    quedarse con un punto de cada N.
+    """
+    n = len(y)
+    if cubos <= 0 or n <= 2 * cubos:
+        return x, y
+    bordes = np.linspace(0, n, cubos + 1).astype(np.int64)[:-1]
+    bordes = np.unique(bordes)
+    ymin = np.minimum.reduceat(y, bordes)
+    ymax = np.maximum.reduceat(y, bordes)
+    xs = np.repeat(x[bordes], 2)
+    ys = np.empty(2 * len(bordes), dtype=np.result_type(ymin, ymax))
+    ys[0::2] = ymin
+    ys[1::2] = ymax
+    return xs, ys
+
+
+class HistorialRuns:
+    """
+    Historial de ejecuciones en formato columnar binario:
+
+        <dir>/indice.bin        (run, inicio, filas) por ejecución
+        <dir>/runs.jsonl        etiqueta y metadatos de cada ejecución
+        <dir>/col_<nombre>.bin  un array tipado por métrica, todas las ejecuciones seguidas
+
+    Cada columna se lee con memory-map, así que leer una métrica de cientos de
+    ejecuciones no toca el resto de columnas ni parsea texto. Añadir una ejecución
+    escribe sólo al final de cada archivo; el índice se escribe el último, de modo
+    que unas columnas más largas que el índice (escritura interrumpida) se recortan
+    en la siguiente escritura.
+
+    Un único escritor por directorio (el sweep añade desde el proceso principal).
+    """
+
+    def __init__(self, directorio: str = HISTORIAL_DIR):
+        self.directorio = directorio
+        self._path_indice = os.path.join(directorio, "indice.bin")
+        self._path_meta = os.path.join(directorio, "runs.jsonl")
+
+    # -------------------------
+    # Índice
+    # -------------------------
+
+    def indice(self) -> np.ndarray:
+        if not os.path.exists(self._path_indice):
+            return np.zeros(0, dtype=DTYPE_INDICE)
+        _leer_cabecera(self._path_indice, MAGIC_INDICE)
+        n = (os.path.getsize(self._path_indice) - TAM_CABECERA) // DTYPE_INDICE.itemsize
+        if n == 0:
+            return np.zeros(0, dtype=DTYPE_INDICE)
+        return np.memmap(self._path_indice, dtype=DTYPE_INDICE, mode="r", offset=TAM_CABECERA, shape=(n,))
+
+    def __len__(self) -> int:
+        return len(self.indice())
+
+    def total_filas(self) -> int:
+        idx = self.indice()
+        return int(idx["inicio"][-1] + idx["filas"][-1]) if len(idx) else 0
+
+    def metadatos(self) -> List[dict]:
+        """[{run, etiqueta, fecha, meta}, ...] en orden de ejecución."""
+        if not os.path.exists(self._path_meta):
+            return []
+        with open(self._path_meta, "r", encoding="utf-8") as f:
+            por_run = {m["run"]: m for m in map(json.loads, filter(str.strip, f))}
+        # Si una escritura se cortó antes del índice, su línea la sobrescribe el siguiente run
+        return [por_run[r] for r in range(len(self)) if r in por_run]
+
+    def buscar(self, etiqueta: str) -> List[int]:
+        return [m["run"] for m in self.metadatos() if m["etiqueta"] == etiqueta]
+
+    # -------------------------
+    # Columnas
+    # -------------------------
+
+    def _path_columna(self, nombre: str) -> str:
+        return os.path.join(self.directorio, f"col_{nombre}.bin")
+
+    def columnas(self) -> List[str]:
+        if not os.path.isdir(self.directorio):
+            return []
+        return sorted(f[4:-4] for f in os.listdir(self.directorio) if f.startswith("col_") and f.endswith(".bin"))
+
+    def columna(self, nombre: str) -> np.ndarray:
+        """Memory-map de la columna completa (todas las ejecuciones)."""
+        path = self._path_columna(nombre)
+        if not os.path.exists(path):
+            raise KeyError(f"Columna '{nombre}' no está en {self.directorio} (hay: {self.columnas()})")
+        dt = np.dtype(_leer_cabecera(path, MAGIC_COLUMNA))
+        n = self.total_filas()
+        if n == 0:
+            return np.zeros(0, dtype=dt)
+        return np.memmap(path, dtype=dt, mode="r", offset=TAM_CABECERA, shape=(n,))
+
+    def series(self, nombre: str, runs: Optional[Iterable[int]] = None) -> List[np.ndarray]:
+        """Un slice (sin copia) de la columna por ejecución; runs=None -> todas."""
+        col = self.columna(nombre)
+        idx = self.indice()
+        sel = range(len(idx)) if runs is None else runs
+        return [col[idx["inicio"][r]:idx["inicio"][r] + idx["filas"][r]] for r in sel]
+
+    # -------------------------
+    # Escritura
+    # -------------------------
+
+    def _añadir_columna(self, path: str, datos: np.ndarray, total: int) -> None:
+        """Añade datos al final de la columna, recortando filas huérfanas o rellenando si es nueva."""
+        existe = os.path.exists(path)
+        if existe:
+            dt = np.dtype(_leer_cabecera(path, MAGIC_COLUMNA))
+            datos = datos.astype(dt, copy=False)
+            with open(path, "r+b") as f:
+                f.truncate(TAM_CABECERA + total * dt.itemsize)
+        with open(path, "ab") as f:
+            if not existe:
+                f.write(_cabecera(MAGIC_COLUMNA, datos.dtype.str))
+                f.write(np.full(total, _relleno(datos.dtype), dtype=datos.dtype).tobytes())
+            f.write(datos.tobytes())
+
+    def añadir(self, filas: Sequence[dict], etiqueta: str = "", meta: Optional[dict] = None) -> int:
+        """
+        Añade una ejecución (lista de dicts, como el historial de ejecutar_ga).
+        Devuelve el número de run asignado.
+        """
+        if not filas:
+            raise ValueError("Historial vacío")
+        os.makedirs(self.directorio, exist_ok=True)
+
+        total = self.total_filas()
+        run = len(self)
+        n = len(filas)
+
+        nombres = list(filas[0].keys())
+        for nombre in nombres:
+            dt = np.dtype(TIPOS_COLUMNA.get(nombre, TIPO_DEFECTO))
+            datos = np.fromiter((f.get(nombre, _relleno(dt)) for f in filas), dtype=dt, count=n)
+            self._añadir_columna(self._path_columna(nombre), datos, total)
+
+        # Columnas de ejecuciones anteriores que esta no tiene
+        for nombre in set(self.columnas()) - set(nombres):
+            path = self._path_columna(nombre)
+            dt = np.dtype(_leer_cabecera(path, MAGIC_COLUMNA))
+            self._añadir_columna(path, np.full(n, _relleno(dt), dtype=dt), total)
+
+        with open(self._path_meta, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"run": run, "etiqueta": etiqueta, "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+                                "meta": meta or {}}, ensure_ascii=False) + "\n")
+
+        nuevo = not os.path.exists(self._path_indice)
+        with open(self._path_indice, "ab") as f:
+            if nuevo:
+                f.write(_cabecera(MAGIC_INDICE, "indice"))
+            f.write(np.array([(run, total, n)], dtype=DTYPE_INDICE).tobytes())
+        return run
+
+    def importar_csv(self, path: str, etiqueta: str = "") -> int:
+        """Añade un CSV de ejecutar_ga (formato antiguo logs/ga_run.csv)."""
+        import csv
+        meta = {"csv": path}
+        with open(path, "r", encoding="utf-8") as f:
+            filas = []
+            for row in csv.DictReader(f):
+                if "semilla" in row:
+                    meta["semilla"] = row.pop("semilla")
+                filas.append({k: float(v) for k, v in row.items()})
+        return self.añadir(filas, etiqueta=etiqueta or os.path.basename(path), meta=meta)
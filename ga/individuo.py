@@ -16,16 +16,16 @@ class Individuo:
         self.fitness = calcular_fitness(self.genes, pesos=pesos) if pesos is not None else calcular_fitness(self.genes)
         return self.fitness
 
-    def crear_aleatorio(self):
+    def crear_aleatorio(self, rng=random):
         self.genes = []
         for _ in range(cfg.LONGITUD_MELODIA):
-            r = random.random()
+            r = rng.random()
             if r < 0.1:
                 self.genes.append(cfg.REST)
             elif r < 0.25:
                 self.genes.append(cfg.HOLD)
             else:
-                self.genes.append(random.randint(cfg.RANGO_MIN, cfg.RANGO_MAX))
+                self.genes.append(rng.randint(cfg.RANGO_MIN, cfg.RANGO_MAX))
         return self
 
     def copiar(self):
@@ -33,5 +33,11 @@ class Individuo:
         copia.fitness = self.fitness
         return copia
 
+    def copiar_de(self, otro: "Individuo"):
+        """Sobrescribe genes y fitness con los de otro, reutilizando la lista propia."""
+        self.genes[:] = otro.genes
+        self.fitness = otro.fitness
+        return self
+
     def __repr__(self):
         return f"Individuo(fitness={self.fitness})"
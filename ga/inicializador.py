@@ -0,0 +1,120 @@
+# ga/inicializador.py
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Falta instalar numpy. Ejecuta: pip install numpy"
+    ) from e
+
+import config as cfg
+
+from ga.individuo import Individuo
+from ga.fitness import PesosFitness
+from musica.tonalidad import build_scale_pitch_classes
+from musica.acordes import chord_pitch_classes
+
+# Peso relativo de cada nota del rango al muestrear (con priors musicales)
+PESO_ACORDE = 3.0
+PESO_ESCALA = 1.5
+PESO_FUERA = 0.15
+
+# Mismas probabilidades que Individuo.crear_aleatorio (sin priors)
+P_REST_UNIFORME = 0.10
+P_HOLD_UNIFORME = 0.15
+
+
+def _tabla_pitches(priors: bool) -> np.ndarray:
+    """
+    CDF (compases x notas_del_rango) para muestrear pitches por compás.
+    Sin priors: uniforme en [RANGO_MIN, RANGO_MAX] como crear_aleatorio.
+    """
+    notas = np.arange(cfg.RANGO_MIN, cfg.RANGO_MAX + 1)
+    pesos = np.ones((cfg.COMPASES, len(notas)))
+
+    if priors:
+        pc = notas % 12
+        escala = np.isin(pc, list(build_scale_pitch_classes(cfg.TONICA, cfg.MODO)))
+        for c in range(cfg.COMPASES):
+            acorde = np.isin(pc, list(chord_pitch_classes(cfg.ACORDES[c])))
+            pesos[c] = np.where(acorde, PESO_ACORDE, np.where(escala, PESO_ESCALA, PESO_FUERA))
+
+    cdf = np.cumsum(pesos, axis=1)
+    return cdf / cdf[:, -1:]
+
+
+def _tabla_acordes() -> np.ndarray:
+    """CDF (compases x notas_del_rango) restringida a notas del acorde de cada compás."""
+    notas = np.arange(cfg.RANGO_MIN, cfg.RANGO_MAX + 1)
+    pesos = np.zeros((cfg.COMPASES, len(notas)))
+    for c in range(cfg.COMPASES):
+        pesos[c] = np.isin(notas % 12, list(chord_pitch_classes(cfg.ACORDES[c])))
+    pesos[pesos.sum(axis=1) == 0] = 1.0  # acorde sin notas en el rango -> uniforme
+    cdf = np.cumsum(pesos, axis=1)
+    return cdf / cdf[:, -1:]
+
+
+def _muestrear(cdf_por_tick: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Inverse-CDF vectorizado: índice de nota para cada (individuo, tick)."""
+    return (u[..., None] > cdf_por_tick[None, :, :]).sum(axis=-1)
+
+
+def generar_matriz(
+    n: int,
+    priors: bool = True,
+    pesos: Optional[PesosFitness] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Genera n genomas de golpe como matriz (n, LONGITUD_MELODIA) de int16.
+
+    Con priors=True:
+    - inicio de compás: siempre ataque con nota del acorde
+    - pitches sesgados a acorde / escala del compás
+    - ratios REST/HOLD alrededor de pesos.rest_ratio_obj y por debajo de pesos.hold_ratio_max
+    Con priors=False reproduce la distribución de Individuo.crear_aleatorio.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if pesos is None:
+        pesos = PesosFitness()
+
+    L = cfg.LONGITUD_MELODIA
+    sub = cfg.SUBDIVISIONES_POR_COMPAS
+    compas_de_tick = np.arange(L) // sub
+
+    if priors:
+        # Los inicios de compás son siempre nota: compensar en el resto de ticks
+        frac_resto = (L - cfg.COMPASES) / L
+        p_rest = min(0.9, pesos.rest_ratio_obj / frac_resto)
+        p_hold = min(0.9 - p_rest, 0.5 * pesos.hold_ratio_max / frac_resto)
+    else:
+        p_rest, p_hold = P_REST_UNIFORME, P_HOLD_UNIFORME
+
+    cdf = _tabla_pitches(priors)[compas_de_tick]                      # (L, notas)
+    genes = cfg.RANGO_MIN + _muestrear(cdf, rng.random((n, L)))
+
+    r = rng.random((n, L))
+    genes[r < p_rest + p_hold] = cfg.HOLD
+    genes[r < p_rest] = cfg.REST
+
+    if priors:
+        inicios = np.arange(0, L, sub)
+        cdf_ac = _tabla_acordes()                                      # (compases, notas)
+        genes[:, inicios] = cfg.RANGO_MIN + _muestrear(cdf_ac, rng.random((n, len(inicios))))
+
+    return genes.astype(np.int16)
+
+
+def crear_individuos(
+    n: int,
+    priors: bool = True,
+    pesos: Optional[PesosFitness] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> List[Individuo]:
+    """Igual que generar_matriz pero devuelve Individuos (genes como listas de int)."""
+    return [Individuo(g) for g in generar_matriz(n, priors=priors, pesos=pesos, rng=rng).tolist()]
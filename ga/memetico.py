@@ -0,0 +1,144 @@
+# ga/memetico.py
+
+from __future__ import annotations
+
+import time
+import random
+from dataclasses import dataclass
+from typing import Callable
+
+import config as cfg
+
+from ga.individuo import Individuo
+from ga.poblacion import Poblacion
+from ga.fitness import PesosFitness, calcular_fitness
+from ga.operadores import _elegir_nota_musical
+
+EPS = 1e-4
+
+
+@dataclass
+class Memetico:
+    """
+    Búsqueda local (hill-climbing) sobre los mejores individuos.
+    Cada paso genera lote vecinos del actual, los puntúa juntos (una llamada a
+    fitness_lote si numpy está disponible) y se queda con el mejor si mejora.
+    Vecindario:
+    - gen suelto: nota de _elegir_nota_musical, REST o HOLD
+    - compás: re-elegir sus notas con _elegir_nota_musical
+    - compás: copiar otro compás (refuerza el motivo)
+
+    Acumula estadísticas para comparar la ganancia por CPU-ms con la del GA.
+    """
+    top_n: int = 2            # individuos refinados cada vez
+    cada: int = 10            # generaciones entre refinamientos (0 = sólo al final)
+    max_evals: int = 60       # evaluaciones de fitness por individuo refinado
+    lote: int = 20            # vecinos puntuados juntos en cada paso
+
+    evals: int = 0
+    mejoras: int = 0
+    ganancia: float = 0.0
+    cpu_ms: float = 0.0
+
+    def _vecino(self, genes: list[int], rng=random) -> list[int]:
+        g = genes.copy()
+        sub = cfg.SUBDIVISIONES_POR_COMPAS
+        r = rng.random()
+
+        if r < 0.60:
+            i = rng.randrange(len(g))
+            r2 = rng.random()
+            if r2 < 0.70:
+                g[i] = _elegir_nota_musical(g, i, rng)
+            elif r2 < 0.85:
+                g[i] = cfg.REST
+            else:
+                g[i] = cfg.HOLD
+        elif r < 0.85:
+            c = rng.randrange(cfg.COMPASES)
+            for i in range(c * sub, (c + 1) * sub):
+                if g[i] >= 0:
+                    g[i] = _elegir_nota_musical(g, i, rng)
+        else:
+            a, b = rng.sample(range(cfg.COMPASES), 2)
+            g[a * sub:(a + 1) * sub] = g[b * sub:(b + 1) * sub]
+        return g
+
+    @staticmethod
+    def _puntuador(pesos: PesosFitness) -> Callable[[list[list[int]]], list[float]]:
+        """
+        calcular_fitness de una lista de vecinos: vectorizado (ga/tensorial.py) si numpy
+        está instalado y fitness_lote cubre todos los términos activos; si no, uno a uno.
+        """
+        from ga.terminos import compilar
+        try:
+            from ga.tensorial import fitness_genomas, TERMINOS_LOTE
+        except ImportError:
+            TERMINOS_LOTE = frozenset()
+        if set(compilar(pesos).nombres) <= TERMINOS_LOTE:
+            return lambda vecinos: fitness_genomas(vecinos, pesos).tolist()
+        return lambda vecinos: [calcular_fitness(g, pesos) for g in vecinos]
+
+    def refinar(
+        self,
+        ind: Individuo,
+        pesos: PesosFitness | None = None,
+        rng=random,
+        penalizacion: Callable[[list[int]], float] | None = None,
+    ) -> Individuo:
+        """
+        Devuelve un individuo igual o mejor que ind (ind no se modifica).
+        La búsqueda compara el fitness sin penalización; penalizacion(genes) (la de
+        ejecutar_ga: hook y archivo, ya incluida en ind.fitness) se aplica una sola vez
+        al resultado, que sólo sustituye a ind si sigue siendo mejor con ella.
+        """
+        if pesos is None:
+            pesos = PesosFitness()
+        puntuar = self._puntuador(pesos)
+
+        t0 = time.process_time()
+        genes = ind.genes
+        fit = calcular_fitness(genes, pesos)
+        inicial = ind.fitness if ind.fitness is not None else fit - (penalizacion(genes) if penalizacion else 0.0)
+
+        restantes = self.max_evals
+        while restantes > 0:
+            vecinos = [self._vecino(genes, rng) for _ in range(min(self.lote, restantes))]
+            puntos = puntuar(vecinos)
+            restantes -= len(vecinos)
+            self.evals += len(vecinos)
+            i = max(range(len(vecinos)), key=puntos.__getitem__)
+            if puntos[i] > fit + EPS:
+                genes, fit = vecinos[i], puntos[i]
+                self.mejoras += 1
+
+        if penalizacion is not None and genes is not ind.genes:
+            fit -= penalizacion(genes)
+        if genes is ind.genes or fit <= inicial + EPS:
+            genes, fit = ind.genes, inicial
+
+        self.ganancia += fit - inicial
+        self.cpu_ms += (time.process_time() - t0) * 1000.0
+
+        out = Individuo(list(genes))
+        out.fitness = fit
+        return out
+
+    def refinar_poblacion(
+        self,
+        poblacion: Poblacion,
+        pesos: PesosFitness | None = None,
+        rng=random,
+        penalizacion: Callable[[list[int]], float] | None = None,
+    ) -> None:
+        """Sustituye los top_n individuos por su versión refinada."""
+        poblacion.ordenar()
+        for i in range(min(self.top_n, len(poblacion.individuos))):
+            poblacion.individuos[i] = self.refinar(poblacion.individuos[i], pesos, rng, penalizacion)
+
+    def ganancia_por_cpu_ms(self) -> float:
+        return self.ganancia / self.cpu_ms if self.cpu_ms > 0 else 0.0
+
+    def resumen(self) -> str:
+        return (f"evals={self.evals} | mejoras={self.mejoras} | ganancia={self.ganancia:.3f} | "
+                f"cpu={self.cpu_ms:.1f} ms | ganancia/cpu-ms={self.ganancia_por_cpu_ms():.4f}")
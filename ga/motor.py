@@ -0,0 +1,481 @@
+# ga/motor.py
+
+from __future__ import annotations
+
+import os
+import csv
+import time
+import random
+from typing import TYPE_CHECKING, Callable
+
+import config as cfg
+
+from ga.poblacion import Poblacion, DobleBuffer
+from ga.operadores import (
+    seleccion_torneo,
+    crossover_por_compas,
+    crossover_por_compas_en,
+    mutar,
+    mutar_en_sitio,
+)
+from ga.individuo import Individuo
+from ga.fitness import PesosFitness
+from ga.perfilado import Perfilador, SIN_PERFIL
+from ga.aleatorio import SemillaRNG, SemillaLike
+
+if TYPE_CHECKING:
+    # numpy sólo se carga si el llamador usa un archivo de melodías
+    from ga.archivo_melodias import ArchivoMelodias
+    from ga.memetico import Memetico
+    from ga.portafolio import PortafolioOperadores
+    from ga.evaluacion_compartida import EvaluadorCompartido
+    from ga.historial import HistorialRuns
+    from ga.sustituto import ModeloSustituto
+
+
+# =========================================================
+# Anti-estancamiento
+# =========================================================
+
+def _reinjection_diversidad(
+    poblacion: Poblacion,
+    porcentaje: float = 0.15,
+    pesos: PesosFitness | None = None,
+    verbose: bool = True,
+    penalizacion: Callable[[list[int]], float] | None = None,
+    rng=random,
+) -> None:
+    """Reemplaza el peor X% de individuos por nuevos aleatorios."""
+    if not (0.0 < porcentaje < 1.0):
+        return
+
+    poblacion.ordenar()
+    n = len(poblacion.individuos)
+    k = max(1, int(n * porcentaje))
+
+    nuevos = Poblacion.crear_aleatorios(k, pesos=pesos, rng=rng)
+    for i, ind in zip(range(n - k, n), nuevos):
+        ind.evaluar(pesos)
+        if penalizacion is not None:
+            ind.fitness -= penalizacion(ind.genes)
+        poblacion.individuos[i] = ind
+
+    if verbose:
+        print(f"   🔄 Reinjection: reemplazados {k} individuos (peores).")
+
+
+def _catastrofe_controlada(
+    poblacion: Poblacion,
+    elite: int = 2,
+    pesos: PesosFitness | None = None,
+    verbose: bool = True,
+    penalizacion: Callable[[list[int]], float] | None = None,
+    rng=random,
+) -> None:
+    """Reinicia la población manteniendo los 'elite' mejores individuos."""
+    poblacion.ordenar()
+    elites = [p.copiar() for p in poblacion.individuos[:elite]]
+
+    nuevos = Poblacion.crear_aleatorios(len(poblacion.individuos) - elite, pesos=pesos, rng=rng)
+    for ind in nuevos:
+        ind.evaluar(pesos)
+        if penalizacion is not None:
+            ind.fitness -= penalizacion(ind.genes)
+
+    poblacion.individuos = elites + nuevos
+    if verbose:
+        print("   💥 Catástrofe controlada: reiniciando población (mantengo élite).")
+
+
+# =========================================================
+# Top-K distintos
+# =========================================================
+
+class TopDistintos:
+    """
+    Mejores K genomas distintos vistos durante una ejecución
+    (sobrevive a reinyecciones y catástrofes, a diferencia de la población final).
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._fitness: dict[tuple[int, ...], float] = {}
+
+    def actualizar(self, individuos: list[Individuo]) -> None:
+        for ind in individuos:
+            clave = tuple(ind.genes)
+            if ind.fitness > self._fitness.get(clave, float("-inf")):
+                self._fitness[clave] = ind.fitness
+
+        # Poda perezosa: memoria acotada sin ordenar en cada generación
+        if len(self._fitness) > 4 * self.k:
+            self._fitness = dict(self._ordenados()[:self.k])
+
+    def _ordenados(self) -> list[tuple[tuple[int, ...], float]]:
+        return sorted(self._fitness.items(), key=lambda kv: kv[1], reverse=True)
+
+    def mejores(self) -> list[tuple[list[int], float]]:
+        """[(genes, fitness), ...] de mejor a peor."""
+        return [(list(g), f) for g, f in self._ordenados()[:self.k]]
+
+
+# =========================================================
+# GA
+# =========================================================
+
+def ejecutar_ga(
+    pesos: PesosFitness | None = None,
+    generaciones: int = 180,
+    paciencia: int = 12,
+    reinject_cada: int = 15,
+    reinject_pct: float = 0.15,
+    csv_path: str | None = os.path.join("logs", "ga_run.csv"),
+    verbose: bool = True,
+    top: TopDistintos | None = None,
+    archivo: ArchivoMelodias | None = None,
+    umbral_archivo: float = 0.8,
+    pen_archivo: float = 20.0,
+    semillas: list[list[int]] | None = None,
+    frac_aleatoria: float | None = None,
+    memetico: Memetico | None = None,
+    portafolio: PortafolioOperadores | None = None,
+    perfilador: Perfilador | None = None,
+    en_sitio: bool | None = None,
+    evaluador: EvaluadorCompartido | None = None,
+    penalizacion: Callable[[list[int]], float] | None = None,
+    historial_runs: HistorialRuns | None = None,
+    etiqueta: str = "",
+    semilla: SemillaLike = None,
+    sustituto: ModeloSustituto | None = None,
+) -> tuple[list[int], float]:
+    """
+    GA con:
+    - mutación adaptativa
+    - reinyección periódica
+    - catástrofe controlada
+    - logging a CSV (csv_path=None lo desactiva) y, opcionalmente, al historial
+      columnar de ejecuciones (historial_runs, ver ga/historial.py) con la etiqueta dada
+    - top-K de genomas distintos (opcional, ver TopDistintos)
+    - novedad entre ejecuciones: los individuos casi idénticos (similitud >= umbral_archivo)
+      a una melodía del archivo pierden pen_archivo puntos (hijos, población inicial,
+      reinyecciones y catástrofes). Las semillas están archivadas por construcción:
+      en la generación 0 quedan exentas y la penalización recae en su descendencia
+    - arranque en caliente: semillas (p. ej. de BancoSemillas) mezcladas con
+      una fracción frac_aleatoria de individuos aleatorios
+    - etapa memética opcional (búsqueda local sobre los mejores, ver Memetico)
+    - portafolio adaptativo de cruces/mutaciones (opcional, ver PortafolioOperadores);
+      sin él se usan crossover_por_compas + mutar
+    - perfilado opcional por fases / cProfile / tracemalloc (ver Perfilador)
+    - reproducción en sitio con doble buffer (en_sitio, por defecto cfg.REPRODUCCION_EN_SITIO):
+      mismos hijos con la misma semilla, sin crear Individuos ni listas por hijo
+    - evaluación de los hijos en varios procesos sobre memoria compartida
+      (opcional, ver EvaluadorCompartido; debe haberse creado con los mismos pesos).
+      Con portafolio, el crédito de los operadores llega al final de cada generación
+    - fitness sustituto opcional (ver ModeloSustituto): aprende en línea de los hijos
+      evaluados y, mientras su precisión se mantiene, se generan más hijos de los
+      necesarios y sólo los que el sustituto prefiere se evalúan con calcular_fitness.
+      Con sustituto (o evaluador) los hijos se evalúan juntos al final de la reproducción
+    - penalizacion(genes) opcional restada al fitness de todos los individuos
+      (restricciones externas, p. ej. fronteras entre secciones en ga/forma_larga.py)
+    - toda la aleatoriedad sale de un random.Random propio sembrado con semilla
+      (SemillaRNG, int o "entropia/i/j"; None -> semilla nueva): misma semilla,
+      misma ejecución, sin depender del estado global de random. La semilla usada
+      se imprime y se guarda en el historial de ejecuciones
+    - fitness parametrizable por CLI
+
+    Tamaño de población, mutación base, torneo y elitismo se leen de config.
+    """
+    def _penalizacion_total(genes: list[int], novedad: bool = True) -> float:
+        pen = penalizacion(genes) if penalizacion is not None else 0.0
+        if novedad and archivo is not None and archivo.es_duplicado(genes, umbral=umbral_archivo):
+            pen += pen_archivo
+        return pen
+
+    # Misma penalización para todo individuo evaluado (hijos, iniciales, reinyectados...)
+    penalizar = _penalizacion_total if (penalizacion is not None or archivo is not None) else None
+
+    def _penalizar(ind: Individuo, novedad: bool = True) -> None:
+        if penalizar is not None:
+            ind.fitness -= penalizar(ind.genes, novedad)
+
+    def _evaluar_hijo(ind: Individuo) -> None:
+        ind.evaluar(pesos)
+        _penalizar(ind)
+
+    if evaluador is not None and evaluador.pesos != (pesos if pesos is not None else PesosFitness()):
+        raise ValueError("El evaluador compartido se creó con otros pesos de fitness")
+
+    if frac_aleatoria is None:
+        frac_aleatoria = cfg.FRAC_ALEATORIA_SEMILLAS
+    if en_sitio is None:
+        en_sitio = cfg.REPRODUCCION_EN_SITIO
+
+    semilla = SemillaRNG.desde(semilla)
+    rng = semilla.generador()
+    if verbose:
+        print(f"🎲 Semilla: {semilla} (ejecutar_ga; ejecutar_ga_lote da otra ejecución con la misma)")
+
+    perf = perfilador if perfilador is not None else SIN_PERFIL
+    perf.iniciar()
+
+    poblacion = Poblacion.crear_inicial(
+        cfg.TAMANO_POBLACION, semillas=semillas, frac_aleatoria=frac_aleatoria, pesos=pesos, rng=rng
+    )
+    poblacion.evaluar(pesos)
+    de_banco = {tuple(g) for g in semillas} if semillas else set()
+    for ind in poblacion.individuos:
+        _penalizar(ind, novedad=tuple(ind.genes) not in de_banco)
+    if top is not None:
+        top.actualizar(poblacion.individuos)
+    buffer = DobleBuffer(poblacion) if en_sitio else None
+
+    mejor_global = poblacion.mejor().copiar()
+    fitness_inicial = mejor_global.fitness
+    t0_cpu = time.process_time()
+
+    base_mut = cfg.PROB_MUTACION
+    prob_mut = base_mut
+
+    sin_mejora_boost = 0
+    sin_mejora_global = 0
+
+    catastrofe_umbral = paciencia * 2   # 24
+    catastrofe_elite = cfg.ELITISMO
+
+    historial = []
+
+    diferir = evaluador is not None or sustituto is not None
+
+    for gen in range(1, generaciones + 1):
+        # 1) elitismo
+        poblacion.ordenar()
+        elites = poblacion.individuos[:cfg.ELITISMO]
+
+        # Con el sustituto activo se generan candidatos de sobra (en listas nuevas, no en el buffer)
+        cribar = sustituto is not None and sustituto.activo()
+        objetivo = cfg.TAMANO_POBLACION
+        if cribar:
+            objetivo = len(elites) + sustituto.n_candidatos(cfg.TAMANO_POBLACION - len(elites))
+        en_buffer = buffer is not None and not cribar
+
+        if not en_buffer:
+            nueva = [e.copiar() for e in elites]
+        else:
+            nueva = buffer.siguiente.individuos
+            for destino, e in zip(nueva, elites):
+                destino.copiar_de(e)
+        n = len(elites)
+        pendientes = []   # créditos del portafolio a la espera de la evaluación en lote
+
+        # 2) reproducción
+        while n < objetivo:
+            with perf.fase("seleccion"):
+                p1 = seleccion_torneo(poblacion, k=cfg.K_TORNEO, rng=rng)
+                p2 = seleccion_torneo(poblacion, k=cfg.K_TORNEO, rng=rng)
+
+            if portafolio is not None:
+                op_cruce, op_mut = portafolio.elegir(rng)
+
+            if not en_buffer:
+                if portafolio is None:
+                    with perf.fase("cruce"):
+                        h1, h2 = crossover_por_compas(p1, p2, rng)
+
+                    with perf.fase("mutacion"):
+                        h1 = mutar(h1, prob_gen=prob_mut, rng=rng)
+                        h2 = mutar(h2, prob_gen=prob_mut, rng=rng)
+                else:
+                    with perf.fase("cruce"):
+                        h1, h2 = portafolio.cruzar(op_cruce, p1, p2, rng)
+
+                    with perf.fase("mutacion"):
+                        h1 = portafolio.mutar(op_mut, h1, prob_mut, rng)
+                        h2 = portafolio.mutar(op_mut, h2, prob_mut, rng)
+                nueva.append(h1)
+                if n + 1 < objetivo:
+                    nueva.append(h2)
+            else:
+                # Hijos escritos directamente en los huecos de la siguiente generación
+                h1 = nueva[n]
+                h2 = nueva[n + 1] if n + 1 < cfg.TAMANO_POBLACION else buffer.sobrante
+                if portafolio is None:
+                    with perf.fase("cruce"):
+                        crossover_por_compas_en(p1, p2, h1, h2, rng)
+
+                    with perf.fase("mutacion"):
+                        mutar_en_sitio(h1, prob_gen=prob_mut, rng=rng)
+                        mutar_en_sitio(h2, prob_gen=prob_mut, rng=rng)
+                else:
+                    with perf.fase("cruce"):
+                        portafolio.cruzar_en(op_cruce, p1, p2, h1, h2, rng)
+
+                    with perf.fase("mutacion"):
+                        portafolio.mutar_en_sitio(op_mut, h1, prob_mut, rng)
+                        portafolio.mutar_en_sitio(op_mut, h2, prob_mut, rng)
+
+            dos_hijos = n + 1 < objetivo
+            n += 2 if dos_hijos else 1
+
+            if diferir:
+                # Se evalúan todos juntos al terminar la reproducción
+                if portafolio is not None:
+                    pendientes.append((op_cruce, op_mut, h1, h2 if dos_hijos else None,
+                                       max(p1.fitness, p2.fitness)))
+                continue
+
+            with perf.fase("evaluacion"):
+                _evaluar_hijo(h1)
+                if dos_hijos:
+                    _evaluar_hijo(h2)
+
+            if portafolio is not None:
+                mejor_padre = max(p1.fitness, p2.fitness)
+                portafolio.registrar(op_cruce, op_mut, h1.fitness, mejor_padre)
+                if dos_hijos:
+                    portafolio.registrar(op_cruce, op_mut, h2.fitness, mejor_padre)
+
+        if diferir:
+            hijos, auditados = nueva[len(elites):], []
+            if cribar:
+                with perf.fase("sustituto"):
+                    hijos, auditados = sustituto.cribar(hijos, cfg.TAMANO_POBLACION - len(elites), rng)
+                nueva = nueva[:len(elites)] + hijos
+
+            with perf.fase("evaluacion"):
+                for grupo in (hijos, auditados):
+                    if evaluador is not None:
+                        evaluador.evaluar(grupo)
+                        for h in grupo:
+                            _penalizar(h)
+                    else:
+                        for h in grupo:
+                            _evaluar_hijo(h)
+
+            if sustituto is not None:
+                with perf.fase("sustituto"):
+                    sustituto.observar(hijos + auditados)
+                    if sustituto.fin_generacion(cribar) and verbose:
+                        print(f"   🔮 Sustituto desactivado: precisión {sustituto.precision:.3f} "
+                              f"< {sustituto.umbral_precision} (vuelvo a evaluar todos los hijos)")
+
+            # Los candidatos descartados sin evaluar no dan crédito al portafolio
+            for op_cruce, op_mut, h1, h2, mejor_padre in pendientes:
+                for h in (h1, h2):
+                    if h is not None and h.fitness is not None:
+                        portafolio.registrar(op_cruce, op_mut, h.fitness, mejor_padre)
+
+        if buffer is None:
+            poblacion = Poblacion(nueva)
+        elif not en_buffer:
+            # Generación cribada: los elegidos se copian al buffer para seguir alternando
+            for destino, ind in zip(buffer.siguiente.individuos, nueva):
+                destino.copiar_de(ind)
+            poblacion = buffer.intercambiar()
+        else:
+            poblacion = buffer.intercambiar()
+
+        # 3) reinjection periódica
+        if reinject_cada > 0 and gen % reinject_cada == 0:
+            with perf.fase("reinyeccion"):
+                _reinjection_diversidad(poblacion, porcentaje=reinject_pct, pesos=pesos,
+                                        verbose=verbose, penalizacion=penalizar, rng=rng)
+
+        # 3b) búsqueda local periódica sobre los mejores
+        if memetico is not None and memetico.cada > 0 and gen % memetico.cada == 0:
+            with perf.fase("memetico"):
+                memetico.refinar_poblacion(poblacion, pesos, rng, penalizar)
+
+        # 4) actualizar mejor global
+        EPS = 1e-4
+        mejor_gen = poblacion.mejor()
+
+        if mejor_gen.fitness > mejor_global.fitness + EPS:
+            mejor_global = mejor_gen.copiar()
+            sin_mejora_boost = 0
+            sin_mejora_global = 0
+            prob_mut = max(base_mut, prob_mut * 0.90)
+        else:
+            sin_mejora_boost += 1
+            sin_mejora_global += 1
+
+            if verbose and sin_mejora_global in (10, 15, 20, 23, 24, 25):
+                print(f"   🧊 sin_mejora_global={sin_mejora_global} (umbral={catastrofe_umbral})")
+
+            if sin_mejora_boost >= paciencia:
+                prob_mut = min(0.35, prob_mut * 1.60)
+                sin_mejora_boost = 0
+
+            if sin_mejora_global >= catastrofe_umbral:
+                with perf.fase("catastrofe"):
+                    _catastrofe_controlada(poblacion, elite=catastrofe_elite, pesos=pesos,
+                                           verbose=verbose, penalizacion=penalizar, rng=rng)
+                sin_mejora_global = 0
+                sin_mejora_boost = 0
+                prob_mut = base_mut
+
+        # Logging por generación
+        with perf.fase("logging"):
+            if top is not None:
+                top.actualizar(poblacion.individuos)
+
+            historial.append({
+                "gen": gen,
+                "best_global": float(mejor_global.fitness),
+                "best_gen": float(mejor_gen.fitness),
+                "p_mut": float(prob_mut),
+                "sin_mejora_global": int(sin_mejora_global),
+                **(portafolio.columnas_log() if portafolio is not None else {}),
+                **(sustituto.columnas_log() if sustituto is not None else {}),
+            })
+
+            if verbose:
+                print(f"Gen {gen:03d} | Mejor fitness: {mejor_global.fitness:.3f} | p_mut: {prob_mut:.3f}")
+
+        perf.fin_generacion(gen)
+
+    if memetico is not None:
+        ga_cpu_ms = (time.process_time() - t0_cpu) * 1000.0 - memetico.cpu_ms
+        ga_ganancia = mejor_global.fitness - fitness_inicial
+
+        # Refinamiento final del mejor global
+        refinado = memetico.refinar(mejor_global, pesos, rng, penalizar)
+        if refinado.fitness > mejor_global.fitness:
+            mejor_global = refinado
+
+        if verbose:
+            print(f"\n🧗 Memético: {memetico.resumen()}")
+            print(f"   GA: ganancia={ga_ganancia:.3f} | cpu={ga_cpu_ms:.1f} ms | "
+                  f"ganancia/cpu-ms={ga_ganancia / max(ga_cpu_ms, 1e-9):.4f}"
+                  + (" (incluye élites refinadas)" if memetico.cada > 0 else ""))
+
+    if portafolio is not None and verbose:
+        print("\n🎲 Portafolio de operadores:")
+        print(portafolio.resumen())
+
+    if sustituto is not None and verbose:
+        print(f"\n🔮 Sustituto: {sustituto.resumen()}")
+
+    # Guardar CSV
+    if historial and csv_path:
+        os.makedirs(os.path.dirname(csv_path) or ".", exist_ok=True)
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            # La semilla va en cada fila: el CSV basta para repetir la ejecución
+            w = csv.DictWriter(f, fieldnames=["semilla", *historial[0].keys()])
+            w.writeheader()
+            w.writerows({"semilla": str(semilla), **fila} for fila in historial)
+        if verbose:
+            print(f"\n📄 Log guardado: {csv_path}")
+
+    if historial and historial_runs is not None:
+        run = historial_runs.añadir(historial, etiqueta=etiqueta, meta={
+            "tonica": cfg.TONICA, "modo": cfg.MODO, "acordes": list(cfg.ACORDES),
+            "fitness": float(mejor_global.fitness), "semilla": str(semilla),
+        })
+        if verbose:
+            print(f"📚 Historial: run {run} en {historial_runs.directorio}")
+
+    resumen_perfil = perf.finalizar()
+    if resumen_perfil and verbose:
+        print(f"⏱️ Perfil guardado: {resumen_perfil}")
+
+    return mejor_global.genes, float(mejor_global.fitness)
@@ -7,14 +7,17 @@ from ga.individuo import Individuo
 from musica.tonalidad import build_scale_pitch_classes
 from musica.acordes import chord_pitch_classes
 
+# Todos los operadores reciben rng (random.Random, ver ga/aleatorio.py);
+# por defecto usan el generador global del módulo random.
 
-def seleccion_torneo(poblacion, k=3):
-    candidatos = random.sample(poblacion.individuos, k)
+
+def seleccion_torneo(poblacion, k=3, rng=random):
+    candidatos = rng.sample(poblacion.individuos, k)
     return max(candidatos, key=lambda x: x.fitness)
 
 
-def crossover_por_compas(p1: Individuo, p2: Individuo) -> tuple[Individuo, Individuo]:
-    punto_compas = random.randint(1, (cfg.LONGITUD_MELODIA // cfg.SUBDIVISIONES_POR_COMPAS) - 1)
+def crossover_por_compas(p1: Individuo, p2: Individuo, rng=random) -> tuple[Individuo, Individuo]:
+    punto_compas = rng.randint(1, (cfg.LONGITUD_MELODIA // cfg.SUBDIVISIONES_POR_COMPAS) - 1)
     corte = punto_compas * cfg.SUBDIVISIONES_POR_COMPAS
 
     g1 = p1.genes[:corte] + p2.genes[corte:]
@@ -56,7 +59,7 @@ def _pc_a_notas_en_rango(pcs: set[int], rango_min: int, rango_max: int) -> list[
     return out
 
 
-def _elegir_nota_musical(genes: list[int], i: int) -> int:
+def _elegir_nota_musical(genes: list[int], i: int, rng=random) -> int:
     """
     Elige una nota "musical":
     1) prioriza acorde del compás
@@ -79,10 +82,10 @@ def _elegir_nota_musical(genes: list[int], i: int) -> int:
 
     def elegir_cercana(cands: list[int]) -> int:
         if not cands:
-            return random.randint(cfg.RANGO_MIN, cfg.RANGO_MAX)
+            return rng.randint(cfg.RANGO_MIN, cfg.RANGO_MAX)
 
         if prev is None:
-            return random.choice(cands)
+            return rng.choice(cands)
 
         # ponderación por cercanía: intervalos pequeños pesan más
         # peso = 1 / (1 + distancia)
@@ -93,7 +96,7 @@ def _elegir_nota_musical(genes: list[int], i: int) -> int:
 
         # selección por ruleta
         total = sum(pesos)
-        r = random.random() * total
+        r = rng.random() * total
         acc = 0.0
         for n, w in zip(cands, pesos):
             acc += w
@@ -102,29 +105,40 @@ def _elegir_nota_musical(genes: list[int], i: int) -> int:
         return cands[-1]
 
     # 70% acorde, 30% escala (cuando mutamos a nota)
-    if candidatos_acorde and random.random() < 0.70:
+    if candidatos_acorde and rng.random() < 0.70:
         return elegir_cercana(candidatos_acorde)
 
     if candidatos_escala:
         return elegir_cercana(candidatos_escala)
 
-    return random.randint(cfg.RANGO_MIN, cfg.RANGO_MAX)
+    return rng.randint(cfg.RANGO_MIN, cfg.RANGO_MAX)
+
+
+def crossover_por_compas_en(p1: Individuo, p2: Individuo, h1: Individuo, h2: Individuo, rng=random) -> None:
+    """Como crossover_por_compas, pero escribe los hijos en h1/h2 (buffers preasignados)."""
+    punto_compas = rng.randint(1, (cfg.LONGITUD_MELODIA // cfg.SUBDIVISIONES_POR_COMPAS) - 1)
+    corte = punto_compas * cfg.SUBDIVISIONES_POR_COMPAS
 
+    h1.genes[:corte] = p1.genes[:corte]
+    h1.genes[corte:] = p2.genes[corte:]
+    h2.genes[:corte] = p2.genes[:corte]
+    h2.genes[corte:] = p1.genes[corte:]
 
-def mutar(ind: Individuo, prob_gen=None) -> Individuo:
+
+def mutar_en_sitio(ind: Individuo, prob_gen=None, rng=random) -> Individuo:
     """
-    Mutación musical:
+    Mutación musical sobre ind.genes (sin copiar):
     - mantiene REST/HOLD con probabilidades
     - si toca nota: elige nota preferentemente del acorde/escala y cercana a la anterior
     """
     if prob_gen is None:
         prob_gen = cfg.PROB_MUTACION
 
-    genes = ind.genes.copy()
+    genes = ind.genes
 
     for i in range(len(genes)):
-        if random.random() < prob_gen:
-            r = random.random()
+        if rng.random() < prob_gen:
+            r = rng.random()
 
             # Mantén tus ratios, pero ahora la "nota" es musical
             if r < 0.15:
@@ -132,6 +146,146 @@ def mutar(ind: Individuo, prob_gen=None) -> Individuo:
             elif r < 0.30:
                 genes[i] = cfg.HOLD
             else:
-                genes[i] = _elegir_nota_musical(genes, i)
+                genes[i] = _elegir_nota_musical(genes, i, rng)
+
+    ind.fitness = None
+    return ind
+
+
+def mutar(ind: Individuo, prob_gen=None, rng=random) -> Individuo:
+    """Mutación musical sobre una copia (ver mutar_en_sitio)."""
+    return mutar_en_sitio(Individuo(ind.genes.copy()), prob_gen, rng)
+
+
+# =========================================================
+# Operadores adicionales (portafolio adaptativo, ver ga/portafolio.py)
+# =========================================================
+
+def _compases_a_tocar(prob: float, rng=random) -> list[int]:
+    """Cada compás con probabilidad prob; si no sale ninguno, uno al azar."""
+    compases = [c for c in range(cfg.COMPASES) if rng.random() < prob]
+    return compases or [rng.randrange(cfg.COMPASES)]
+
+
+def _rango_compas(c: int) -> range:
+    return range(c * cfg.SUBDIVISIONES_POR_COMPAS, (c + 1) * cfg.SUBDIVISIONES_POR_COMPAS)
+
+
+def crossover_multicorte(p1: Individuo, p2: Individuo, rng=random) -> tuple[Individuo, Individuo]:
+    """Dos cortes en fronteras de compás: intercambia el bloque central."""
+    h1, h2 = Individuo(p1.genes.copy()), Individuo(p2.genes.copy())
+    crossover_multicorte_en(p1, p2, h1, h2, rng)
+    return h1, h2
+
+
+def crossover_multicorte_en(p1: Individuo, p2: Individuo, h1: Individuo, h2: Individuo, rng=random) -> None:
+    a, b = sorted(rng.sample(range(1, cfg.COMPASES), 2))
+    a *= cfg.SUBDIVISIONES_POR_COMPAS
+    b *= cfg.SUBDIVISIONES_POR_COMPAS
+
+    h1.genes[:] = p1.genes
+    h2.genes[:] = p2.genes
+    h1.genes[a:b] = p2.genes[a:b]
+    h2.genes[a:b] = p1.genes[a:b]
+
+
+def crossover_uniforme_compas(p1: Individuo, p2: Individuo, rng=random) -> tuple[Individuo, Individuo]:
+    """Cada compás viene de un padre u otro con probabilidad 1/2."""
+    h1, h2 = Individuo(p1.genes.copy()), Individuo(p2.genes.copy())
+    crossover_uniforme_compas_en(p1, p2, h1, h2, rng)
+    return h1, h2
+
+
+def crossover_uniforme_compas_en(p1: Individuo, p2: Individuo, h1: Individuo, h2: Individuo, rng=random) -> None:
+    h1.genes[:] = p1.genes
+    h2.genes[:] = p2.genes
+    for c in range(cfg.COMPASES):
+        if rng.random() < 0.5:
+            r = _rango_compas(c)
+            h1.genes[r.start:r.stop] = p2.genes[r.start:r.stop]
+            h2.genes[r.start:r.stop] = p1.genes[r.start:r.stop]
+
+
+def crossover_motivo(p1: Individuo, p2: Individuo, rng=random) -> tuple[Individuo, Individuo]:
+    """Copia un compás (motivo) de un padre en una posición aleatoria del otro."""
+    h1, h2 = Individuo(p1.genes.copy()), Individuo(p2.genes.copy())
+    crossover_motivo_en(p1, p2, h1, h2, rng)
+    return h1, h2
+
+
+def crossover_motivo_en(p1: Individuo, p2: Individuo, h1: Individuo, h2: Individuo, rng=random) -> None:
+    sub = cfg.SUBDIVISIONES_POR_COMPAS
+
+    def copiar_motivo(base: Individuo, donante: Individuo, hijo: Individuo) -> None:
+        hijo.genes[:] = base.genes
+        origen = rng.randrange(cfg.COMPASES) * sub
+        destino = rng.randrange(cfg.COMPASES) * sub
+        hijo.genes[destino:destino + sub] = donante.genes[origen:origen + sub]
+
+    copiar_motivo(p1, p2, h1)
+    copiar_motivo(p2, p1, h2)
+
+
+def mutar_ritmo_en_sitio(ind: Individuo, prob_gen=None, rng=random) -> Individuo:
+    """
+    Mutación rítmica: cambia ataques por HOLD/REST y viceversa,
+    manteniendo las notas musicales del compás.
+    """
+    if prob_gen is None:
+        prob_gen = cfg.PROB_MUTACION
+
+    genes = ind.genes
+    for i in range(len(genes)):
+        if rng.random() < prob_gen:
+            if genes[i] >= 0:
+                genes[i] = cfg.HOLD if rng.random() < 0.5 else cfg.REST
+            else:
+                genes[i] = _elegir_nota_musical(genes, i, rng)
+    ind.fitness = None
+    return ind
+
+
+def mutar_ritmo(ind: Individuo, prob_gen=None, rng=random) -> Individuo:
+    return mutar_ritmo_en_sitio(Individuo(ind.genes.copy()), prob_gen, rng)
+
+
+def mutar_transponer_compas_en_sitio(ind: Individuo, prob_gen=None, rng=random) -> Individuo:
+    """Transpone las notas de uno o varios compases unos semitonos (plegando al rango)."""
+    if prob_gen is None:
+        prob_gen = cfg.PROB_MUTACION
+
+    genes = ind.genes
+    for c in _compases_a_tocar(prob_gen, rng):
+        salto = rng.choice((-4, -3, -2, 2, 3, 4))
+        for i in _rango_compas(c):
+            if genes[i] >= 0:
+                n = genes[i] + salto
+                if n > cfg.RANGO_MAX:
+                    n -= 12
+                if n < cfg.RANGO_MIN:
+                    n += 12
+                genes[i] = max(cfg.RANGO_MIN, min(cfg.RANGO_MAX, n))
+    ind.fitness = None
+    return ind
+
+
+def mutar_transponer_compas(ind: Individuo, prob_gen=None, rng=random) -> Individuo:
+    return mutar_transponer_compas_en_sitio(Individuo(ind.genes.copy()), prob_gen, rng)
+
+
+def mutar_duplicar_compas_en_sitio(ind: Individuo, prob_gen=None, rng=random) -> Individuo:
+    """Duplica un compás sobre otro (refuerza repetición / hook)."""
+    if prob_gen is None:
+        prob_gen = cfg.PROB_MUTACION
+
+    sub = cfg.SUBDIVISIONES_POR_COMPAS
+    genes = ind.genes
+    for destino in _compases_a_tocar(prob_gen, rng):
+        origen = rng.randrange(cfg.COMPASES)
+        genes[destino * sub:(destino + 1) * sub] = genes[origen * sub:(origen + 1) * sub]
+    ind.fitness = None
+    return ind
+
 
-    return Individuo(genes)
+def mutar_duplicar_compas(ind: Individuo, prob_gen=None, rng=random) -> Individuo:
+    return mutar_duplicar_compas_en_sitio(Individuo(ind.genes.copy()), prob_gen, rng)
@@ -0,0 +1,171 @@
+# ga/perfilado.py
+
+from __future__ import annotations
+
+import os
+import io
+import csv
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional
+
+# Fases medidas por generación en ejecutar_ga
+FASES = ("seleccion", "cruce", "mutacion", "evaluacion", "sustituto", "reinyeccion", "memetico", "catastrofe", "logging")
+
+
+class _Fase:
+    """Context manager reutilizable: suma el tiempo de pared de la fase en el acumulador."""
+
+    __slots__ = ("acum", "nombre", "t0")
+
+    def __init__(self, acum: Dict[str, float], nombre: str):
+        self.acum = acum
+        self.nombre = nombre
+        self.t0 = 0.0
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.acum[self.nombre] += time.perf_counter() - self.t0
+        return False
+
+
+class Perfilador:
+    """
+    Instrumentación de una ejecución del GA:
+    - tiempos por fase y generación -> <dir>/perfil_fases.csv
+    - cProfile de toda la ejecución (opcional) -> <dir>/perfil.prof
+    - snapshots de tracemalloc en generaciones elegidas -> <dir>/tracemalloc_gen<N>.txt
+    - resumen legible -> <dir>/perfil_resumen.txt
+    """
+
+    def __init__(
+        self,
+        directorio: str = "logs",
+        cprofile: bool = False,
+        tracemalloc_gens: Iterable[int] = (),
+        top: int = 25,
+    ):
+        self.directorio = directorio
+        self.usar_cprofile = cprofile
+        self.tracemalloc_gens = set(tracemalloc_gens)
+        self.top = top
+
+        self._acum: Dict[str, float] = {f: 0.0 for f in FASES}
+        self._fases = {f: _Fase(self._acum, f) for f in FASES}
+        self.filas: List[dict] = []
+        self._prof: Optional[cProfile.Profile] = None
+        self._snapshot_prev = None
+        self._ficheros_tracemalloc: List[str] = []
+        self._t0 = 0.0
+        self._tracemalloc_propio = False   # True si el trazado lo arrancó este Perfilador
+
+    def fase(self, nombre: str) -> _Fase:
+        return self._fases[nombre]
+
+    def iniciar(self) -> None:
+        os.makedirs(self.directorio, exist_ok=True)
+        self._t0 = time.perf_counter()
+        if self.tracemalloc_gens and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracemalloc_propio = True
+        if self.usar_cprofile:
+            self._prof = cProfile.Profile()
+            self._prof.enable()
+
+    def fin_generacion(self, gen: int) -> None:
+        self.filas.append({"gen": gen, **{f: round(v * 1000.0, 4) for f, v in self._acum.items()}})
+        for f in FASES:
+            self._acum[f] = 0.0
+
+        if gen in self.tracemalloc_gens:
+            self._snapshot_tracemalloc(gen)
+
+    def _snapshot_tracemalloc(self, gen: int) -> None:
+        snap = tracemalloc.take_snapshot()
+        actual, pico = tracemalloc.get_traced_memory()
+
+        path = os.path.join(self.directorio, f"tracemalloc_gen{gen}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Generación {gen} | memoria trazada={actual / 1024:.1f} KiB | pico={pico / 1024:.1f} KiB\n\n")
+            f.write(f"Top {self.top} por línea:\n")
+            for st in snap.statistics("lineno")[:self.top]:
+                f.write(f"  {st}\n")
+            if self._snapshot_prev is not None:
+                f.write(f"\nTop {self.top} diferencias desde el snapshot anterior:\n")
+                for st in snap.compare_to(self._snapshot_prev, "lineno")[:self.top]:
+                    f.write(f"  {st}\n")
+        self._snapshot_prev = snap
+        self._ficheros_tracemalloc.append(path)
+
+    def finalizar(self) -> str:
+        """Escribe CSV, volcado de cProfile y resumen. Devuelve el path del resumen."""
+        total_s = time.perf_counter() - self._t0
+
+        if self._prof is not None:
+            self._prof.disable()
+            self._prof.dump_stats(os.path.join(self.directorio, "perfil.prof"))
+        if self._tracemalloc_propio:
+            # Un trazado que ya estaba activo antes de iniciar() es de quien lo arrancó
+            tracemalloc.stop()
+            self._tracemalloc_propio = False
+
+        if self.filas:
+            with open(os.path.join(self.directorio, "perfil_fases.csv"), "w", newline="", encoding="utf-8") as f:
+                w = csv.DictWriter(f, fieldnames=self.filas[0].keys())
+                w.writeheader()
+                w.writerows(self.filas)
+
+        path = os.path.join(self.directorio, "perfil_resumen.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.resumen(total_s))
+        return path
+
+    def resumen(self, total_s: float) -> str:
+        n = max(1, len(self.filas))
+        tot = {fase: sum(r[fase] for r in self.filas) for fase in FASES}
+        medido = sum(tot.values())
+
+        out = io.StringIO()
+        out.write(f"Ejecución: {total_s:.3f} s | generaciones: {len(self.filas)}\n\n")
+        out.write(f"{'fase':12s} {'total ms':>10s} {'ms/gen':>9s} {'%':>6s}\n")
+        for fase in sorted(FASES, key=lambda x: tot[x], reverse=True):
+            pct = 100.0 * tot[fase] / medido if medido > 0 else 0.0
+            out.write(f"{fase:12s} {tot[fase]:10.1f} {tot[fase] / n:9.3f} {pct:6.1f}\n")
+
+        if self._prof is not None:
+            out.write(f"\ncProfile (top {self.top} por tiempo acumulado, volcado en perfil.prof):\n")
+            stats = pstats.Stats(self._prof, stream=out)
+            stats.sort_stats("cumulative").print_stats(self.top)
+
+        if self._ficheros_tracemalloc:
+            out.write("\nSnapshots tracemalloc:\n")
+            for p in self._ficheros_tracemalloc:
+                out.write(f"  {p}\n")
+        return out.getvalue()
+
+
+class _SinPerfil:
+    """Perfilador nulo: mismas llamadas, sin medir nada."""
+
+    _nulo = nullcontext()
+
+    def fase(self, nombre: str):
+        return self._nulo
+
+    def iniciar(self) -> None:
+        pass
+
+    def fin_generacion(self, gen: int) -> None:
+        pass
+
+    def finalizar(self) -> None:
+        return None
+
+
+SIN_PERFIL = _SinPerfil()
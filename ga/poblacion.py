@@ -1,5 +1,8 @@
 # ga/poblacion.py
 
+import random
+
+import config as cfg
 from ga.individuo import Individuo
 
 
@@ -8,10 +11,38 @@ class Poblacion:
         self.individuos = individuos if individuos is not None else []
 
     @staticmethod
-    def crear_inicial(tamano: int) -> "Poblacion":
-        inds = [Individuo().crear_aleatorio() for _ in range(tamano)]
+    def crear_inicial(tamano: int, semillas=None, frac_aleatoria: float = 1.0, pesos=None, rng=random) -> "Poblacion":
+        """
+        Población inicial aleatoria. Si hay semillas (genomas de ejecuciones
+        anteriores), ocupan hasta (1 - frac_aleatoria) de la población.
+        """
+        n_semillas = 0
+        if semillas:
+            n_semillas = min(len(semillas), int(round(tamano * (1.0 - frac_aleatoria))))
+
+        inds = [Individuo(list(g)) for g in semillas[:n_semillas]] if n_semillas else []
+        inds.extend(Poblacion.crear_aleatorios(tamano - n_semillas, pesos=pesos, rng=rng))
         return Poblacion(inds)
 
+    @staticmethod
+    def crear_aleatorios(n: int, pesos=None, rng=random) -> list:
+        """
+        n individuos nuevos según cfg.INICIALIZADOR:
+        - "escalar": Individuo.crear_aleatorio (gen a gen)
+        - "vectorizado": misma distribución, generada en una llamada NumPy
+        - "musical": NumPy con priors (acorde en inicio de compás, escala, ratios REST/HOLD de pesos)
+        Los inicializadores NumPy usan un Generator sembrado desde rng (misma reproducibilidad).
+        """
+        if n <= 0:
+            return []
+        if cfg.INICIALIZADOR == "escalar":
+            return [Individuo().crear_aleatorio(rng) for _ in range(n)]
+
+        import numpy as np
+        from ga.inicializador import crear_individuos
+        return crear_individuos(n, priors=(cfg.INICIALIZADOR == "musical"), pesos=pesos,
+                                rng=np.random.default_rng(rng.getrandbits(64)))
+
     def evaluar(self, pesos=None):
         for ind in self.individuos:
             ind.evaluar(pesos)
@@ -21,3 +52,23 @@ class Poblacion:
 
     def ordenar(self):
         self.individuos.sort(key=lambda x: x.fitness, reverse=True)
+
+
+class DobleBuffer:
+    """
+    Dos poblaciones del mismo tamaño que se alternan entre generaciones:
+    la siguiente generación se escribe sobre los Individuos (y sus listas de genes)
+    de la inactiva y luego se intercambian, sin crear objetos nuevos por hijo.
+    """
+
+    def __init__(self, actual: Poblacion):
+        self.actual = actual
+        self.siguiente = Poblacion([
+            Individuo([cfg.REST] * len(ind.genes)) for ind in actual.individuos
+        ])
+        # destino del segundo hijo cuando sólo queda un hueco libre
+        self.sobrante = Individuo([cfg.REST] * cfg.LONGITUD_MELODIA)
+
+    def intercambiar(self) -> Poblacion:
+        self.actual, self.siguiente = self.siguiente, self.actual
+        return self.actual
@@ -0,0 +1,152 @@
+# ga/portafolio.py
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from ga.operadores import (
+    crossover_por_compas,
+    crossover_multicorte,
+    crossover_uniforme_compas,
+    crossover_motivo,
+    crossover_por_compas_en,
+    crossover_multicorte_en,
+    crossover_uniforme_compas_en,
+    crossover_motivo_en,
+    mutar,
+    mutar_ritmo,
+    mutar_transponer_compas,
+    mutar_duplicar_compas,
+    mutar_en_sitio,
+    mutar_ritmo_en_sitio,
+    mutar_transponer_compas_en_sitio,
+    mutar_duplicar_compas_en_sitio,
+)
+
+CRUCES: Dict[str, Callable] = {
+    "cruce_1corte": crossover_por_compas,
+    "cruce_multicorte": crossover_multicorte,
+    "cruce_uniforme": crossover_uniforme_compas,
+    "cruce_motivo": crossover_motivo,
+}
+
+MUTACIONES: Dict[str, Callable] = {
+    "mut_nota": mutar,
+    "mut_ritmo": mutar_ritmo,
+    "mut_transponer": mutar_transponer_compas,
+    "mut_duplicar": mutar_duplicar_compas,
+}
+
+# Variantes que escriben en individuos preasignados (reproducción con doble buffer)
+CRUCES_EN: Dict[str, Callable] = {
+    "cruce_1corte": crossover_por_compas_en,
+    "cruce_multicorte": crossover_multicorte_en,
+    "cruce_uniforme": crossover_uniforme_compas_en,
+    "cruce_motivo": crossover_motivo_en,
+}
+
+MUTACIONES_EN_SITIO: Dict[str, Callable] = {
+    "mut_nota": mutar_en_sitio,
+    "mut_ritmo": mutar_ritmo_en_sitio,
+    "mut_transponer": mutar_transponer_compas_en_sitio,
+    "mut_duplicar": mutar_duplicar_compas_en_sitio,
+}
+
+
+@dataclass
+class EstadisticasOperador:
+    aplicaciones: int = 0
+    exitos: int = 0           # hijo mejor que el mejor padre
+    ganancia: float = 0.0     # suma de mejoras positivas sobre el mejor padre
+    calidad: float = 1.0      # media exponencial de la recompensa (para el scheduler)
+
+
+class _Bandido:
+    """
+    Probability matching: p_i = p_min + (1 - n * p_min) * q_i / sum(q).
+    q_i = media exponencial de la mejora del hijo sobre el mejor padre.
+    """
+
+    def __init__(self, nombres, p_min: float, alpha: float):
+        self.stats = {n: EstadisticasOperador() for n in nombres}
+        self.p_min = p_min
+        self.alpha = alpha
+
+    def probabilidades(self) -> Dict[str, float]:
+        total = sum(s.calidad for s in self.stats.values())
+        n = len(self.stats)
+        if total <= 0:
+            return {k: 1.0 / n for k in self.stats}
+        libre = 1.0 - n * self.p_min
+        return {k: self.p_min + libre * s.calidad / total for k, s in self.stats.items()}
+
+    def elegir(self, rng=random) -> str:
+        probs = self.probabilidades()
+        r = rng.random()
+        acc = 0.0
+        for k, p in probs.items():
+            acc += p
+            if r < acc:
+                return k
+        return k
+
+    def registrar(self, nombre: str, ganancia: float) -> None:
+        s = self.stats[nombre]
+        recompensa = max(0.0, ganancia)
+        s.aplicaciones += 1
+        if ganancia > 0:
+            s.exitos += 1
+            s.ganancia += ganancia
+        s.calidad += self.alpha * (recompensa - s.calidad)
+
+
+class PortafolioOperadores:
+    """
+    Portafolio adaptativo de cruces y mutaciones con asignación de crédito online.
+    Cada hijo acredita (fitness_hijo - max(fitness_padres)) al cruce y a la mutación usados.
+    """
+
+    def __init__(self, p_min: float = 0.05, alpha: float = 0.1):
+        self.cruces = _Bandido(CRUCES, p_min, alpha)
+        self.mutaciones = _Bandido(MUTACIONES, p_min, alpha)
+
+    def elegir(self, rng=random) -> tuple[str, str]:
+        return self.cruces.elegir(rng), self.mutaciones.elegir(rng)
+
+    def cruzar(self, nombre: str, p1, p2, rng=random):
+        return CRUCES[nombre](p1, p2, rng)
+
+    def mutar(self, nombre: str, ind, prob_gen: float, rng=random):
+        return MUTACIONES[nombre](ind, prob_gen=prob_gen, rng=rng)
+
+    def cruzar_en(self, nombre: str, p1, p2, h1, h2, rng=random) -> None:
+        CRUCES_EN[nombre](p1, p2, h1, h2, rng)
+
+    def mutar_en_sitio(self, nombre: str, ind, prob_gen: float, rng=random):
+        return MUTACIONES_EN_SITIO[nombre](ind, prob_gen=prob_gen, rng=rng)
+
+    def registrar(self, cruce: str, mutacion: str, fitness_hijo: float, fitness_padres: float) -> None:
+        ganancia = fitness_hijo - fitness_padres
+        self.cruces.registrar(cruce, ganancia)
+        self.mutaciones.registrar(mutacion, ganancia)
+
+    def columnas_log(self) -> Dict[str, float]:
+        """Probabilidades actuales de cada operador (una columna por operador en el CSV)."""
+        out = {}
+        for bandido in (self.cruces, self.mutaciones):
+            for k, p in bandido.probabilidades().items():
+                out[f"p_{k}"] = round(p, 4)
+        return out
+
+    def resumen(self) -> str:
+        lineas = []
+        for bandido in (self.cruces, self.mutaciones):
+            probs = bandido.probabilidades()
+            for k, s in bandido.stats.items():
+                exito = s.exitos / s.aplicaciones if s.aplicaciones else 0.0
+                media = s.ganancia / s.aplicaciones if s.aplicaciones else 0.0
+                lineas.append(f"   {k:18s} | n={s.aplicaciones:6d} | éxito={exito:6.1%} | "
+                              f"ganancia/aplic={media:.4f} | p={probs[k]:.3f}")
+        return "\n".join(lineas)
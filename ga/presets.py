@@ -0,0 +1,77 @@
+# ga/presets.py
+
+from __future__ import annotations
+
+from ga.fitness import PesosFitness
+
+# Sliders musicales 0..100 y sus valores por defecto (los mismos que la CLI)
+SLIDERS = {
+    "consonancia": 55,
+    "suavidad": 55,
+    "sincopa": 45,
+    "repeticion": 55,
+    "aire": 45,
+}
+
+
+def _lerp(a: float, b: float, t: float) -> float:
+    """Interpolación lineal: t en [0,1]."""
+    return a + (b - a) * t
+
+
+def pesos_desde_sliders(
+    consonancia: int = SLIDERS["consonancia"],
+    suavidad: int = SLIDERS["suavidad"],
+    sincopa: int = SLIDERS["sincopa"],
+    repeticion: int = SLIDERS["repeticion"],
+    aire: int = SLIDERS["aire"],
+) -> tuple[PesosFitness, dict]:
+    """
+    Traduce los sliders 0..100 a PesosFitness.
+    Devuelve (PesosFitness, preset_dict) para poder guardar el preset.
+    """
+    for nombre, v in (("consonancia", consonancia), ("suavidad", suavidad), ("sincopa", sincopa),
+                      ("repeticion", repeticion), ("aire", aire)):
+        if not 0 <= v <= 100:
+            raise ValueError(f"Slider {nombre} fuera de rango [0..100]: {v}")
+
+    # 0..1
+    t_con = consonancia / 100.0
+    t_sua = suavidad / 100.0
+    t_sin = sincopa / 100.0
+    t_rep = repeticion / 100.0
+    t_air = aire / 100.0
+
+    # Rangos recomendados (para no "romper" el fitness)
+    w_acorde = _lerp(0.12, 0.38, t_con)
+    w_escala = _lerp(0.22, 0.10, t_con)  # inverso: más consonancia => menos "libertad"
+
+    w_mov = _lerp(0.10, 0.32, t_sua)
+    w_ritmo = _lerp(0.05, 0.26, t_sin)
+    w_hook = _lerp(0.05, 0.28, t_rep)
+    rest_obj = _lerp(0.08, 0.35, t_air)
+
+    pesos = PesosFitness(
+        w_acorde=w_acorde,
+        w_escala=w_escala,
+        w_movimiento=w_mov,
+        w_ritmo_sincopa=w_ritmo,
+        w_repeticion_hook=w_hook,
+        rest_ratio_obj=rest_obj,
+    )
+
+    preset = {
+        "consonancia_0_100": consonancia,
+        "suavidad_0_100": suavidad,
+        "sincopa_0_100": sincopa,
+        "repeticion_hook_0_100": repeticion,
+        "aire_pausas_0_100": aire,
+        "w_acorde": w_acorde,
+        "w_escala": w_escala,
+        "w_movimiento": w_mov,
+        "w_ritmo_sincopa": w_ritmo,
+        "w_repeticion_hook": w_hook,
+        "rest_ratio_obj": rest_obj,
+    }
+
+    return pesos, preset
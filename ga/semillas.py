@@ -0,0 +1,111 @@
+# ga/semillas.py
+
+from __future__ import annotations
+
+import os
+import json
+import hashlib
+from dataclasses import asdict
+from typing import Dict, List, Tuple
+
+import config as cfg
+
+from ga.fitness import PesosFitness
+from musica.tonalidad import tonic_to_pitch_class
+from musica.acordes import parse_chord_symbol, CHORD_SUFFIXES
+
+BANCO_PATH = os.path.join("logs", "banco_semillas.json")
+
+
+def progresion_relativa(tonica: str, acordes: List[str]) -> str:
+    """
+    Progresión independiente de la tonalidad: cada acorde como
+    (semitonos desde la tónica + calidad). En C mayor, C G Am F -> '0 7 9m 5'.
+    """
+    t = tonic_to_pitch_class(tonica)
+    out = []
+    for ch in acordes:
+        root, quality = parse_chord_symbol(ch)
+        out.append(f"{(tonic_to_pitch_class(root) - t) % 12}{CHORD_SUFFIXES[quality]}")
+    return " ".join(out)
+
+
+def id_preset(pesos: PesosFitness | None) -> str:
+    """Identificador corto de un preset (pesos redondeados, para agrupar sliders casi iguales)."""
+    d = asdict(pesos if pesos is not None else PesosFitness())
+    s = json.dumps({k: round(v, 2) for k, v in d.items()}, sort_keys=True)
+    return hashlib.sha1(s.encode("utf-8")).hexdigest()[:10]
+
+
+def _a_relativo(genes: List[int], tonica_pc: int) -> List[int]:
+    return [g - tonica_pc if g >= 0 else g for g in genes]
+
+
+def _a_absoluto(genes: List[int], tonica_pc: int) -> List[int]:
+    """Transpone a la nueva tónica y pliega por octavas al rango vocal."""
+    out = []
+    for g in genes:
+        if g < 0:
+            out.append(g)
+            continue
+        n = g + tonica_pc
+        while n > cfg.RANGO_MAX:
+            n -= 12
+        while n < cfg.RANGO_MIN:
+            n += 12
+        out.append(min(n, cfg.RANGO_MAX))
+    return out
+
+
+class BancoSemillas:
+    """
+    Banco de genomas élite de ejecuciones anteriores.
+    Clave = (modo, progresión relativa, preset). Los genomas se guardan
+    transpuestos a tónica C y se devuelven transpuestos a la tonalidad pedida.
+    """
+
+    def __init__(self, path: str = BANCO_PATH, max_por_clave: int = 20):
+        self.path = path
+        self.max_por_clave = max_por_clave
+        self._banco: Dict[str, List[Tuple[List[int], float]]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._banco = {k: [(g, fit) for g, fit in v] for k, v in json.load(f).items()}
+
+    @staticmethod
+    def clave(modo: str, tonica: str, acordes: List[str], preset: str) -> str:
+        return f"{modo}|{progresion_relativa(tonica, acordes)}|{preset}"
+
+    def semillas(self, tonica: str, modo: str, acordes: List[str], preset: str) -> List[List[int]]:
+        """Genomas guardados para esa clave, de mejor a peor, ya en la tonalidad pedida."""
+        entradas = self._banco.get(self.clave(modo, tonica, acordes, preset), [])
+        t = tonic_to_pitch_class(tonica)
+        return [_a_absoluto(g, t) for g, _ in entradas]
+
+    def añadir(
+        self,
+        tonica: str,
+        modo: str,
+        acordes: List[str],
+        preset: str,
+        elites: List[Tuple[List[int], float]],
+    ) -> None:
+        """Añade (genes, fitness) a la clave y se queda con los max_por_clave mejores distintos."""
+        k = self.clave(modo, tonica, acordes, preset)
+        t = tonic_to_pitch_class(tonica)
+
+        mejores: Dict[Tuple[int, ...], float] = {tuple(g): fit for g, fit in self._banco.get(k, [])}
+        for genes, fit in elites:
+            rel = tuple(_a_relativo(genes, t))
+            if fit > mejores.get(rel, float("-inf")):
+                mejores[rel] = fit
+
+        orden = sorted(mejores.items(), key=lambda kv: kv[1], reverse=True)[:self.max_por_clave]
+        self._banco[k] = [(list(g), fit) for g, fit in orden]
+
+    def guardar(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._banco, f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,266 @@
+# ga/sustituto.py
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Falta instalar numpy. Ejecuta: pip install numpy"
+    ) from e
+
+import config as cfg
+
+from ga.individuo import Individuo
+from ga.tensorial import TrabajoGA, TablasLote, POS_FUERTES, notas_activas
+
+# Bordes (inclusivos) del histograma de intervalos entre notas sonando consecutivas
+BORDES_INTERVALO = (0, 2, 4, 7, 9)
+
+
+def _rangos(x: np.ndarray) -> np.ndarray:
+    r = np.empty(len(x))
+    r[np.argsort(x, kind="stable")] = np.arange(len(x))
+    return r
+
+
+def correlacion_rangos(a: np.ndarray, b: np.ndarray) -> float:
+    """Spearman (sin corrección de empates); nan si hay menos de 3 puntos o una serie constante."""
+    if len(a) < 3:
+        return float("nan")
+    ra, rb = _rangos(a), _rangos(b)
+    if ra.std() == 0 or rb.std() == 0 or np.ptp(a) == 0 or np.ptp(b) == 0:
+        return float("nan")
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def caracteristicas(genes: np.ndarray, tablas: TablasLote) -> np.ndarray:
+    """
+    (M, L) genomas -> (M, F) características baratas por compás y globales:
+    ataques, compases pobres/saturados, notas del acorde, inicio de compás,
+    ratios REST/HOLD, histograma de intervalos, síncopa, compases repetidos,
+    ámbito y última nota.
+    """
+    M, L = genes.shape
+    S, C = cfg.SUBDIVISIONES_POR_COMPAS, cfg.COMPASES
+    g = genes.astype(np.int16)
+    ticks = np.arange(L)
+
+    ataque = g >= 0
+    ataques_por = ataque.reshape(M, C, S).sum(-1)
+    voz = notas_activas(g)
+    sonando = voz >= 0
+    pc = np.where(sonando, voz % 12, 0)
+    en_acorde = sonando & tablas.acorde[0, ticks // S, pc]
+    en_escala = sonando & tablas.escala[0, pc]
+
+    sonando_por = np.maximum(sonando.reshape(M, C, S).sum(-1), 1)
+    eventos = np.maximum(sonando.sum(-1), 1)[:, None]
+
+    # Intervalos entre ticks sonando consecutivos (los REST no cortan la línea)
+    previo = np.maximum.accumulate(np.where(sonando, ticks, -1), axis=-1)
+    previo = np.concatenate([np.full((M, 1), -1), previo[:, :-1]], axis=-1)
+    par = sonando & (previo >= 0)
+    intervalo = np.abs(voz - np.take_along_axis(voz, np.maximum(previo, 0), -1))
+    cubo = np.searchsorted(BORDES_INTERVALO, intervalo)
+    hist = (par[..., None] & (cubo[..., None] == np.arange(len(BORDES_INTERVALO) + 1))).sum(1)
+    hist = hist / np.maximum(par.sum(-1), 1)[:, None]
+
+    total_ataques = ataque.sum(-1)
+    off = (ataque & ~np.isin(ticks % S, POS_FUERTES)).sum(-1) / np.maximum(total_ataques, 1)
+
+    compases = np.ascontiguousarray(g.reshape(M, C, S))
+    claves = compases.view(np.dtype((np.void, S * compases.itemsize)))[..., 0]
+    iguales = ((claves[:, :, None] == claves[:, None, :]) & np.triu(np.ones((C, C), dtype=bool), k=1)).sum((1, 2))
+
+    nmax = np.where(ataque, g, -1).max(-1)
+    nmin = np.where(ataque, g, np.iinfo(g.dtype).max).min(-1)
+    ambito = np.where(total_ataques >= 2, nmax - nmin, 0)
+
+    hay_ultima = sonando.any(-1)
+    i_ultima = L - 1 - np.argmax(sonando[:, ::-1], axis=-1)
+    pc_ultima = pc[np.arange(M), i_ultima]
+
+    rest = (g == cfg.REST).mean(-1)
+    hold = (g == cfg.HOLD).mean(-1)
+
+    columnas = [
+        np.ones(M),
+        *ataques_por.T, *(ataques_por < 2).T, *np.maximum(0, ataques_por - 6).T,
+        *(en_acorde.reshape(M, C, S).sum(-1) / sonando_por).T,
+        *(~en_acorde[:, ::S]).T,
+        (en_escala & ~en_acorde).sum(-1) / eventos[:, 0],
+        (sonando & ~en_escala).sum(-1) / eventos[:, 0],
+        rest, rest ** 2, hold, np.maximum(0.0, hold - 0.4),
+        *hist.T,
+        off, (off < 0.10) | (off > 0.70), (off > 0.45) & (off <= 0.70),
+        iguales == 0, (iguales >= 1) & (iguales <= 5), (iguales >= 6) & (iguales <= 10),
+        ambito / 12.0, (ambito >= 4) & (ambito <= 14),
+        ~hay_ultima,
+        hay_ultima & tablas.acorde[0, C - 1, pc_ultima],
+        hay_ultima & (pc_ultima == tablas.tonica[0]),
+        (ataque & ((g < cfg.RANGO_MIN) | (g > cfg.RANGO_MAX))).sum(-1),
+    ]
+    return np.column_stack(columnas).astype(np.float64)
+
+
+@dataclass
+class ModeloSustituto:
+    """
+    Fitness sustituto para cribar hijos antes de la evaluación exacta.
+
+    Regresión ridge sobre características por compás (ver caracteristicas), entrenada
+    en línea con los hijos que ejecutar_ga ya evalúa con calcular_fitness; el factor
+    olvido da más peso a las generaciones recientes.
+
+    Con el modelo activo, cada generación se generan exceso x (hijos necesarios),
+    el sustituto los ordena y sólo los mejores pasan a la evaluación exacta. Además
+    se sortea una muestra de auditoría (fracción auditoria de todos los candidatos,
+    elegidos o no); sus descartados también se evalúan (no entran en la población).
+
+    Precisión = correlación de rangos (Spearman) entre predicción y fitness exacto,
+    medida sólo sobre la muestra de auditoría en las generaciones cribadas (los
+    elegidos por el propio sustituto darían una estimación optimista) y sobre todos
+    los hijos en las demás. Por debajo de umbral_precision el sustituto se
+    desactiva durante enfriamiento generaciones (el GA vuelve a evaluar todo) y
+    sólo se reactiva si la precisión medida en ese tiempo se recupera.
+    """
+    exceso: float = 2.0               # candidatos generados por hijo evaluado
+    auditoria: float = 0.10           # fracción de candidatos (al azar) con la que se mide la precisión
+    min_auditoria: int = 12           # tamaño mínimo de esa muestra (Spearman con pocos puntos es ruido)
+    min_muestras: int = 300           # evaluaciones exactas antes de empezar a cribar
+    umbral_precision: float = 0.5
+    enfriamiento: int = 10            # generaciones sin cribar tras una caída
+    olvido: float = 0.95              # por generación
+    ridge: float = 1e-2
+
+    # Estadísticas
+    generaciones_cribadas: int = 0
+    candidatos: int = 0
+    evals_exactas: int = 0
+    evals_ahorradas: int = 0
+    caidas: int = 0
+    precision: float = float("nan")
+    precisiones: List[float] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._A: Optional[np.ndarray] = None
+        self._b: Optional[np.ndarray] = None
+        self._coef: Optional[np.ndarray] = None
+        self._muestras = 0
+        self._espera = 0
+        self._contexto: Optional[Tuple] = None
+        self._tablas: Optional[TablasLote] = None
+        self._cache: Dict[int, np.ndarray] = {}   # id(candidato) -> características de la última criba
+        self._muestra: Optional[set] = None         # ids de la muestra de auditoría de la última criba
+
+    # -------------------------
+    # Modelo
+    # -------------------------
+
+    def _caracteristicas(self, individuos: List[Individuo]) -> np.ndarray:
+        contexto = (cfg.TONICA, cfg.MODO, tuple(cfg.ACORDES))
+        if contexto != self._contexto:
+            # El modelo es del contexto armónico con el que se entrenó
+            self._contexto = contexto
+            self._tablas = TablasLote.desde_trabajos([TrabajoGA(cfg.TONICA, cfg.MODO, list(cfg.ACORDES))])
+            self._A = self._b = self._coef = None
+            self._muestras = 0
+        return caracteristicas(np.array([ind.genes for ind in individuos]), self._tablas)
+
+    def predecir(self, individuos: List[Individuo]) -> np.ndarray:
+        X = self._caracteristicas(individuos)
+        self._cache = dict(zip(map(id, individuos), X))
+        if self._coef is None:
+            return np.zeros(len(individuos))
+        return X @ self._coef
+
+    def activo(self) -> bool:
+        return (self._coef is not None and self._muestras >= self.min_muestras
+                and self._espera == 0 and self.precision >= self.umbral_precision)
+
+    def n_candidatos(self, n_hijos: int) -> int:
+        return max(n_hijos, math.ceil(n_hijos * self.exceso))
+
+    def cribar(self, candidatos: List[Individuo], n: int, rng=random) -> Tuple[List[Individuo], List[Individuo]]:
+        """(los n mejores según el sustituto, descartados de la muestra de auditoría)."""
+        pred = self.predecir(candidatos)
+        orden = np.argsort(-pred, kind="stable")
+        elegidos = [candidatos[i] for i in orden[:n]]
+        k = min(len(candidatos), max(self.min_auditoria, math.ceil(len(candidatos) * self.auditoria)))
+        muestra = rng.sample(candidatos, k) if k else []
+        self._muestra = {id(c) for c in muestra}
+        ids_elegidos = {id(c) for c in elegidos}
+        auditados = [c for c in muestra if id(c) not in ids_elegidos]
+
+        self.generaciones_cribadas += 1
+        self.candidatos += len(candidatos)
+        self.evals_ahorradas += len(candidatos) - n - len(auditados)
+        return elegidos, auditados
+
+    def observar(self, individuos: List[Individuo]) -> None:
+        """Mide la precisión con los ya evaluados y los añade al entrenamiento."""
+        individuos = [ind for ind in individuos if ind.fitness is not None]
+        if not individuos:
+            return
+        if all(id(ind) in self._cache for ind in individuos):
+            X = np.array([self._cache[id(ind)] for ind in individuos])
+        else:
+            X = self._caracteristicas(individuos)
+        self._cache = {}
+        y = np.array([ind.fitness for ind in individuos])
+        self.evals_exactas += len(y)
+
+        # Tras una criba, sólo la muestra de auditoría es una muestra sin sesgo
+        muestra = np.ones(len(y), dtype=bool)
+        if self._muestra is not None:
+            muestra = np.array([id(ind) in self._muestra for ind in individuos])
+            self._muestra = None
+
+        if self._coef is not None:
+            p = correlacion_rangos(X[muestra] @ self._coef, y[muestra])
+            if not math.isnan(p):
+                self.precision = p
+                self.precisiones.append(p)
+
+        if self._A is None:
+            self._A = np.zeros((X.shape[1], X.shape[1]))
+            self._b = np.zeros(X.shape[1])
+        self._A = self.olvido * self._A + X.T @ X
+        self._b = self.olvido * self._b + X.T @ y
+        self._muestras += len(y)
+        self._coef = np.linalg.solve(self._A + self.ridge * np.eye(len(self._b)), self._b)
+
+    def fin_generacion(self, cribada: bool) -> bool:
+        """Avanza el enfriamiento; True si el sustituto acaba de desactivarse por precisión baja."""
+        if self._espera > 0:
+            self._espera -= 1
+            return False
+        if cribada and self.precision < self.umbral_precision:
+            self.caidas += 1
+            self._espera = self.enfriamiento
+            return True
+        return False
+
+    # -------------------------
+    # Informe
+    # -------------------------
+
+    def precision_media(self) -> float:
+        return float(np.mean(self.precisiones)) if self.precisiones else float("nan")
+
+    def columnas_log(self) -> Dict[str, float]:
+        return {"sust_activo": float(self.activo()), "sust_precision": round(self.precision, 4)}
+
+    def resumen(self) -> str:
+        evaluables = self.evals_exactas + self.evals_ahorradas
+        ahorro = self.evals_ahorradas / evaluables if evaluables else 0.0
+        return (f"generaciones cribadas={self.generaciones_cribadas} | candidatos={self.candidatos} | "
+                f"evals exactas={self.evals_exactas} | ahorradas={self.evals_ahorradas} ({ahorro:.0%}) | "
+                f"precisión última={self.precision:.3f} media={self.precision_media():.3f} | "
+                f"caídas={self.caidas}")
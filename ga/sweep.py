@@ -0,0 +1,355 @@
+# ga/sweep.py
+
+from __future__ import annotations
+
+import os
+import csv
+import json
+import math
+import time
+import random
+import hashlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import config as cfg
+
+from ga.fitness import PesosFitness
+from ga.motor import ejecutar_ga
+
+if TYPE_CHECKING:
+    from ga.historial import HistorialRuns
+
+
+# Parámetros que viven en config.py
+PARAMS_CONFIG = ("TAMANO_POBLACION", "PROB_MUTACION", "K_TORNEO", "ELITISMO")
+
+# Valores de config al importar: cada trial parte de ellos (un worker reutilizado
+# no debe arrastrar los parámetros del trial anterior)
+_DEFECTOS_CONFIG = {k: getattr(cfg, k) for k in PARAMS_CONFIG}
+
+# Parámetros que recibe ejecutar_ga
+PARAMS_GA = ("paciencia", "reinject_cada", "reinject_pct")
+
+# Campos de PesosFitness (w_acorde, pen_*, rest_ratio_obj, ...)
+PARAMS_PESOS = tuple(f.name for f in fields(PesosFitness))
+
+# Contexto musical que cada worker debe replicar
+PARAMS_CONTEXTO = ("TEMPO", "TONICA", "MODO", "ACORDES")
+
+# Espacio por defecto: lista = valores discretos, tupla (lo, hi) = rango continuo
+ESPACIO_DEFECTO = {
+    "TAMANO_POBLACION": [30, 40, 60],
+    "PROB_MUTACION": (0.04, 0.16),
+    "K_TORNEO": [2, 3, 4],
+    "ELITISMO": [1, 2, 4],
+    "paciencia": [8, 12, 16],
+    "reinject_cada": [10, 15, 25],
+    "reinject_pct": (0.05, 0.30),
+}
+
+COLUMNAS = ["trial_id", "contexto", "semilla", "generaciones", "fitness", "cpu_s", "config"]
+
+
+# =========================================================
+# Espacio de búsqueda
+# =========================================================
+
+def configs_grid(espacio: Dict[str, Sequence]) -> List[dict]:
+    """Producto cartesiano de un espacio cuyos valores son listas."""
+    for k, v in espacio.items():
+        if isinstance(v, tuple):
+            raise ValueError(f"Grid necesita valores discretos (lista) en '{k}', no un rango {v}")
+
+    claves = list(espacio.keys())
+    return [dict(zip(claves, combo)) for combo in itertools.product(*(espacio[k] for k in claves))]
+
+
+def configs_aleatorias(espacio: Dict[str, Sequence], n: int, semilla: int = 0) -> List[dict]:
+    """
+    Muestreo aleatorio del espacio:
+    - lista -> elección uniforme
+    - tupla (lo, hi) -> uniforme en el rango (entero si lo y hi son enteros)
+    """
+    rnd = random.Random(semilla)
+    out = []
+    for _ in range(n):
+        c = {}
+        for k, v in espacio.items():
+            if isinstance(v, tuple):
+                lo, hi = v
+                if isinstance(lo, int) and isinstance(hi, int):
+                    c[k] = rnd.randint(lo, hi)
+                else:
+                    c[k] = rnd.uniform(lo, hi)
+            else:
+                c[k] = rnd.choice(list(v))
+        out.append(c)
+    return out
+
+
+def id_config(config: dict) -> str:
+    """Identificador estable de una configuración (hash del JSON ordenado)."""
+    s = json.dumps(config, sort_keys=True)
+    return hashlib.sha1(s.encode("utf-8")).hexdigest()[:12]
+
+
+def id_contexto(contexto: dict) -> str:
+    """Hash del contexto musical que afecta al fitness (tónica, modo y acordes)."""
+    s = json.dumps([contexto["TONICA"], contexto["MODO"], list(contexto["ACORDES"])])
+    return hashlib.sha1(s.encode("utf-8")).hexdigest()[:12]
+
+
+def _validar_config(config: dict) -> None:
+    for k in config:
+        if k not in PARAMS_CONFIG and k not in PARAMS_GA and k not in PARAMS_PESOS:
+            raise ValueError(f"Parámetro de sweep desconocido: {k}")
+
+
+# =========================================================
+# Trial (se ejecuta en un proceso del pool)
+# =========================================================
+
+def contexto_actual() -> dict:
+    """Copia del contexto musical actual de config (tras aplicar_midi_input)."""
+    return {k: getattr(cfg, k) for k in PARAMS_CONTEXTO}
+
+
+class _RecolectorHistorial:
+    """Sustituto de HistorialRuns en los workers: guarda las filas para devolverlas al proceso principal."""
+
+    directorio = ""
+
+    def __init__(self):
+        self.filas: Optional[List[dict]] = None
+
+    def añadir(self, filas: List[dict], etiqueta: str = "", meta: Optional[dict] = None) -> int:
+        self.filas = list(filas)
+        return -1
+
+
+def ejecutar_trial(
+    config: dict,
+    semilla: int,
+    generaciones: int,
+    contexto: dict,
+    con_historial: bool = False,
+) -> Tuple[float, float, Optional[List[dict]]]:
+    """
+    Ejecuta un GA con la configuración dada.
+    Devuelve (fitness, segundos de CPU, historial por generación o None).
+    """
+    for k, v in contexto.items():
+        setattr(cfg, k, v)
+    for k, defecto in _DEFECTOS_CONFIG.items():
+        setattr(cfg, k, config.get(k, defecto))
+
+    pesos = PesosFitness(**{k: v for k, v in config.items() if k in PARAMS_PESOS})
+    kwargs_ga = {k: v for k, v in config.items() if k in PARAMS_GA}
+
+    recolector = _RecolectorHistorial() if con_historial else None
+    t0 = time.process_time()
+    _, fit = ejecutar_ga(pesos, generaciones=generaciones, csv_path=None, verbose=False,
+                         historial_runs=recolector, semilla=semilla, **kwargs_ga)
+    return fit, time.process_time() - t0, (recolector.filas if recolector is not None else None)
+
+
+# =========================================================
+# Tabla de resultados (CSV reanudable)
+# =========================================================
+
+class TablaResultados:
+    """
+    Tabla en disco (CSV, una fila por trial terminado).
+    Relanzar un sweep con la misma tabla salta los trials ya hechos con el mismo
+    contexto musical (id_contexto); filas sólo contiene los de ese contexto.
+    """
+
+    def __init__(self, path: str, contexto: str = ""):
+        self.path = path
+        self.contexto = contexto
+        self.filas: Dict[Tuple[str, int, int], dict] = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                lector = csv.DictReader(f)
+                todas = list(lector)
+                antigua = lector.fieldnames != COLUMNAS
+            if antigua:
+                # Tabla sin columna de contexto: se reescribe (sus trials no cuentan para ningún contexto)
+                self._reescribir([{**row, "contexto": row.get("contexto") or ""} for row in todas])
+            for row in todas:
+                if row.get("contexto", "") != contexto:
+                    continue
+                fila = {
+                    "trial_id": row["trial_id"],
+                    "contexto": contexto,
+                    "semilla": int(row["semilla"]),
+                    "generaciones": int(row["generaciones"]),
+                    "fitness": float(row["fitness"]),
+                    "cpu_s": float(row["cpu_s"]),
+                    "config": json.loads(row["config"]),
+                }
+                self.filas[(fila["trial_id"], fila["semilla"], fila["generaciones"])] = fila
+
+    def _reescribir(self, rows: List[dict]) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=COLUMNAS, extrasaction="ignore")
+            w.writeheader()
+            w.writerows(rows)
+        os.replace(tmp, self.path)
+
+    def hecho(self, trial_id: str, semilla: int, generaciones: int) -> bool:
+        return (trial_id, semilla, generaciones) in self.filas
+
+    def añadir(self, fila: dict) -> None:
+        nuevo = not os.path.exists(self.path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=COLUMNAS)
+            if nuevo:
+                w.writeheader()
+            fila = {**fila, "contexto": self.contexto}
+            w.writerow({**fila, "config": json.dumps(fila["config"], sort_keys=True)})
+        self.filas[(fila["trial_id"], fila["semilla"], fila["generaciones"])] = fila
+
+    def fitness_medio(self, trial_id: str, generaciones: int, semillas: Iterable[int]) -> float:
+        vals = [self.filas[(trial_id, s, generaciones)]["fitness"] for s in semillas
+                if (trial_id, s, generaciones) in self.filas]
+        return sum(vals) / len(vals) if vals else float("-inf")
+
+
+# =========================================================
+# Sweep con successive halving
+# =========================================================
+
+def presupuestos_halving(gen_min: int, gen_max: int, eta: int) -> List[int]:
+    """Generaciones por ronda: gen_min, gen_min*eta, ... terminando en gen_max."""
+    out = []
+    g = gen_min
+    while g < gen_max:
+        out.append(g)
+        g *= eta
+    out.append(gen_max)
+    return out
+
+
+def ejecutar_sweep(
+    configs: List[dict],
+    semillas: Sequence[int] = (0, 1, 2),
+    gen_min: int = 20,
+    gen_max: int = 180,
+    eta: int = 3,
+    procesos: Optional[int] = None,
+    tabla_path: str = os.path.join("logs", "sweep.csv"),
+    contexto: Optional[dict] = None,
+    historial: Optional[HistorialRuns] = None,
+    verbose: bool = True,
+) -> List[dict]:
+    """
+    Ejecuta un sweep en paralelo (un trial = config x semilla x presupuesto).
+    Successive halving: tras cada ronda sólo sigue el mejor 1/eta de configuraciones
+    (fitness medio entre semillas), con un presupuesto de generaciones eta veces mayor.
+    Con historial, la curva de cada trial se añade al historial columnar
+    (etiqueta "<trial_id>/s<semilla>/g<generaciones>").
+
+    Devuelve el ranking (ver ranking()).
+    """
+    if eta < 2:
+        raise ValueError("eta debe ser >= 2")
+    for c in configs:
+        _validar_config(c)
+
+    if contexto is None:
+        contexto = contexto_actual()
+
+    tabla = TablaResultados(tabla_path, id_contexto(contexto))
+    vivos = {id_config(c): c for c in configs}
+    rondas = presupuestos_halving(gen_min, gen_max, eta)
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        for r, presupuesto in enumerate(rondas):
+            futuros = {}
+            for tid, c in vivos.items():
+                for s in semillas:
+                    if tabla.hecho(tid, s, presupuesto):
+                        continue
+                    fut = pool.submit(ejecutar_trial, c, s, presupuesto, contexto, historial is not None)
+                    futuros[fut] = (tid, s, c)
+
+            if verbose:
+                saltados = len(vivos) * len(semillas) - len(futuros)
+                print(f"🔬 Ronda {r + 1}/{len(rondas)} | gen={presupuesto} | "
+                      f"configs={len(vivos)} | trials={len(futuros)} (ya hechos: {saltados})")
+
+            for fut in as_completed(futuros):
+                tid, s, c = futuros[fut]
+                fit, cpu_s, filas = fut.result()
+                tabla.añadir({
+                    "trial_id": tid,
+                    "semilla": s,
+                    "generaciones": presupuesto,
+                    "fitness": fit,
+                    "cpu_s": cpu_s,
+                    "config": c,
+                })
+                if filas:
+                    historial.añadir(filas, etiqueta=f"{tid}/s{s}/g{presupuesto}", meta={
+                        "config": c, "semilla": s, "generaciones": presupuesto, "fitness": fit,
+                    })
+
+            if r == len(rondas) - 1:
+                break
+
+            orden = sorted(vivos, key=lambda t: tabla.fitness_medio(t, presupuesto, semillas), reverse=True)
+            quedan = max(1, math.ceil(len(orden) / eta))
+            vivos = {t: vivos[t] for t in orden[:quedan]}
+
+    rank = ranking(tabla)
+    if verbose:
+        imprimir_ranking(rank)
+    return rank
+
+
+def ranking(tabla: TablaResultados) -> List[dict]:
+    """
+    Una entrada por configuración, en su ronda más profunda:
+    fitness medio, CPU media y fitness por segundo de CPU.
+    Se ordena primero por ronda alcanzada y después por fitness/CPU-s.
+    """
+    por_config: Dict[str, Dict[int, List[dict]]] = {}
+    for fila in tabla.filas.values():
+        por_config.setdefault(fila["trial_id"], {}).setdefault(fila["generaciones"], []).append(fila)
+
+    out = []
+    for tid, por_gen in por_config.items():
+        gen = max(por_gen)
+        filas = por_gen[gen]
+        fit = sum(f["fitness"] for f in filas) / len(filas)
+        cpu = sum(f["cpu_s"] for f in filas) / len(filas)
+        out.append({
+            "trial_id": tid,
+            "generaciones": gen,
+            "semillas": len(filas),
+            "fitness_medio": fit,
+            "cpu_s_medio": cpu,
+            "fitness_por_cpu_s": fit / max(cpu, 1e-9),
+            "config": filas[0]["config"],
+        })
+
+    out.sort(key=lambda x: (x["generaciones"], x["fitness_por_cpu_s"]), reverse=True)
+    return out
+
+
+def imprimir_ranking(rank: List[dict], top: int = 10) -> None:
+    print("\n🏆 RANKING (fitness por CPU-segundo)")
+    for i, x in enumerate(rank[:top], start=1):
+        print(f"{i:2d}. {x['trial_id']} | gen={x['generaciones']} | fit={x['fitness_medio']:.3f} | "
+              f"cpu={x['cpu_s_medio']:.2f}s | fit/cpu-s={x['fitness_por_cpu_s']:.2f} | {x['config']}")
+
+
+if __name__ == "__main__":
+    ejecutar_sweep(configs_aleatorias(ESPACIO_DEFECTO, n=27))
@@ -0,0 +1,499 @@
+# ga/tensorial.py
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Falta instalar numpy. Ejecuta: pip install numpy"
+    ) from e
+
+import config as cfg
+
+from ga.aleatorio import SemillaRNG, SemillaLike
+from ga.fitness import PesosFitness
+from ga.inicializador import P_REST_UNIFORME, P_HOLD_UNIFORME
+from musica.tonalidad import build_scale_pitch_classes, tonic_to_pitch_class
+from musica.acordes import chord_pitch_classes
+
+# Mismas constantes que calcular_fitness_referencia / ejecutar_ga
+LIM_ATAQUES = 6
+POS_FUERTES = (0, 2, 4, 6)
+EPS = 1e-4
+
+
+# =========================================================
+# Trabajos y tablas por trabajo
+# =========================================================
+
+@dataclass
+class TrabajoGA:
+    """Una petición del lote: contexto armónico y pesos propios."""
+    tonica: str
+    modo: str
+    acordes: List[str]
+    pesos: PesosFitness = field(default_factory=PesosFitness)
+    etiqueta: str = ""
+
+
+@lru_cache(maxsize=512)
+def _tablas_contexto(tonica: str, modo: str, acordes: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray, int]:
+    """(escala (12,) bool, acordes (compases, 12) bool, pitch class de la tónica)."""
+    escala = np.zeros(12, dtype=bool)
+    escala[list(build_scale_pitch_classes(tonica, modo))] = True
+    tabla = np.zeros((len(acordes), 12), dtype=bool)
+    for c, ch in enumerate(acordes):
+        tabla[c, list(chord_pitch_classes(ch))] = True
+    return escala, tabla, tonic_to_pitch_class(tonica)
+
+
+@dataclass
+class TablasLote:
+    """
+    Tablas armónicas apiladas por trabajo, indexadas con el pitch class:
+    escala (J, 12), acorde (J, compases, 12), tonica (J,).
+    cand_escala / cand_acorde: las mismas tablas sobre las notas del rango vocal
+    (candidatas de la mutación musical).
+    """
+    escala: np.ndarray
+    acorde: np.ndarray
+    tonica: np.ndarray
+
+    @staticmethod
+    def desde_trabajos(trabajos: Sequence[TrabajoGA]) -> "TablasLote":
+        for t in trabajos:
+            if len(t.acordes) != cfg.COMPASES:
+                raise ValueError(f"Trabajo '{t.etiqueta}': {len(t.acordes)} acordes, se esperan {cfg.COMPASES}")
+        tablas = [_tablas_contexto(t.tonica, t.modo, tuple(t.acordes)) for t in trabajos]
+        return TablasLote(
+            escala=np.stack([e for e, _, _ in tablas]),
+            acorde=np.stack([a for _, a, _ in tablas]),
+            tonica=np.array([t for _, _, t in tablas], dtype=np.int64),
+        )
+
+    @property
+    def cand_escala(self) -> np.ndarray:
+        return self.escala[:, np.arange(cfg.RANGO_MIN, cfg.RANGO_MAX + 1) % 12]
+
+    @property
+    def cand_acorde(self) -> np.ndarray:
+        return self.acorde[:, :, np.arange(cfg.RANGO_MIN, cfg.RANGO_MAX + 1) % 12]
+
+
+def apilar_pesos(pesos: Sequence[PesosFitness]) -> Dict[str, np.ndarray]:
+    """Un vector (J, 1) por campo de PesosFitness (se difunde sobre los individuos)."""
+    return {f.name: np.array([getattr(p, f.name) for p in pesos], dtype=np.float64)[:, None]
+            for f in fields(PesosFitness)}
+
+
+# =========================================================
+# Fitness vectorizado (jobs x individuos x ticks)
+# =========================================================
+
+def notas_activas(genes: np.ndarray) -> np.ndarray:
+    """
+    Nota que suena en cada tick (HOLD prolonga), -1 = silencio, sobre la última
+    dimensión de genes (un genoma, (N, L), (J, N, L)...). Versión vectorizada de
+    la intermedia "voz" de ga/terminos.py.
+    """
+    ticks = np.arange(genes.shape[-1])
+    ultimo = np.maximum.accumulate(np.where(genes != cfg.HOLD, ticks, -1), axis=-1)
+    voz = np.take_along_axis(genes, np.maximum(ultimo, 0), axis=-1)
+    return np.where((ultimo < 0) | (voz == cfg.REST), -1, voz)
+
+
+def _triangular(x: np.ndarray, a: float, b: float, c: float) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    sube = (x - a) / (b - a)
+    baja = (c - x) / (c - b)
+    return np.where((x <= a) | (x >= c), 0.0, np.where(x < b, sube, baja))
+
+
+def fitness_lote(genes: np.ndarray, tablas: TablasLote, pesos: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Fitness de calcular_fitness_referencia para un tensor (J, N, L) de genomas,
+    con las tablas armónicas y los pesos de cada trabajo. Devuelve (J, N) float64.
+    Incluye w_cadencia (término B8 de ga/terminos.py).
+    """
+    J, N, L = genes.shape
+    S, C = cfg.SUBDIVISIONES_POR_COMPAS, cfg.COMPASES
+    W = pesos
+    g = genes.astype(np.int16)
+    jj = np.arange(J)[:, None, None]
+    ticks = np.arange(L)
+
+    ataque = g >= 0
+    ataques_por = ataque.reshape(J, N, C, S).sum(-1)
+    voz = notas_activas(g)
+    sonando = voz >= 0
+    pc = np.where(sonando, voz % 12, 0)
+
+    # A1: inicio de compás sobre el acorde
+    en_acorde = sonando & tablas.acorde[jj, (ticks // S)[None, None, :], pc]
+    pen = W["pen_inicio_compas_no_acorde"] * (~en_acorde[..., ::S]).sum(-1)
+
+    # A2: rango vocal
+    pen = pen + W["pen_fuera_rango"] * (ataque & ((g < cfg.RANGO_MIN) | (g > cfg.RANGO_MAX))).sum(-1)
+
+    # A3 / A3b: exceso de ataques y compases pobres
+    pen = pen + W["pen_exceso_ataques"] * np.maximum(0, ataques_por - LIM_ATAQUES).sum(-1)
+    pen = pen + W["pen_compas_pobre"] * (ataques_por < W["min_ataques_por_compas"][..., None]).sum(-1)
+
+    # A4: final
+    pen = pen + W["pen_ultimo_compas_pobre"] * (ataques_por[..., -1] < 2)
+    hay_ultima = sonando.any(-1)
+    i_ultima = L - 1 - np.argmax(sonando[..., ::-1], axis=-1)
+    pc_ultima = np.take_along_axis(pc, i_ultima[..., None], -1)[..., 0]
+    ultima_en_acorde = tablas.acorde[jj[..., 0], C - 1, pc_ultima]
+    pen = pen + np.where(~hay_ultima, W["pen_ultima_nota_ausente"],
+                         np.where(ultima_en_acorde, 0.0, W["pen_ultima_nota_no_acorde"]))
+
+    # A5: ratios REST / HOLD
+    rest_ratio = (g == cfg.REST).sum(-1) / L
+    hold_ratio = (g == cfg.HOLD).sum(-1) / L
+    lo = np.maximum(0.0, W["rest_ratio_obj"] - W["rest_ratio_tol"])
+    hi = np.minimum(1.0, W["rest_ratio_obj"] + W["rest_ratio_tol"])
+    desvio = np.where(rest_ratio < lo, (lo - rest_ratio) / np.maximum(lo, 1e-9),
+                      np.where(rest_ratio > hi, (rest_ratio - hi) / np.maximum(1.0 - hi, 1e-9), 0.0))
+    pen = pen + W["pen_rest_ratio"] * desvio
+    hmax = W["hold_ratio_max"]
+    pen = pen + np.where(hold_ratio > hmax, W["pen_hold_ratio"] * ((hold_ratio - hmax) / (1.0 - hmax)), 0.0)
+
+    # B1 / B2: acorde y escala por tick sonando
+    en_escala = sonando & tablas.escala[jj, pc]
+    eventos = sonando.sum(-1)
+    ev = np.maximum(eventos, 1)
+    s_acorde = np.where(en_acorde, 1.0, np.where(en_escala, 0.25, 0.0)).sum(-1)
+    s_escala = np.where(sonando, np.where(en_acorde, 1.0, np.where(en_escala, 0.65, -0.5)), 0.0).sum(-1)
+    score_acorde = np.where(eventos == 0, 0.0, np.clip(s_acorde / ev, 0.0, 1.0))
+    score_escala = np.where(eventos == 0, 0.0, np.clip((s_escala / ev + 0.5) / 1.5, 0.0, 1.0))
+    suave = W["w_acorde"] * score_acorde + W["w_escala"] * score_escala
+
+    # B3: movimiento entre ticks sonando consecutivos (los REST no cortan la línea)
+    if W["w_movimiento"].any():
+        previo = np.maximum.accumulate(np.where(sonando, ticks, -1), axis=-1)
+        previo = np.concatenate([np.full((J, N, 1), -1), previo[..., :-1]], axis=-1)
+        par = sonando & (previo >= 0)
+        previo0 = np.maximum(previo, 0)
+        intervalo = np.abs(voz - np.take_along_axis(voz, previo0, -1))
+        # Dos saltos > 7 seguidos y el segundo > 9 -> -1 (grandes_seguidos >= 2 en la versión escalar)
+        grande = par & (intervalo > 7)
+        grande_antes = np.take_along_axis(grande, previo0, -1) & (previo >= 0)
+        puntos = np.where(intervalo <= 4, 1.0, np.where(intervalo <= 7, 0.6, np.where(intervalo <= 9, 0.15, -0.35)))
+        puntos = puntos - ((intervalo > 9) & grande_antes)
+        pares = par.sum(-1)
+        s_mov = np.where(par, puntos, 0.0).sum(-1)
+        score_mov = np.where(pares == 0, 0.0, np.clip((s_mov / np.maximum(pares, 1) + 1.0) / 2.0, 0.0, 1.0))
+        suave = suave + W["w_movimiento"] * score_mov
+
+    # B4: ritmo / síncopa
+    total_ataques = ataque.sum(-1)
+    off = (ataque & ~np.isin(ticks % S, POS_FUERTES)).sum(-1)
+    ratio_off = off / np.maximum(total_ataques, 1)
+    score_ritmo = np.where(total_ataques == 0, 0.0,
+                           np.where(ratio_off < 0.10, 0.2, np.where(ratio_off <= 0.45, 1.0,
+                                                                    np.where(ratio_off <= 0.70, 0.6, 0.2))))
+    suave = suave + W["w_ritmo_sincopa"] * score_ritmo
+
+    # B5: hook (pares de compases idénticos)
+    if W["w_repeticion_hook"].any():
+        compases = np.ascontiguousarray(g.reshape(J, N, C, S))
+        # Cada compás como una sola clave (vista de sus bytes): C x C comparaciones escalares
+        claves = compases.view(np.dtype((np.void, S * compases.itemsize)))[..., 0]
+        iguales = claves[:, :, :, None] == claves[:, :, None, :]
+        iguales = (iguales & np.triu(np.ones((C, C), dtype=bool), k=1)).sum((-1, -2))
+        score_hook = np.where(iguales == 0, 0.2, np.where(iguales <= 5, 1.0, np.where(iguales <= 10, 0.7, 0.2)))
+        suave = suave + W["w_repeticion_hook"] * score_hook
+
+    # B6: contorno (rango y posición del clímax)
+    if W["w_contorno"].any():
+        nmax = np.where(ataque, g, -1).max(-1)
+        nmin = np.where(ataque, g, np.iinfo(g.dtype).max).min(-1)
+        compas_max = np.argmax(ataque & (g == nmax[..., None]), axis=-1) // S
+        climax = np.where(compas_max <= 2, 0.2, np.where(compas_max <= 4, 0.6, 1.0))
+        score_contorno = np.where(total_ataques < 2, 0.0, 0.6 * _triangular(nmax - nmin, 4, 9, 14) + 0.4 * climax)
+        suave = suave + W["w_contorno"] * score_contorno
+
+    # B7: densidad por compás
+    suave = suave + W["w_densidad_ideal"] * _triangular(ataques_por, 1.5, 4.0, 6.5).mean(-1)
+
+    # B8: cadencia
+    if W["w_cadencia"].any():
+        en_tonica = pc_ultima == tablas.tonica[:, None]
+        score_cad = np.where(~hay_ultima, 0.0, np.where(en_tonica, 1.0, np.where(ultima_en_acorde, 0.5, 0.0)))
+        suave = suave + W["w_cadencia"] * score_cad
+
+    return 100.0 - pen + 100.0 * suave
+
+
+# Términos de ga/terminos.py que fitness_lote reproduce (uno registrado después no lo está)
+TERMINOS_LOTE = frozenset({
+    "inicio_compas", "fuera_rango", "exceso_ataques", "compases_pobres", "final", "ratio_rest", "ratio_hold",
+    "acorde", "escala", "movimiento", "ritmo", "hook", "contorno", "densidad", "cadencia",
+})
+
+
+@lru_cache(maxsize=32)
+def _pesos_apilados(pesos: PesosFitness) -> Dict[str, np.ndarray]:
+    return apilar_pesos([pesos])
+
+
+def fitness_genomas(genomas: Sequence[Sequence[int]], pesos: PesosFitness) -> np.ndarray:
+    """calcular_fitness de varios genomas (contexto actual de cfg) en una sola llamada a fitness_lote."""
+    tablas = TablasLote.desde_trabajos([TrabajoGA(cfg.TONICA, cfg.MODO, list(cfg.ACORDES))])
+    return fitness_lote(np.asarray(genomas, dtype=np.int16)[None], tablas, _pesos_apilados(pesos))[0]
+
+
+# =========================================================
+# Operadores vectorizados
+# =========================================================
+
+def genomas_aleatorios(rng: np.random.Generator, forma: Tuple[int, ...]) -> np.ndarray:
+    """Misma distribución que Individuo.crear_aleatorio, forma (..., LONGITUD_MELODIA)."""
+    forma = tuple(forma) + (cfg.LONGITUD_MELODIA,)
+    r = rng.random(forma)
+    notas = rng.integers(cfg.RANGO_MIN, cfg.RANGO_MAX + 1, size=forma)
+    return np.where(r < P_REST_UNIFORME, cfg.REST,
+                    np.where(r < P_REST_UNIFORME + P_HOLD_UNIFORME, cfg.HOLD, notas)).astype(np.int16)
+
+
+def seleccion_torneo_lote(rng: np.random.Generator, fitness: np.ndarray, n: int, k: int) -> np.ndarray:
+    """Índices (J, n) de ganadores de torneos de tamaño k (con reemplazo) dentro de cada trabajo."""
+    J, N = fitness.shape
+    cand = rng.integers(0, N, size=(J, n, k))
+    fc = np.take_along_axis(fitness, cand.reshape(J, -1), 1).reshape(J, n, k)
+    return np.take_along_axis(cand, fc.argmax(-1)[..., None], -1)[..., 0]
+
+
+def crossover_por_compas_lote(rng: np.random.Generator, p1: np.ndarray, p2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """crossover_por_compas para (J, P, L) parejas: un corte en frontera de compás por pareja."""
+    J, P, L = p1.shape
+    corte = rng.integers(1, cfg.COMPASES, size=(J, P, 1)) * cfg.SUBDIVISIONES_POR_COMPAS
+    izq = np.arange(L) < corte
+    return np.where(izq, p1, p2), np.where(izq, p2, p1)
+
+
+def mutar_lote(rng: np.random.Generator, genes: np.ndarray, prob: np.ndarray, tablas: TablasLote) -> np.ndarray:
+    """
+    mutar() sobre (J, M, L) en sitio, con probabilidad por gen prob (J,):
+    15% REST, 15% HOLD, 70% nota musical (70% del acorde del compás, si no de la escala),
+    ponderada por 1 / (1 + distancia) a la nota que sonaba antes.
+    A diferencia de la versión escalar, la nota previa es la de antes de mutar el genoma.
+    """
+    S = cfg.SUBDIVISIONES_POR_COMPAS
+    muta = rng.random(genes.shape) < prob[:, None, None]
+    r = rng.random(genes.shape)
+
+    j, m, t = np.nonzero(muta & (r >= 0.30))
+    if len(j):
+        voz = notas_activas(genes)
+        previa = np.where(t > 0, voz[j, m, np.maximum(t - 1, 0)], -1)
+        cand_ac = tablas.cand_acorde[j, t // S]
+        usar_acorde = (rng.random(len(j)) < 0.70) & cand_ac.any(-1)
+        cands = np.where(usar_acorde[:, None], cand_ac, tablas.cand_escala[j])
+        cands[~cands.any(-1)] = True
+
+        notas = np.arange(cfg.RANGO_MIN, cfg.RANGO_MAX + 1)
+        cercania = np.where(previa[:, None] >= 0, 1.0 / (1.0 + np.abs(notas[None, :] - previa[:, None])), 1.0)
+        cdf = np.cumsum(cands * cercania, axis=-1)
+        x = rng.random(len(j)) * cdf[:, -1]
+        idx = np.minimum((cdf < x[:, None]).sum(-1), len(notas) - 1)
+        genes[j, m, t] = notas[idx]
+
+    genes[muta & (r < 0.15)] = cfg.REST
+    genes[muta & (r >= 0.15) & (r < 0.30)] = cfg.HOLD
+    return genes
+
+
+# =========================================================
+# GA de muchos trabajos a la vez
+# =========================================================
+
+@dataclass
+class ResultadoLote:
+    trabajos: List[TrabajoGA]
+    genes: np.ndarray            # (J, L) mejor genoma de cada trabajo
+    fitness: np.ndarray          # (J,)
+    curvas: np.ndarray           # (generaciones, J) mejor fitness global por generación
+    semilla: str
+    segundos: float
+
+    def resultados(self) -> List[Tuple[List[int], float]]:
+        """[(genes, fitness), ...] por trabajo, como devuelve ejecutar_ga."""
+        return list(zip(self.genes.astype(int).tolist(), self.fitness.tolist()))
+
+    def historial(self, j: int) -> List[dict]:
+        """Filas por generación del trabajo j (para HistorialRuns.añadir)."""
+        return [{"gen": g + 1, "best_global": float(f)} for g, f in enumerate(self.curvas[:, j])]
+
+
+def ejecutar_ga_lote(
+    trabajos: Sequence[TrabajoGA],
+    generaciones: int = 180,
+    paciencia: int = 12,
+    reinject_cada: int = 15,
+    reinject_pct: float = 0.15,
+    semilla: SemillaLike = None,
+    verbose: bool = True,
+) -> ResultadoLote:
+    """
+    Evoluciona muchos trabajos pequeños a la vez sobre un tensor (J, N, L):
+    selección, cruce, mutación y fitness de todos los trabajos en las mismas
+    llamadas NumPy, con tablas armónicas y pesos propios de cada trabajo.
+
+    Mismo esquema que ejecutar_ga por trabajo: elitismo, torneo, crossover_por_compas,
+    mutación musical adaptativa (p_mut, paciencia), reinyección periódica y catástrofe
+    controlada, cada trabajo con sus propios contadores. Sin archivo, top-K, memético
+    ni portafolio. El resultado de un trabajo depende de la semilla y de la
+    composición del lote (todos comparten el generador). El generador es
+    SemillaRNG.generador_numpy(), no el random.Random de ejecutar_ga: la misma
+    semilla no reproduce aquí una ejecución de ejecutar_ga.
+
+    Tamaño de población, mutación base, torneo y elitismo se leen de config.
+    """
+    t0 = time.perf_counter()
+    trabajos = list(trabajos)
+    J, N, E = len(trabajos), cfg.TAMANO_POBLACION, cfg.ELITISMO
+    semilla = SemillaRNG.desde(semilla)
+    rng = semilla.generador_numpy()
+    tablas = TablasLote.desde_trabajos(trabajos)
+    W = apilar_pesos([t.pesos for t in trabajos])
+    filas = np.arange(J)
+
+    if verbose:
+        print(f"🧮 GA tensorial: {J} trabajos x {N} individuos | semilla {semilla} (flujo numpy, propio de este motor)")
+
+    G = genomas_aleatorios(rng, (J, N))
+    F = fitness_lote(G, tablas, W)
+
+    mejor_i = F.argmax(1)
+    mejor_genes = G[filas, mejor_i].copy()
+    mejor_fit = F[filas, mejor_i].copy()
+
+    base_mut = cfg.PROB_MUTACION
+    prob = np.full(J, base_mut)
+    sin_mejora_boost = np.zeros(J, dtype=np.int64)
+    sin_mejora_global = np.zeros(J, dtype=np.int64)
+    catastrofe_umbral = paciencia * 2
+
+    n_hijos = N - E
+    n_pares = math.ceil(n_hijos / 2)
+    k_reinject = max(1, int(N * reinject_pct)) if 0.0 < reinject_pct < 1.0 else 0
+    curvas = np.empty((generaciones, J))
+
+    for gen in range(1, generaciones + 1):
+        # 1) elitismo
+        orden = np.argsort(-F, axis=1, kind="stable")
+        elites = np.take_along_axis(G, orden[:, :E, None], 1)
+        f_elites = np.take_along_axis(F, orden[:, :E], 1)
+
+        # 2) reproducción de todos los trabajos a la vez
+        padres = seleccion_torneo_lote(rng, F, 2 * n_pares, cfg.K_TORNEO)
+        padres = np.take_along_axis(G, padres[..., None], 1)
+        h1, h2 = crossover_por_compas_lote(rng, padres[:, 0::2], padres[:, 1::2])
+        hijos = np.stack([h1, h2], axis=2).reshape(J, 2 * n_pares, -1)[:, :n_hijos]
+        hijos = mutar_lote(rng, np.ascontiguousarray(hijos), prob, tablas)
+
+        G = np.concatenate([elites, hijos], axis=1)
+        F = np.concatenate([f_elites, fitness_lote(hijos, tablas, W)], axis=1)
+
+        # 3) reinyección periódica (peores de cada trabajo)
+        if reinject_cada > 0 and gen % reinject_cada == 0 and k_reinject:
+            peores = np.argsort(F, axis=1, kind="stable")[:, :k_reinject]
+            nuevos = genomas_aleatorios(rng, (J, k_reinject))
+            G[filas[:, None], peores] = nuevos
+            F[filas[:, None], peores] = fitness_lote(nuevos, tablas, W)
+
+        # 4) mejor global y mutación adaptativa por trabajo
+        gen_i = F.argmax(1)
+        gen_f = F[filas, gen_i]
+        mejora = gen_f > mejor_fit + EPS
+        mejor_genes[mejora] = G[filas[mejora], gen_i[mejora]]
+        mejor_fit[mejora] = gen_f[mejora]
+
+        sin_mejora_boost = np.where(mejora, 0, sin_mejora_boost + 1)
+        sin_mejora_global = np.where(mejora, 0, sin_mejora_global + 1)
+        prob = np.where(mejora, np.maximum(base_mut, prob * 0.90), prob)
+
+        sube = sin_mejora_boost >= paciencia
+        prob = np.where(sube, np.minimum(0.35, prob * 1.60), prob)
+        sin_mejora_boost[sube] = 0
+
+        # catástrofe controlada: se conserva la élite, el resto se regenera
+        cat = np.nonzero(sin_mejora_global >= catastrofe_umbral)[0]
+        if len(cat):
+            orden = np.argsort(-F[cat], axis=1, kind="stable")
+            G[cat, :E] = np.take_along_axis(G[cat], orden[:, :E, None], 1)
+            F[cat, :E] = np.take_along_axis(F[cat], orden[:, :E], 1)
+            nuevos = genomas_aleatorios(rng, (len(cat), N - E))
+            G[cat, E:] = nuevos
+            F[cat, E:] = fitness_lote(nuevos, TablasLote(tablas.escala[cat], tablas.acorde[cat], tablas.tonica[cat]),
+                                      {k: v[cat] for k, v in W.items()})
+            sin_mejora_global[cat] = 0
+            sin_mejora_boost[cat] = 0
+            prob[cat] = base_mut
+
+        curvas[gen - 1] = mejor_fit
+        if verbose and (gen % 20 == 0 or gen == generaciones):
+            print(f"Gen {gen:03d} | fitness medio de los mejores: {mejor_fit.mean():.3f} | "
+                  f"p_mut medio: {prob.mean():.3f}")
+
+    return ResultadoLote(trabajos, mejor_genes, mejor_fit, curvas, str(semilla), time.perf_counter() - t0)
+
+
+# =========================================================
+# Demo: lote de trabajos aleatorios contra ejecutar_ga uno a uno
+# =========================================================
+
+def trabajos_aleatorios(n: int, semilla: int = 0) -> List[TrabajoGA]:
+    """Tonalidad, progresión diatónica y sliders al azar (para pruebas de rendimiento)."""
+    import random
+    from musica.tonalidad import PC_TO_NOTE, MAJOR_STEPS, MINOR_NATURAL_STEPS
+    from ga.presets import pesos_desde_sliders
+
+    rnd = random.Random(semilla)
+    calidades = {"mayor": ["", "m", "m", "", "", "m", "dim"], "menor": ["m", "dim", "", "m", "m", "", ""]}
+    out = []
+    for i in range(n):
+        tonica, modo = rnd.choice(PC_TO_NOTE), rnd.choice(("mayor", "menor"))
+        pasos = MAJOR_STEPS if modo == "mayor" else MINOR_NATURAL_STEPS
+        grados = [sum(pasos[:d]) for d in range(7)]
+        t = tonic_to_pitch_class(tonica)
+        acordes = [PC_TO_NOTE[(t + grados[d]) % 12] + calidades[modo][d]
+                   for d in [0] + [rnd.randrange(7) for _ in range(cfg.COMPASES - 2)] + [0]]
+        pesos, _ = pesos_desde_sliders(*[rnd.randint(0, 100) for _ in range(5)])
+        out.append(TrabajoGA(tonica, modo, acordes, pesos, etiqueta=f"t{i}"))
+    return out
+
+
+if __name__ == "__main__":
+    import sys
+    from ga.motor import ejecutar_ga
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    generaciones = 60
+    trabajos = trabajos_aleatorios(n)
+
+    res = ejecutar_ga_lote(trabajos, generaciones=generaciones, semilla=1)
+    print(f"✅ Lote: {n} trabajos en {res.segundos:.2f} s ({n / res.segundos:.1f} trabajos/s) | "
+          f"fitness medio {res.fitness.mean():.3f}")
+
+    # Referencia: ejecutar_ga uno a uno sobre una muestra
+    muestra = trabajos[:10]
+    contexto_previo = (cfg.TONICA, cfg.MODO, cfg.ACORDES)
+    t0 = time.perf_counter()
+    fits = []
+    for i, t in enumerate(muestra):
+        cfg.TONICA, cfg.MODO, cfg.ACORDES = t.tonica, t.modo, list(t.acordes)
+        fits.append(ejecutar_ga(t.pesos, generaciones=generaciones, csv_path=None, verbose=False, semilla=i)[1])
+    dt = (time.perf_counter() - t0) / len(muestra)
+    cfg.TONICA, cfg.MODO, cfg.ACORDES = contexto_previo
+    print(f"⏱️ ejecutar_ga uno a uno: {1 / dt:.1f} trabajos/s (fitness medio {sum(fits) / len(fits):.3f} "
+          f"vs {res.fitness[:len(muestra)].mean():.3f} en el lote) | aceleración x{n / res.segundos * dt:.1f}")
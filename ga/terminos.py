@@ -0,0 +1,428 @@
+# ga/terminos.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config as cfg
+
+from ga.fitness import (
+    PesosFitness,
+    _contexto_armonico,
+    _penalizacion_ratio_rest,
+    _triangular_score,
+)
+from musica.tonalidad import tonic_to_pitch_class
+
+
+# =========================================================
+# Intermedios compartidos
+# =========================================================
+# nombre -> (función, dependencias). "genes" es la entrada del pipeline.
+# Orden de declaración = orden de cálculo (cada uno sólo depende de los anteriores).
+
+INTERMEDIOS: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {}
+
+
+def intermedio(nombre: str, *deps: str):
+    """Registra un intermedio calculado a partir de otros ya registrados (o de "genes")."""
+    def registrar(fn: Callable) -> Callable:
+        for d in deps:
+            if d != "genes" and d not in INTERMEDIOS:
+                raise ValueError(f"Intermedio {nombre}: dependencia desconocida {d}")
+        INTERMEDIOS[nombre] = (fn, deps)
+        compilar.cache_clear()
+        return fn
+    return registrar
+
+
+# =========================================================
+# Términos
+# =========================================================
+
+@dataclass(frozen=True)
+class TerminoFitness:
+    """
+    Término del fitness.
+    - "duro": fn(pesos, *entradas) devuelve la penalización ya ponderada (se resta)
+    - "suave": fn(pesos, *entradas) devuelve una puntuación en [0, 1]; aporta 100 * peso * puntuación
+    Se omite si todos sus campos de pesos valen 0.
+    """
+    nombre: str
+    tipo: str                      # "duro" | "suave"
+    pesos: Tuple[str, ...]         # campos de PesosFitness que lo activan (el primero pondera si es suave)
+    entradas: Tuple[str, ...]      # intermedios (o "genes")
+    fn: Callable
+
+    def activo(self, pesos: PesosFitness) -> bool:
+        return any(getattr(pesos, p) != 0 for p in self.pesos)
+
+
+TERMINOS: Dict[str, TerminoFitness] = {}
+
+
+def termino(nombre: str, tipo: str, pesos: Tuple[str, ...], entradas: Tuple[str, ...]):
+    """Registra un término; el orden de registro es el orden de suma."""
+    if tipo not in ("duro", "suave"):
+        raise ValueError(f"Tipo de término no válido: {tipo}")
+
+    def registrar(fn: Callable) -> Callable:
+        for p in pesos:
+            if p not in PesosFitness.__dataclass_fields__:
+                raise ValueError(f"Término {nombre}: PesosFitness no tiene el campo {p}")
+        for e in entradas:
+            if e != "genes" and e not in INTERMEDIOS:
+                raise ValueError(f"Término {nombre}: intermedio desconocido {e}")
+        TERMINOS[nombre] = TerminoFitness(nombre, tipo, pesos, entradas, fn)
+        compilar.cache_clear()
+        return fn
+    return registrar
+
+
+# =========================================================
+# Compilador
+# =========================================================
+
+class PipelineFitness:
+    """
+    Fitness compilado para unos pesos: sólo los términos activos y los
+    intermedios que necesitan, en orden de dependencias.
+    """
+
+    def __init__(self, pesos: PesosFitness, terminos: List[TerminoFitness]):
+        self.pesos = pesos
+        self.duros = [t for t in terminos if t.tipo == "duro"]
+        self.suaves = [(t, getattr(pesos, t.pesos[0])) for t in terminos if t.tipo == "suave"]
+
+        necesarios = set()
+        pendientes = [e for t in terminos for e in t.entradas]
+        while pendientes:
+            e = pendientes.pop()
+            if e == "genes" or e in necesarios:
+                continue
+            necesarios.add(e)
+            pendientes.extend(INTERMEDIOS[e][1])
+        self.intermedios = [(n, fn, deps) for n, (fn, deps) in INTERMEDIOS.items() if n in necesarios]
+
+    @property
+    def nombres(self) -> List[str]:
+        return [t.nombre for t in self.duros] + [t.nombre for t, _ in self.suaves]
+
+    def _valores(self, genes: List[int]) -> dict:
+        v = {"genes": genes}
+        for nombre, fn, deps in self.intermedios:
+            v[nombre] = fn(*[v[d] for d in deps])
+        return v
+
+    def __call__(self, genes: List[int]) -> float:
+        v = self._valores(genes)
+        pesos = self.pesos
+
+        penalizaciones_duras = 0.0
+        for t in self.duros:
+            penalizaciones_duras += t.fn(pesos, *[v[e] for e in t.entradas])
+
+        score_suave = 0.0
+        for t, w in self.suaves:
+            score_suave += w * t.fn(pesos, *[v[e] for e in t.entradas])
+
+        return 100.0 - penalizaciones_duras + 100.0 * score_suave
+
+    def desglose(self, genes: List[int]) -> Dict[str, float]:
+        """Aportación de cada término activo al fitness (duros en negativo, suaves x100)."""
+        v = self._valores(genes)
+        out = {}
+        for t in self.duros:
+            out[t.nombre] = -t.fn(self.pesos, *[v[e] for e in t.entradas])
+        for t, w in self.suaves:
+            out[t.nombre] = 100.0 * w * t.fn(self.pesos, *[v[e] for e in t.entradas])
+        return out
+
+
+@lru_cache(maxsize=32)
+def compilar(pesos: PesosFitness) -> PipelineFitness:
+    """Pipeline de los términos activos para esos pesos (cacheado; se invalida al registrar)."""
+    return PipelineFitness(pesos, [t for t in TERMINOS.values() if t.activo(pesos)])
+
+
+# =========================================================
+# Intermedios registrados
+# =========================================================
+
+@intermedio("ctx")
+def _ctx():
+    """(escala_pcs, acordes_pcs) de la tonalidad y progresión actuales."""
+    return _contexto_armonico(cfg.TONICA, cfg.MODO, tuple(cfg.ACORDES))
+
+
+@intermedio("voz", "genes")
+def _voz(genes: List[int]) -> List[Optional[int]]:
+    """Nota que suena en cada tick (HOLD prolonga, REST o HOLD sin nota previa -> None)."""
+    out = []
+    actual = None
+    for g in genes:
+        if g >= 0:
+            actual = g
+        elif g == cfg.REST:
+            actual = None
+        out.append(actual)
+    return out
+
+
+@intermedio("ataques_por_compas", "genes")
+def _ataques_por_compas(genes: List[int]) -> List[int]:
+    sub = cfg.SUBDIVISIONES_POR_COMPAS
+    return [sum(1 for g in genes[c * sub:(c + 1) * sub] if g >= 0) for c in range(cfg.COMPASES)]
+
+
+@intermedio("tipos", "genes")
+def _tipos(genes: List[int]) -> Tuple[int, int, int]:
+    """(ataques, rests, holds)."""
+    rests = genes.count(cfg.REST)
+    holds = genes.count(cfg.HOLD)
+    return len(genes) - rests - holds, rests, holds
+
+
+@intermedio("armonia", "voz", "ctx")
+def _armonia(voz: List[Optional[int]], ctx) -> Tuple[float, float]:
+    """(score_acorde_norm, score_escala_norm) en una sola pasada."""
+    escala_pcs, acordes_pcs = ctx
+    sub = cfg.SUBDIVISIONES_POR_COMPAS
+    score_acorde = 0.0
+    score_escala = 0.0
+    eventos = 0
+
+    for i, nota in enumerate(voz):
+        if nota is None:
+            continue
+        pc = nota % 12
+        if pc in acordes_pcs[i // sub]:
+            score_acorde += 1.0
+            score_escala += 1.0
+        elif pc in escala_pcs:
+            score_acorde += 0.25
+            score_escala += 0.65
+        else:
+            score_acorde += 0.0
+            score_escala -= 0.5
+        eventos += 1
+
+    if eventos == 0:
+        return 0.0, 0.0
+    return (max(0.0, min(1.0, score_acorde / eventos)),
+            max(0.0, min(1.0, (score_escala / eventos + 0.5) / 1.5)))
+
+
+# =========================================================
+# Términos registrados
+# =========================================================
+
+# ---- A) Penalizaciones duras ----
+
+@termino("inicio_compas", "duro", ("pen_inicio_compas_no_acorde",), ("voz", "ctx"))
+def _t_inicio_compas(pesos: PesosFitness, voz, ctx) -> float:
+    """A1: el inicio de compás debe apoyar el acorde."""
+    acordes_pcs = ctx[1]
+    sub = cfg.SUBDIVISIONES_POR_COMPAS
+    pen = 0.0
+    for compas in range(cfg.COMPASES):
+        nota = voz[compas * sub]
+        if nota is None or nota % 12 not in acordes_pcs[compas]:
+            pen += pesos.pen_inicio_compas_no_acorde
+    return pen
+
+
+@termino("fuera_rango", "duro", ("pen_fuera_rango",), ("genes",))
+def _t_fuera_rango(pesos: PesosFitness, genes) -> float:
+    """A2: rango vocal."""
+    fuera = sum(1 for g in genes if g >= 0 and (g < cfg.RANGO_MIN or g > cfg.RANGO_MAX))
+    return fuera * pesos.pen_fuera_rango
+
+
+LIM_ATAQUES = 6
+
+
+@termino("exceso_ataques", "duro", ("pen_exceso_ataques",), ("ataques_por_compas",))
+def _t_exceso_ataques(pesos: PesosFitness, ataques_por) -> float:
+    """A3: exceso de ataques por compás."""
+    return sum(max(0, a - LIM_ATAQUES) * pesos.pen_exceso_ataques for a in ataques_por)
+
+
+@termino("compases_pobres", "duro", ("pen_compas_pobre",), ("ataques_por_compas",))
+def _t_compases_pobres(pesos: PesosFitness, ataques_por) -> float:
+    """A3b: compases con muy pocos ataques."""
+    return sum(1 for a in ataques_por if a < pesos.min_ataques_por_compas) * pesos.pen_compas_pobre
+
+
+@termino("final", "duro",
+         ("pen_ultimo_compas_pobre", "pen_ultima_nota_ausente", "pen_ultima_nota_no_acorde"),
+         ("ataques_por_compas", "voz", "ctx"))
+def _t_final(pesos: PesosFitness, ataques_por, voz, ctx) -> float:
+    """A4: final no vacío y cierre en el acorde."""
+    pen = 0.0
+    if ataques_por[-1] < 2:
+        pen += pesos.pen_ultimo_compas_pobre
+
+    ultima = next((n for n in reversed(voz) if n is not None), None)
+    if ultima is None:
+        pen += pesos.pen_ultima_nota_ausente
+    elif ultima % 12 not in ctx[1][-1]:
+        pen += pesos.pen_ultima_nota_no_acorde
+    return pen
+
+
+@termino("ratio_rest", "duro", ("pen_rest_ratio",), ("tipos", "genes"))
+def _t_ratio_rest(pesos: PesosFitness, tipos, genes) -> float:
+    """A5: REST cerca del objetivo (ni 0 rests ni demasiados)."""
+    rest_ratio = tipos[1] / len(genes)
+    return pesos.pen_rest_ratio * _penalizacion_ratio_rest(
+        rest_ratio=rest_ratio,
+        obj=pesos.rest_ratio_obj,
+        tol=pesos.rest_ratio_tol,
+    )
+
+
+@termino("ratio_hold", "duro", ("pen_hold_ratio",), ("tipos", "genes"))
+def _t_ratio_hold(pesos: PesosFitness, tipos, genes) -> float:
+    """A5: castigo fuerte si los HOLD pasan del máximo."""
+    hold_ratio = tipos[2] / len(genes)
+    if hold_ratio > pesos.hold_ratio_max:
+        return pesos.pen_hold_ratio * ((hold_ratio - pesos.hold_ratio_max) / (1.0 - pesos.hold_ratio_max))
+    return 0.0
+
+
+# ---- B) Puntuación suave ----
+
+@termino("acorde", "suave", ("w_acorde",), ("armonia",))
+def _t_acorde(pesos: PesosFitness, armonia) -> float:
+    return armonia[0]
+
+
+@termino("escala", "suave", ("w_escala",), ("armonia",))
+def _t_escala(pesos: PesosFitness, armonia) -> float:
+    return armonia[1]
+
+
+@termino("movimiento", "suave", ("w_movimiento",), ("voz",))
+def _t_movimiento(pesos: PesosFitness, voz) -> float:
+    """B3: movimiento melódico (pasos pequeños, sin saltos grandes seguidos)."""
+    score_mov = 0.0
+    pares = 0
+    grandes_seguidos = 0
+    prev = None
+
+    for nota in voz:
+        if nota is None:
+            continue
+        if prev is None:
+            prev = nota
+            continue
+
+        intervalo = abs(nota - prev)
+
+        if intervalo <= 4:
+            score_mov += 1.0
+            grandes_seguidos = 0
+        elif intervalo <= 7:
+            score_mov += 0.6
+            grandes_seguidos = 0
+        elif intervalo <= 9:
+            score_mov += 0.15
+            grandes_seguidos = 1
+        else:
+            score_mov -= 0.35
+            grandes_seguidos += 1
+
+        if grandes_seguidos >= 2:
+            score_mov -= 1.0
+
+        prev = nota
+        pares += 1
+
+    return 0.0 if pares == 0 else max(0.0, min(1.0, (score_mov / pares + 1.0) / 2.0))
+
+
+@termino("ritmo", "suave", ("w_ritmo_sincopa",), ("genes",))
+def _t_ritmo(pesos: PesosFitness, genes) -> float:
+    """B4: proporción de ataques a contratiempo."""
+    sub = cfg.SUBDIVISIONES_POR_COMPAS
+    ataques_off = 0
+    total_ataques = 0
+    for i, g in enumerate(genes):
+        if g >= 0:
+            if (i % sub) not in (0, 2, 4, 6):
+                ataques_off += 1
+            total_ataques += 1
+
+    if total_ataques == 0:
+        return 0.0
+    ratio_off = ataques_off / total_ataques
+    if ratio_off < 0.10:
+        return 0.2
+    if ratio_off <= 0.45:
+        return 1.0
+    if ratio_off <= 0.70:
+        return 0.6
+    return 0.2
+
+
+@termino("hook", "suave", ("w_repeticion_hook",), ("genes",))
+def _t_hook(pesos: PesosFitness, genes) -> float:
+    """B5: compases repetidos (motivo)."""
+    sub = cfg.SUBDIVISIONES_POR_COMPAS
+    compases = [tuple(genes[c * sub:(c + 1) * sub]) for c in range(cfg.COMPASES)]
+
+    iguales = 0
+    for i in range(cfg.COMPASES):
+        for j in range(i + 1, cfg.COMPASES):
+            if compases[i] == compases[j]:
+                iguales += 1
+
+    if iguales == 0:
+        return 0.2
+    if iguales <= 5:
+        return 1.0
+    if iguales <= 10:
+        return 0.7
+    return 0.2
+
+
+@termino("contorno", "suave", ("w_contorno",), ("genes",))
+def _t_contorno(pesos: PesosFitness, genes) -> float:
+    """B6: ámbito razonable y clímax hacia el final."""
+    notas_reales = [g for g in genes if g >= 0]
+    if len(notas_reales) < 2:
+        return 0.0
+
+    nmin = min(notas_reales)
+    nmax = max(notas_reales)
+    score_rango = _triangular_score(nmax - nmin, a=4, b=9, c=14)
+
+    compas_max = genes.index(nmax) // cfg.SUBDIVISIONES_POR_COMPAS
+    if compas_max <= 2:
+        score_climax = 0.2
+    elif compas_max <= 4:
+        score_climax = 0.6
+    else:
+        score_climax = 1.0
+
+    return 0.6 * score_rango + 0.4 * score_climax
+
+
+@termino("densidad", "suave", ("w_densidad_ideal",), ("ataques_por_compas",))
+def _t_densidad(pesos: PesosFitness, ataques_por) -> float:
+    """B7: densidad ideal de ataques por compás."""
+    return sum(_triangular_score(a, a=1.5, b=4.0, c=6.5) for a in ataques_por) / len(ataques_por)
+
+
+@termino("cadencia", "suave", ("w_cadencia",), ("voz", "ctx"))
+def _t_cadencia(pesos: PesosFitness, voz, ctx) -> float:
+    """B8: cierre en la tónica (1.0) o en otra nota del último acorde (0.5)."""
+    ultima = next((n for n in reversed(voz) if n is not None), None)
+    if ultima is None:
+        return 0.0
+    if ultima % 12 == tonic_to_pitch_class(cfg.TONICA):
+        return 1.0
+    return 0.5 if ultima % 12 in ctx[1][-1] else 0.0
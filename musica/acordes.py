@@ -6,22 +6,38 @@ from musica.tonalidad import tonic_to_pitch_class
 TRIAD_FORMULAS = {
     "maj": [0, 4, 7],   # mayor
     "min": [0, 3, 7],   # menor
+    "dim": [0, 3, 6],   # disminuido
+    "aug": [0, 4, 8],   # aumentado
+}
+
+# Sufijo del símbolo para cada calidad ('C', 'Cm', 'Cdim', 'Caug')
+CHORD_SUFFIXES = {
+    "maj": "",
+    "min": "m",
+    "dim": "dim",
+    "aug": "aug",
 }
 
 
 def parse_chord_symbol(chord: str) -> tuple[str, str]:
     """
-    Acepta símbolos simples tipo: 'C', 'G', 'Am', 'Dm', 'F#', 'Bb', 'Em'
-    Devuelve (root, quality) donde quality ∈ {'maj', 'min'}
+    Acepta símbolos simples tipo: 'C', 'G', 'Am', 'Dm', 'F#', 'Bb', 'Em', 'Bdim', 'Caug'
+    Devuelve (root, quality) donde quality ∈ {'maj', 'min', 'dim', 'aug'}
     """
     s = chord.strip()
 
     if not s:
         raise ValueError("Acorde vacío")
 
-    # Detectar menor por sufijo 'm'
     quality = "maj"
-    if s.endswith("m") and not s.endswith("maj"):
+    if s.endswith("dim"):
+        quality = "dim"
+        s = s[:-3]
+    elif s.endswith("aug"):
+        quality = "aug"
+        s = s[:-3]
+    # Detectar menor por sufijo 'm'
+    elif s.endswith("m") and not s.endswith("maj"):
         quality = "min"
         s = s[:-1]  # quitar la 'm'
 
@@ -31,7 +47,7 @@ def parse_chord_symbol(chord: str) -> tuple[str, str]:
 
 def chord_pitch_classes(chord: str) -> set[int]:
     """
-    Devuelve pitch classes (0..11) del acorde triada (mayor/menor).
+    Devuelve pitch classes (0..11) del acorde triada (mayor/menor/disminuido/aumentado).
     """
     root_str, quality = parse_chord_symbol(chord)
     root_pc = tonic_to_pitch_class(root_str)
@@ -0,0 +1,12 @@
+# musica/armonia.py
+
+from __future__ import annotations
+
+# Constantes de la estimación de tonalidad y acordes (ver musica/estimacion.py)
+
+# Perfiles tonales de Krumhansl-Kessler (índice 0 = tónica)
+PERFIL_MAYOR = [6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88]
+PERFIL_MENOR = [6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17]
+
+# Bonus para la fundamental al desempatar acordes con notas comunes (C vs Am)
+BONUS_FUNDAMENTAL = 0.1
@@ -0,0 +1,121 @@
+# musica/cache_midi.py
+
+from __future__ import annotations
+
+import os
+import json
+import hashlib
+from dataclasses import asdict
+from typing import Optional
+
+from musica.midi_importer import MidiImporter, MidiInputInfo, VERSION_IMPORTER
+
+CACHE_DIR = os.path.join(".cache", "midi")
+CACHE_MAX_BYTES = 4 * 1024 * 1024  # ~miles de entradas de < 1 KB
+
+
+class CacheMidi:
+    """
+    Caché en disco de MidiInputInfo direccionada por contenido:
+    clave = sha256(bytes del MIDI + compases_esperados + backend + versión del importador).
+
+    Una entrada = un JSON pequeño. Al superar max_bytes se eliminan
+    las entradas usadas hace más tiempo (mtime, que se actualiza en cada acierto).
+    """
+
+    def __init__(self, directorio: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def clave(data: bytes, compases_esperados: int, backend: str) -> str:
+        h = hashlib.sha256(data)
+        h.update(f"|{compases_esperados}|{backend}|v{VERSION_IMPORTER}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave + ".json")
+
+    def obtener(self, clave: str) -> Optional[MidiInputInfo]:
+        path = self._path(clave)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            info = MidiInputInfo(**d)
+        except TypeError:
+            # Entrada malformada (escrita a medias o de otro formato): fallo de caché
+            return None
+
+        try:
+            os.utime(path)  # LRU: marcar como usada
+        except OSError:
+            pass
+        return info
+
+    def guardar(self, clave: str, info: MidiInputInfo) -> None:
+        os.makedirs(self.directorio, exist_ok=True)
+        path = self._path(clave)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(info), f)
+        os.replace(tmp, path)
+        self._evictar()
+
+    def _evictar(self) -> None:
+        entradas = []
+        total = 0
+        with os.scandir(self.directorio) as it:
+            for e in it:
+                if not e.name.endswith(".json"):
+                    continue
+                st = e.stat()
+                entradas.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entradas.sort()
+        for _, size, path in entradas:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+def cargar_cacheado(
+    midi_path: str,
+    compases_esperados: int = 8,
+    backend: str = "music21",
+    cache: Optional[CacheMidi] = None,
+) -> MidiInputInfo:
+    """
+    MidiImporter.cargar con caché: si el contenido del fichero ya se importó
+    con los mismos parámetros, no se vuelve a parsear (ni se importa music21).
+    Los errores (p. ej. MIDI demasiado corto) no se cachean.
+    """
+    if cache is None:
+        cache = CacheMidi()
+
+    with open(midi_path, "rb") as f:
+        data = f.read()
+
+    clave = CacheMidi.clave(data, compases_esperados, backend)
+    info = cache.obtener(clave)
+    if info is not None:
+        return info
+
+    if backend == "smf":
+        # Ya tenemos los bytes: se parsean sin volver a leer el fichero
+        info = MidiImporter.cargar_bytes(data, compases_esperados=compases_esperados)
+    else:
+        info = MidiImporter.cargar(midi_path, compases_esperados=compases_esperados, backend=backend)
+    cache.guardar(clave, info)
+    return info
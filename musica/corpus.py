@@ -0,0 +1,200 @@
+# musica/corpus.py
+
+from __future__ import annotations
+
+import os
+import csv
+import hashlib
+from dataclasses import dataclass, field, asdict
+from multiprocessing import Pool
+from typing import Iterator, List, Optional, Tuple
+
+import config as cfg
+
+from musica.midi_importer import MidiImporter, MidiInputInfo, LecturaSMF
+
+EXTENSIONES_MIDI = (".mid", ".midi")
+INDICE_PATH = os.path.join("logs", "corpus_index.csv")
+COLUMNAS = ["path", "hash", "bpm", "compas", "tonica", "modo", "acordes", "num_compases", "error"]
+
+
+@dataclass
+class RegistroCorpus:
+    path: str
+    hash: str
+    bpm: Optional[int] = None
+    compas: Optional[str] = None
+    tonica: Optional[str] = None
+    modo: Optional[str] = None
+    acordes: List[str] = field(default_factory=list)
+    num_compases: Optional[int] = None
+    error: Optional[str] = None
+
+    def a_info(self) -> Optional[MidiInputInfo]:
+        """MidiInputInfo equivalente, o None si el fichero no era utilizable."""
+        if self.error is not None:
+            return None
+        return MidiInputInfo(
+            bpm=self.bpm,
+            compas=self.compas,
+            tonica=self.tonica,
+            modo=self.modo,
+            acordes=list(self.acordes),
+            num_compases_detectados=self.num_compases,
+        )
+
+
+def buscar_midis(raiz: str) -> Iterator[str]:
+    """Recorre el árbol de directorios y devuelve los ficheros MIDI (orden estable)."""
+    for dirpath, dirnames, filenames in os.walk(raiz):
+        dirnames.sort()
+        for nombre in sorted(filenames):
+            if nombre.lower().endswith(EXTENSIONES_MIDI):
+                yield os.path.join(dirpath, nombre)
+
+
+def _registro(path: str, h: str, info: MidiInputInfo) -> RegistroCorpus:
+    return RegistroCorpus(
+        path=path,
+        hash=h,
+        bpm=info.bpm,
+        compas=info.compas,
+        tonica=info.tonica,
+        modo=info.modo,
+        acordes=info.acordes,
+        num_compases=info.num_compases_detectados,
+    )
+
+
+def leer_registro(
+    path: str,
+    compases_esperados: int = cfg.COMPASES,
+    backend: str = "smf",
+    hash_previo: Optional[str] = None,
+) -> Optional[Tuple[RegistroCorpus, Optional[LecturaSMF]]]:
+    """
+    Lee un fichero y nunca lanza: los fallos quedan en RegistroCorpus.error.
+    El fichero se lee una sola vez (hash y parseo sobre los mismos bytes).
+    Con backend "smf" devuelve además la LecturaSMF: tonalidad y acordes se estiman
+    después, por lotes (MidiImporter.estimar_lote). Con "music21" el registro ya va completo.
+    Devuelve None si su contenido coincide con hash_previo (ya indexado).
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return RegistroCorpus(path=path, hash="", error=f"{type(e).__name__}: {e}"), None
+
+    h = hashlib.sha256(data).hexdigest()
+    if h == hash_previo:
+        return None
+
+    try:
+        if backend == "smf":
+            return RegistroCorpus(path=path, hash=h), MidiImporter.leer_bytes(data, compases_esperados)
+        info = MidiImporter.cargar(path, compases_esperados=compases_esperados, backend=backend)
+    except Exception as e:
+        return RegistroCorpus(path=path, hash=h, error=f"{type(e).__name__}: {e}"), None
+    return _registro(path, h, info), None
+
+
+def _completar(leidos: List[Tuple[RegistroCorpus, Optional[LecturaSMF]]]) -> List[RegistroCorpus]:
+    """Estima de una vez tonalidad y acordes de todas las lecturas SMF pendientes."""
+    pendientes = [(reg, lec) for reg, lec in leidos if lec is not None]
+    infos = MidiImporter.estimar_lote([lec for _, lec in pendientes])
+    completos = {id(reg): _registro(reg.path, reg.hash, info) for (reg, _), info in zip(pendientes, infos)}
+    return [completos.get(id(reg), reg) for reg, _ in leidos]
+
+
+def importar_registro(path: str, compases_esperados: int = cfg.COMPASES, backend: str = "smf") -> RegistroCorpus:
+    """Importa un solo fichero (leer_registro + estimación)."""
+    return _completar([leer_registro(path, compases_esperados, backend)])[0]
+
+
+def _leer_tarea(args) -> Optional[Tuple[RegistroCorpus, Optional[LecturaSMF]]]:
+    return leer_registro(*args)
+
+
+def _fila(reg: RegistroCorpus) -> dict:
+    d = asdict(reg)
+    d["acordes"] = " ".join(reg.acordes)
+    return {k: ("" if v is None else v) for k, v in d.items()}
+
+
+def leer_indice(path: str = INDICE_PATH) -> List[RegistroCorpus]:
+    """Lee el índice CSV del corpus."""
+    out = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            out.append(RegistroCorpus(
+                path=row["path"],
+                hash=row["hash"],
+                bpm=int(row["bpm"]) if row["bpm"] else None,
+                compas=row["compas"] or None,
+                tonica=row["tonica"] or None,
+                modo=row["modo"] or None,
+                acordes=row["acordes"].split(),
+                num_compases=int(row["num_compases"]) if row["num_compases"] else None,
+                error=row["error"] or None,
+            ))
+    return out
+
+
+def ingerir_corpus(
+    raiz: str,
+    indice_path: str = INDICE_PATH,
+    compases_esperados: int = cfg.COMPASES,
+    backend: str = "smf",
+    procesos: Optional[int] = None,
+    chunksize: int = 32,
+    lote: int = 256,
+) -> Iterator[RegistroCorpus]:
+    """
+    Importa todos los MIDI bajo raiz con un pool de procesos.
+    Los workers parsean y devuelven histogramas por compás; tonalidad y acordes se
+    estiman en el proceso principal para lotes de hasta `lote` ficheros a la vez
+    (musica/estimacion.py). Los registros se devuelven (y se añaden al índice) por lotes.
+    Los ficheros ya indexados con el mismo contenido (path, hash) se saltan, así que se
+    puede reanudar; un fichero editado desde la última ingesta se vuelve a importar
+    (la fila más reciente de cada path es la vigente).
+    """
+    hechos = {}
+    if os.path.exists(indice_path):
+        hechos = {r.path: r.hash for r in leer_indice(indice_path)}
+
+    tareas = [(p, compases_esperados, backend, hechos.get(p)) for p in buscar_midis(raiz)]
+    if not tareas:
+        return
+
+    nuevo = not os.path.exists(indice_path)
+    os.makedirs(os.path.dirname(indice_path) or ".", exist_ok=True)
+
+    with open(indice_path, "a", encoding="utf-8", newline="") as f, Pool(processes=procesos) as pool:
+        w = csv.DictWriter(f, fieldnames=COLUMNAS)
+        if nuevo:
+            w.writeheader()
+        leidos = []
+        for leido in pool.imap_unordered(_leer_tarea, tareas, chunksize=chunksize):
+            if leido is not None:
+                leidos.append(leido)
+            if len(leidos) >= lote:
+                for reg in _completar(leidos):
+                    w.writerow(_fila(reg))
+                    yield reg
+                leidos = []
+        for reg in _completar(leidos):
+            w.writerow(_fila(reg))
+            yield reg
+
+
+if __name__ == "__main__":
+    import sys
+
+    raiz = sys.argv[1] if len(sys.argv) > 1 else "."
+    ok = err = 0
+    for reg in ingerir_corpus(raiz):
+        if reg.error is None:
+            ok += 1
+        else:
+            err += 1
+    print(f"📚 Corpus: {ok} importados, {err} con error -> {INDICE_PATH}")
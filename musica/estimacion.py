@@ -0,0 +1,125 @@
+# musica/estimacion.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Falta instalar numpy. Ejecuta: pip install numpy"
+    ) from e
+
+from musica.tonalidad import PC_TO_NOTE
+from musica.acordes import TRIAD_FORMULAS, CHORD_SUFFIXES
+from musica.armonia import PERFIL_MAYOR, PERFIL_MENOR, BONUS_FUNDAMENTAL
+
+
+def _zscore(x: np.ndarray) -> np.ndarray:
+    """Normaliza la última dimensión (media 0, desviación 1). Filas constantes -> 0."""
+    x = x - x.mean(axis=-1, keepdims=True)
+    std = x.std(axis=-1, keepdims=True)
+    return np.divide(x, std, out=np.zeros_like(x), where=std > 0)
+
+
+def _construir_tablas():
+    # 24 tonalidades en orden de desempate (argmax se queda con la primera): C mayor, C menor, C# mayor, ...
+    nombres_tonalidad = []
+    perfiles = []
+    for pc in range(12):
+        for modo, perfil in (("mayor", PERFIL_MAYOR), ("menor", PERFIL_MENOR)):
+            nombres_tonalidad.append((PC_TO_NOTE[pc], modo))
+            perfiles.append(np.roll(np.asarray(perfil, dtype=np.float64), pc))
+
+    # Plantillas de acorde en orden de desempate: fundamental C..B y, en cada una, TRIAD_FORMULAS
+    simbolos = []
+    plantillas = []
+    cobertura = []
+    for root in range(12):
+        for quality, intervalos in TRIAD_FORMULAS.items():
+            t = np.zeros(12)
+            for i in intervalos:
+                t[(root + i) % 12] = 1.0
+            cobertura.append(t.copy())
+            t[root] += BONUS_FUNDAMENTAL
+            plantillas.append(t)
+            simbolos.append(PC_TO_NOTE[root] + CHORD_SUFFIXES[quality])
+
+    return (
+        nombres_tonalidad,
+        _zscore(np.stack(perfiles)),
+        simbolos,
+        np.stack(plantillas),
+        np.stack(cobertura),
+    )
+
+
+NOMBRES_TONALIDAD, PERFILES_Z, SIMBOLOS_ACORDE, PLANTILLAS_ACORDE, COBERTURA_ACORDE = _construir_tablas()
+
+
+@dataclass
+class EstimacionArmonica:
+    tonica: Optional[str]
+    modo: Optional[str]
+    confianza_tonalidad: float        # correlación de Pearson con el perfil (-1..1)
+    acordes: List[str]                # 1 por compás
+    confianza_acordes: List[float]    # fracción de la duración del compás cubierta por el acorde (0..1)
+
+
+def estimar_lote(
+    hist: np.ndarray,
+    fallback: str = "C",
+    totales: Optional[np.ndarray] = None,
+) -> List[EstimacionArmonica]:
+    """
+    Estima tonalidad y acordes de muchas piezas a la vez.
+    hist: array (piezas, compases, 12) de duraciones por pitch class.
+    totales: (piezas, 12) para la tonalidad si se estima sobre más compases que los
+    de hist (p. ej. todo el fichero); por defecto, la suma de hist.
+    Todas las piezas se resuelven con dos productos matriciales.
+    """
+    hist = np.asarray(hist, dtype=np.float64)
+    if hist.ndim != 3 or hist.shape[-1] != 12:
+        raise ValueError(f"Se espera un array (piezas, compases, 12), recibido {hist.shape}")
+
+    # ---- Tonalidad: correlación con los 24 perfiles ----
+    total = hist.sum(axis=1) if totales is None else np.asarray(totales, dtype=np.float64)   # (P, 12)
+    corr = _zscore(total) @ PERFILES_Z.T / 12.0                  # (P, 24)
+    idx_ton = corr.argmax(axis=1)
+    conf_ton = corr[np.arange(len(idx_ton)), idx_ton]
+    vacia = total.sum(axis=1) <= 0
+
+    # ---- Acordes: puntuación de plantillas por compás ----
+    score = hist @ PLANTILLAS_ACORDE.T                           # (P, C, n_acordes)
+    idx_ac = score.argmax(axis=2)
+    cubierto = np.take_along_axis(hist @ COBERTURA_ACORDE.T, idx_ac[..., None], axis=2)[..., 0]
+    dur = hist.sum(axis=2)
+    conf_ac = np.divide(cubierto, dur, out=np.zeros_like(dur), where=dur > 0)
+    compas_vacio = dur <= 0
+
+    out = []
+    for p in range(hist.shape[0]):
+        if vacia[p]:
+            tonica, modo, c_ton = None, None, 0.0
+        else:
+            tonica, modo = NOMBRES_TONALIDAD[idx_ton[p]]
+            c_ton = float(conf_ton[p])
+
+        acordes = [fallback if compas_vacio[p, c] else SIMBOLOS_ACORDE[idx_ac[p, c]]
+                   for c in range(hist.shape[1])]
+        out.append(EstimacionArmonica(
+            tonica=tonica,
+            modo=modo,
+            confianza_tonalidad=c_ton,
+            acordes=acordes,
+            confianza_acordes=conf_ac[p].tolist(),
+        ))
+    return out
+
+
+def estimar(hist: Sequence[Sequence[float]], fallback: str = "C") -> EstimacionArmonica:
+    """Versión para una sola pieza: hist es (compases, 12)."""
+    return estimar_lote(np.asarray(hist, dtype=np.float64)[None, ...], fallback=fallback)[0]
+
@@ -0,0 +1,85 @@
+# musica/exportacion.py
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+import config as cfg
+
+from musica.smf_writer import genes_a_smf, melodias_a_smf
+
+
+def _escribir(path: str, data: bytes) -> str:
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def exportar_multipista(
+    melodias: Sequence[List[int]],
+    salida_path: str,
+    bpm: Optional[int] = None,
+    compas: str = "4/4",
+) -> str:
+    """Todas las melodías como pistas de un único MIDI (formato 1)."""
+    if bpm is None:
+        bpm = cfg.TEMPO
+    os.makedirs(os.path.dirname(salida_path) or ".", exist_ok=True)
+    return _escribir(salida_path, melodias_a_smf(list(melodias), bpm=bpm, compas=compas))
+
+
+def exportar_ficheros(
+    melodias: Sequence[List[int]],
+    directorio: str,
+    bpm: Optional[int] = None,
+    compas: str = "4/4",
+    prefijo: str = "melodia",
+    hilos: int = 8,
+) -> List[str]:
+    """
+    Un MIDI por melodía (<prefijo>_00000.mid, ...).
+    Los bytes se generan en el hilo principal y la escritura a disco
+    se reparte en un pool de hilos de I/O.
+    """
+    if bpm is None:
+        bpm = cfg.TEMPO
+    os.makedirs(directorio, exist_ok=True)
+
+    ancho = max(5, len(str(len(melodias))))
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        futuros = []
+        for i, genes in enumerate(melodias):
+            path = os.path.join(directorio, f"{prefijo}_{i:0{ancho}d}.mid")
+            futuros.append(pool.submit(_escribir, path, genes_a_smf(genes, bpm=bpm, compas=compas)))
+        return [f.result() for f in futuros]
+
+
+def exportar_lote(
+    melodias: Sequence[List[int]],
+    fitness: Optional[Sequence[float]],
+    directorio: str,
+    bpm: Optional[int] = None,
+    compas: str = "4/4",
+    multipista: bool = True,
+    hilos: int = 8,
+) -> List[str]:
+    """
+    Exportación masiva:
+    - multipista=True  -> <directorio>/melodias.mid con una pista por melodía
+    - multipista=False -> un fichero por melodía
+    Siempre se escribe además <directorio>/genes.bin (archivo binario de genomas, memory-mappable).
+
+    Devuelve los paths escritos.
+    """
+    from ga.archivo_genes import guardar_genes
+
+    if multipista:
+        paths = [exportar_multipista(melodias, os.path.join(directorio, "melodias.mid"), bpm=bpm, compas=compas)]
+    else:
+        paths = exportar_ficheros(melodias, directorio, bpm=bpm, compas=compas, hilos=hilos)
+
+    archivo = os.path.join(directorio, "genes.bin")
+    guardar_genes(archivo, list(melodias), fitness)
+    return paths + [archivo]
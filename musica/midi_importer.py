@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Sequence
 
-from music21 import converter, tempo, meter, chord, stream
+from musica.smf_reader import leer_smf, inicios_de_compas, histogramas_por_compas
+
+BACKENDS = ("music21", "smf")
+
+# Subir al cambiar la lógica de importación (invalida la caché de resultados)
+VERSION_IMPORTER = 2
 
 
 @dataclass
@@ -18,10 +23,24 @@ class MidiInputInfo:
     num_compases_detectados: int
 
 
+@dataclass
+class LecturaSMF:
+    """Lo que el backend "smf" extrae de un MIDI antes de estimar tonalidad y acordes."""
+    bpm: Optional[int]
+    compas: str
+    hist: List[List[float]]          # compases_esperados x 12 (acordes)
+    total: List[float]               # 12, todo el fichero (tonalidad)
+    num_compases: int
+
+
 class MidiImporter:
     """
     Servicio de importación MIDI:
     - Extrae tempo, compás, tonalidad (estimada) y acordes (inferidos).
+
+    Backends:
+    - "music21": análisis completo con music21 (lento, import pesado).
+    - "smf": lector SMF en Python puro + histogramas de pitch class (milisegundos).
     """
 
     @staticmethod
@@ -35,7 +54,90 @@ class MidiImporter:
     def cargar(
         midi_path: str,
         compases_esperados: int = 8,
+        backend: str = "music21",
     ) -> MidiInputInfo:
+        if backend == "smf":
+            return MidiImporter._cargar_smf(midi_path, compases_esperados)
+        if backend == "music21":
+            return MidiImporter._cargar_music21(midi_path, compases_esperados)
+        raise ValueError(f"Backend de importación no soportado: {backend} (opciones: {BACKENDS})")
+
+    @staticmethod
+    def _validar_compases(num_compases: int, compases_esperados: int) -> None:
+        if num_compases < compases_esperados:
+            raise ValueError(
+                f"El MIDI tiene {num_compases} compases detectados, "
+                f"pero se esperaban al menos {compases_esperados}."
+            )
+
+    @staticmethod
+    def _cargar_smf(midi_path: str, compases_esperados: int) -> MidiInputInfo:
+        with open(midi_path, "rb") as f:
+            return MidiImporter.cargar_bytes(f.read(), compases_esperados)
+
+    @staticmethod
+    def cargar_bytes(data: bytes, compases_esperados: int = 8) -> MidiInputInfo:
+        """Backend "smf" sobre el contenido de un fichero MIDI ya leído (p. ej. recibido por red)."""
+        return MidiImporter.estimar_lote([MidiImporter.leer_bytes(data, compases_esperados)])[0]
+
+    @staticmethod
+    def estimar_lote(lecturas: Sequence[LecturaSMF]) -> List[MidiInputInfo]:
+        """Tonalidad y acordes de muchas lecturas con una sola llamada a estimacion.estimar_lote."""
+        # numpy sólo se carga al importar un MIDI, no al arrancar
+        from musica.estimacion import estimar_lote
+
+        if not lecturas:
+            return []
+        estimaciones = estimar_lote([l.hist for l in lecturas], totales=[l.total for l in lecturas])
+        return [
+            MidiInputInfo(
+                bpm=l.bpm,
+                compas=l.compas,
+                tonica=e.tonica,
+                modo=e.modo,
+                acordes=e.acordes,
+                num_compases_detectados=l.num_compases,
+            )
+            for l, e in zip(lecturas, estimaciones)
+        ]
+
+    @staticmethod
+    def leer_bytes(data: bytes, compases_esperados: int = 8) -> LecturaSMF:
+        """Parseo SMF e histogramas por compás, sin estimar (ver estimar_lote)."""
+        datos = leer_smf(data)
+
+        # ---- Tempo ----
+        bpm = None
+        if datos.tempos:
+            bpm = int(round(60_000_000 / datos.tempos[0][1]))
+
+        # ---- Compás ----
+        compas = "4/4"
+        if datos.compases:
+            _, num, den = datos.compases[0]
+            compas = f"{num}/{den}"
+
+        # ---- Histogramas por compás ----
+        inicios = inicios_de_compas(datos)
+        hist = histogramas_por_compas(datos, inicios)
+
+        num_compases = len(inicios)
+        MidiImporter._validar_compases(num_compases, compases_esperados)
+
+        # Tonalidad sobre todo el fichero, acordes sobre los compases esperados
+        total = [sum(h[pc] for h in hist) for pc in range(12)]
+        return LecturaSMF(
+            bpm=bpm,
+            compas=compas,
+            hist=hist[:compases_esperados],
+            total=total,
+            num_compases=num_compases,
+        )
+
+    @staticmethod
+    def _cargar_music21(midi_path: str, compases_esperados: int) -> MidiInputInfo:
+        from music21 import converter, tempo, meter, chord, stream
+
         score = converter.parse(midi_path)
 
         # ---- Tempo ----
@@ -79,11 +181,7 @@ class MidiImporter:
             compases = list(base.getElementsByClass(stream.Measure))
 
         num_compases = len(compases)
-        if num_compases < compases_esperados:
-            raise ValueError(
-                f"El MIDI tiene {num_compases} compases detectados, "
-                f"pero se esperaban al menos {compases_esperados}."
-            )
+        MidiImporter._validar_compases(num_compases, compases_esperados)
 
         compases = compases[:compases_esperados]
 
@@ -6,19 +6,26 @@ from typing import List, Optional
 
 import config as cfg
 
-try:
-    from music21 import stream, note, tempo, meter
-except ImportError as e:
-    raise ImportError(
-        "Falta instalar music21. Ejecuta: pip install music21"
-    ) from e
+from musica.smf_writer import genes_a_smf
+
+
+def _importar_music21():
+    """Import diferido: music21 sólo se carga al exportar (tarda cientos de ms)."""
+    try:
+        from music21 import stream, note, tempo, meter
+    except ImportError as e:
+        raise ImportError(
+            "Falta instalar music21. Ejecuta: pip install music21"
+        ) from e
+    return stream, note, tempo, meter
 
 
 def exportar_genes_a_midi(
     genes: List[int],
     salida_path: str = "resultado.mid",
     bpm: Optional[int] = None,
-    compas: str = "4/4"
+    compas: str = "4/4",
+    backend: str = "music21",
 ) -> str:
     """
     Convierte genes (NOTE midi / REST / HOLD) a un MIDI.
@@ -27,11 +34,23 @@ def exportar_genes_a_midi(
     - HOLD prolonga la nota anterior.
     - REST crea silencio.
 
+    backend="smf" escribe los bytes SMF directamente (sin music21, una sola escritura).
+
     Devuelve el path de salida.
     """
     if bpm is None:
         bpm = cfg.TEMPO
 
+    if backend == "smf":
+        data = genes_a_smf(genes, bpm=bpm, compas=compas)
+        with open(salida_path, "wb") as f:
+            f.write(data)
+        return salida_path
+    if backend != "music21":
+        raise ValueError(f"Backend de exportación no soportado: {backend}")
+
+    stream, note, tempo, meter = _importar_music21()
+
     s = stream.Stream()
     s.append(tempo.MetronomeMark(number=bpm))
     s.append(meter.TimeSignature(compas))
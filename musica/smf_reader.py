@@ -0,0 +1,191 @@
+# musica/smf_reader.py
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+# Canal 10 (índice 9) = percusión GM: no aporta información armónica
+CANAL_PERCUSION = 9
+
+
+@dataclass
+class NotaSMF:
+    inicio: int      # tick absoluto
+    fin: int         # tick absoluto
+    pitch: int
+    canal: int
+
+
+@dataclass
+class DatosSMF:
+    ticks_por_negra: int
+    tempos: List[Tuple[int, int]] = field(default_factory=list)               # (tick, microsegundos por negra)
+    compases: List[Tuple[int, int, int]] = field(default_factory=list)        # (tick, numerador, denominador)
+    notas: List[NotaSMF] = field(default_factory=list)
+    tick_final: int = 0
+
+
+def _leer_varlen(data: bytes, pos: int) -> Tuple[int, int]:
+    """Lee una cantidad de longitud variable (7 bits por byte). Devuelve (valor, nueva_pos)."""
+    valor = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        valor = (valor << 7) | (b & 0x7F)
+        if not (b & 0x80):
+            return valor, pos
+
+
+def _leer_pista(data: bytes, datos: DatosSMF) -> None:
+    """Recorre los eventos de un chunk MTrk y acumula notas y meta-eventos en datos."""
+    pos = 0
+    n = len(data)
+    tick = 0
+    status = 0
+    abiertas: Dict[Tuple[int, int], List[int]] = {}
+
+    while pos < n:
+        delta, pos = _leer_varlen(data, pos)
+        tick += delta
+
+        b = data[pos]
+        if b & 0x80:
+            status = b
+            pos += 1
+        elif status == 0 or status >= 0xF0:
+            raise ValueError("Running status sin evento de canal previo")
+
+        if status == 0xFF:
+            tipo = data[pos]
+            longitud, pos = _leer_varlen(data, pos + 1)
+            payload = data[pos:pos + longitud]
+            pos += longitud
+
+            if tipo == 0x51 and longitud == 3:
+                datos.tempos.append((tick, (payload[0] << 16) | (payload[1] << 8) | payload[2]))
+            elif tipo == 0x58 and longitud >= 2:
+                datos.compases.append((tick, payload[0], 2 ** payload[1]))
+            elif tipo == 0x2F:
+                break
+            # Meta-eventos y SysEx cancelan el running status (spec SMF)
+            status = 0
+            continue
+
+        if status in (0xF0, 0xF7):
+            longitud, pos = _leer_varlen(data, pos)
+            pos += longitud
+            status = 0
+            continue
+
+        tipo = status & 0xF0
+        canal = status & 0x0F
+
+        if tipo in (0xC0, 0xD0):
+            pos += 1
+            continue
+
+        d1 = data[pos]
+        d2 = data[pos + 1]
+        pos += 2
+
+        if tipo == 0x90 and d2 > 0:
+            abiertas.setdefault((canal, d1), []).append(tick)
+        elif tipo == 0x80 or tipo == 0x90:
+            pila = abiertas.get((canal, d1))
+            if pila:
+                inicio = pila.pop(0)
+                datos.notas.append(NotaSMF(inicio, tick, d1, canal))
+
+    # Notas sin note-off: se cierran al final de la pista
+    for (canal, pitch), inicios in abiertas.items():
+        for inicio in inicios:
+            datos.notas.append(NotaSMF(inicio, tick, pitch, canal))
+
+    datos.tick_final = max(datos.tick_final, tick)
+
+
+def leer_smf(data: bytes) -> DatosSMF:
+    """
+    Parsea un Standard MIDI File (formato 0/1) a partir de sus bytes.
+    Sólo se extraen notas, tempo y compás; el resto de eventos se ignora.
+    """
+    if data[:4] != b"MThd":
+        raise ValueError("No es un fichero MIDI (falta cabecera MThd)")
+
+    long_cabecera = int.from_bytes(data[4:8], "big")
+    num_pistas = int.from_bytes(data[10:12], "big")
+    division = int.from_bytes(data[12:14], "big")
+    if division & 0x8000:
+        raise ValueError("División SMPTE no soportada (se espera ticks por negra)")
+
+    datos = DatosSMF(ticks_por_negra=division)
+
+    pos = 8 + long_cabecera
+    pistas = 0
+    while pos + 8 <= len(data) and pistas < num_pistas:
+        tipo = data[pos:pos + 4]
+        longitud = int.from_bytes(data[pos + 4:pos + 8], "big")
+        inicio = pos + 8
+        pos = inicio + longitud
+        if tipo != b"MTrk":
+            continue
+        try:
+            _leer_pista(data[inicio:pos], datos)
+        except IndexError:
+            raise ValueError(f"Pista {pistas} truncada o corrupta") from None
+        pistas += 1
+
+    datos.tempos.sort()
+    datos.compases.sort()
+    datos.notas.sort(key=lambda x: (x.inicio, x.pitch))
+    return datos
+
+
+def inicios_de_compas(datos: DatosSMF) -> List[int]:
+    """
+    Ticks de inicio de cada compás hasta cubrir la última nota,
+    respetando los cambios de compás (por defecto 4/4).
+    """
+    cambios = datos.compases or [(0, 4, 4)]
+    if cambios[0][0] > 0:
+        cambios = [(0, 4, 4)] + cambios
+
+    fin = max([n.fin for n in datos.notas], default=0)
+    inicios: List[int] = []
+    tick = 0
+    idx = 0
+    while tick < fin:
+        while idx + 1 < len(cambios) and cambios[idx + 1][0] <= tick:
+            idx += 1
+        _, num, den = cambios[idx]
+        inicios.append(tick)
+        tick += max(1, datos.ticks_por_negra * 4 * num // den)
+    return inicios
+
+
+def histogramas_por_compas(datos: DatosSMF, inicios: List[int]) -> List[List[float]]:
+    """
+    Matriz compases x 12: duración (en negras) de cada pitch class sonando en cada compás.
+    Las notas que cruzan la barra de compás se reparten entre ambos compases.
+    """
+    hist = [[0.0] * 12 for _ in inicios]
+    if not inicios:
+        return hist
+
+    limites = inicios + [max(datos.tick_final, max(n.fin for n in datos.notas))]
+    tpq = float(datos.ticks_por_negra)
+
+    for n in datos.notas:
+        if n.canal == CANAL_PERCUSION or n.fin <= n.inicio:
+            continue
+        pc = n.pitch % 12
+        c = bisect.bisect_right(inicios, n.inicio) - 1
+        t = n.inicio
+        while c < len(inicios) and t < n.fin:
+            corte = min(n.fin, limites[c + 1])
+            hist[c][pc] += (corte - t) / tpq
+            t = corte
+            c += 1
+    return hist
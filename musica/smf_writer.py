@@ -0,0 +1,108 @@
+# musica/smf_writer.py
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import config as cfg
+
+TICKS_POR_NEGRA = 480
+VELOCIDAD = 90
+CANAL = 0
+
+
+def _varlen(valor: int) -> bytes:
+    """Codifica un entero como cantidad de longitud variable SMF."""
+    out = [valor & 0x7F]
+    valor >>= 7
+    while valor:
+        out.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    return bytes(reversed(out))
+
+
+def genes_a_notas(genes: List[int], ticks_por_sub: int) -> List[Tuple[int, int, int]]:
+    """
+    Convierte genes (NOTE / REST / HOLD) en notas (inicio, fin, pitch) en ticks.
+    Mismas reglas que el export con music21: HOLD prolonga la nota anterior,
+    y un HOLD sin nota previa (o tras REST) es silencio.
+    """
+    notas = []
+    actual = None
+    inicio = 0
+
+    for i, g in enumerate(genes):
+        t = i * ticks_por_sub
+        if g == cfg.HOLD:
+            continue
+        if actual is not None:
+            notas.append((inicio, t, actual))
+        if g == cfg.REST:
+            actual = None
+        else:
+            actual = g
+            inicio = t
+
+    if actual is not None:
+        notas.append((inicio, len(genes) * ticks_por_sub, actual))
+    return notas
+
+
+def _meta_tempo_compas(bpm: int, compas: str) -> List[Tuple[int, int, bytes]]:
+    num, den = (int(x) for x in compas.split("/"))
+    us_por_negra = int(round(60_000_000 / bpm))
+    return [
+        (0, 0, b"\xff\x51\x03" + us_por_negra.to_bytes(3, "big")),
+        (0, 0, bytes([0xFF, 0x58, 0x04, num, den.bit_length() - 1, 24, 8])),
+    ]
+
+
+def _eventos_notas(genes: List[int], canal: int) -> List[Tuple[int, int, bytes]]:
+    ticks_por_sub = TICKS_POR_NEGRA * 4 // cfg.SUBDIVISIONES_POR_COMPAS
+    eventos = []
+    for inicio, fin, pitch in genes_a_notas(genes, ticks_por_sub):
+        eventos.append((inicio, 2, bytes([0x90 | canal, pitch, VELOCIDAD])))
+        eventos.append((fin, 1, bytes([0x80 | canal, pitch, 0])))
+    return eventos
+
+
+def _chunk_pista(eventos: List[Tuple[int, int, bytes]], fin_pista: int) -> bytes:
+    """Serializa eventos (tick, orden, bytes) como chunk MTrk. En el mismo tick, note-off antes que note-on."""
+    eventos = sorted(eventos, key=lambda e: (e[0], e[1]))
+    out = bytearray()
+    tick = 0
+    for t, _, ev in eventos:
+        out += _varlen(t - tick)
+        out += ev
+        tick = t
+    out += _varlen(max(0, fin_pista - tick)) + b"\xff\x2f\x00"
+    return b"MTrk" + len(out).to_bytes(4, "big") + bytes(out)
+
+
+def _cabecera(formato: int, pistas: int) -> bytes:
+    return b"MThd" + (6).to_bytes(4, "big") + formato.to_bytes(2, "big") \
+        + pistas.to_bytes(2, "big") + TICKS_POR_NEGRA.to_bytes(2, "big")
+
+
+def _fin(genes: List[int]) -> int:
+    return len(genes) * (TICKS_POR_NEGRA * 4 // cfg.SUBDIVISIONES_POR_COMPAS)
+
+
+def genes_a_smf(genes: List[int], bpm: int, compas: str = "4/4") -> bytes:
+    """Genera los bytes de un SMF formato 0 (una pista) con tempo, compás y las notas."""
+    eventos = _meta_tempo_compas(bpm, compas) + _eventos_notas(genes, CANAL)
+    return _cabecera(0, 1) + _chunk_pista(eventos, _fin(genes))
+
+
+def melodias_a_smf(melodias: List[List[int]], bpm: int, compas: str = "4/4") -> bytes:
+    """
+    SMF formato 1: pista de conductor (tempo/compás) + una pista por melodía.
+    Los canales rotan entre 0..15 saltando el 9 (percusión).
+    """
+    canales = [c for c in range(16) if c != 9]
+    fin = max((_fin(g) for g in melodias), default=0)
+
+    partes = [_cabecera(1, len(melodias) + 1), _chunk_pista(_meta_tempo_compas(bpm, compas), fin)]
+    for i, genes in enumerate(melodias):
+        partes.append(_chunk_pista(_eventos_notas(genes, canales[i % len(canales)]), _fin(genes)))
+    return b"".join(partes)
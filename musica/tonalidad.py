@@ -10,6 +10,9 @@ NOTE_TO_PC = {
     "B": 11
 }
 
+# Nombre canónico de cada pitch class (compatible con NOTE_TO_PC)
+PC_TO_NOTE = ["C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+
 MAJOR_STEPS = [2, 2, 1, 2, 2, 2, 1]  # tonos/semitonos entre grados
 MINOR_NATURAL_STEPS = [2, 1, 2, 2, 1, 2, 2]  # menor natural
 
@@ -1,50 +1,67 @@
 import os
-import numpy as np
-import matplotlib.pyplot as plt
+import sys
 import config as cfg
 
 GENES_PATH = os.path.join("logs", "mejor_genes.txt")
+HOJAS_DIR = os.path.join("logs", "pianorolls")
+
+# Valores de las celdas del piano roll (índices del colormap de las hojas)
+FONDO, COMPAS, CUERPO, ATAQUE, SEPARADOR = 0, 1, 2, 3, 4
+COLORES = ["#ffffff", "#e6e6e6", "#5b8fd6", "#133d7a", "#808080"]
 
 def cargar_genes(path):
     with open(path, "r", encoding="utf-8") as f:
         line = f.readline().strip()
     return [int(x) for x in line.split(",")]
 
-def genes_a_eventos(genes):
-    # Convierte REST/HOLD en una nota "activa" por tick (o None)
-    active = None
-    notas = []
-    for g in genes:
-        if g == cfg.REST:
-            active = None
-            notas.append(None)
-        elif g == cfg.HOLD:
-            notas.append(active)
-        else:
-            active = g
-            notas.append(active)
-    return notas
+def matrices_pianoroll(genes, pmin=None, pmax=None):
+    # (N, L) genes -> (N, P, L) uint8 con FONDO/COMPAS/CUERPO/ATAQUE, pitch alto arriba
+    import numpy as np
+    from ga.tensorial import notas_activas
+
+    g = np.asarray(genes, dtype=np.int16)
+    if g.ndim == 1:
+        g = g[None, :]
+    activa = notas_activas(g)
+    sonando = activa >= 0
+    if pmin is None or pmax is None:
+        pitches = activa[sonando]
+        pmin = int(pitches.min()) if pitches.size else cfg.RANGO_MIN
+        pmax = int(pitches.max()) if pitches.size else cfg.RANGO_MAX
+    N, L = g.shape
+    P = pmax - pmin + 1
+
+    mats = np.full((N, P, L), FONDO, dtype=np.uint8)
+    mats[:, :, ::cfg.SUBDIVISIONES_POR_COMPAS] = COMPAS
+
+    fila = pmax - activa
+    visible = sonando & (fila >= 0) & (fila < P)
+    n_idx, t_idx = np.nonzero(visible)
+    valor = np.where(g[n_idx, t_idx] >= 0, ATAQUE, CUERPO).astype(np.uint8)
+    mats[n_idx, fila[n_idx, t_idx], t_idx] = valor
+    return mats, pmin, pmax
+
+def mosaico(mats, columnas, filas):
+    # (n, P, L) -> una imagen (filas*(P+1)-1, columnas*(L+1)-1) con separadores; huecos vacíos al final
+    import numpy as np
+
+    n, P, L = mats.shape
+    celdas = np.full((filas * columnas, P + 1, L + 1), SEPARADOR, dtype=np.uint8)
+    celdas[n:, :P, :L] = FONDO
+    celdas[:n, :P, :L] = mats
+    img = celdas.reshape(filas, columnas, P + 1, L + 1).transpose(0, 2, 1, 3)
+    return img.reshape(filas * (P + 1), columnas * (L + 1))[:-1, :-1]
 
 def plot_pianoroll(genes):
-    notas = genes_a_eventos(genes)
+    import matplotlib.pyplot as plt
 
-    # matriz [pitch, time]
-    pitches = [n for n in notas if n is not None]
-    if not pitches:
+    mats, pmin, pmax = matrices_pianoroll(genes)
+    if not (mats >= CUERPO).any():
         print("No hay notas para dibujar.")
         return
 
-    pmin, pmax = min(pitches), max(pitches)
-    T = len(notas)
-    H = (pmax - pmin + 1)
-
-    mat = np.zeros((H, T), dtype=int)
-    for t, n in enumerate(notas):
-        if n is not None:
-            mat[pmax - n, t] = 1  # invertido para que el pitch alto quede arriba
-
     plt.figure()
-    plt.imshow(mat, aspect="auto", interpolation="nearest")
+    plt.imshow(mats[0] >= CUERPO, aspect="auto", interpolation="nearest")
     plt.xlabel("Tiempo (subdivisiones)")
     plt.ylabel("Pitch (relativo)")
     plt.title("Piano roll (mejor melodía)")
@@ -53,6 +70,125 @@ def plot_pianoroll(genes):
     plt.close()
     print(f"✅ Guardado: {out}")
 
+# =========================================================
+# Hojas de contactos (lotes de melodías)
+# =========================================================
+
+# Lienzo Agg por proceso, reutilizado entre hojas con la misma geometría
+_lienzo = {}
+
+# Hojas mínimas por proceso: con menos, importar matplotlib y crear el lienzo en
+# cada worker cuesta más que dibujar en serie (~90 ms por hoja)
+HOJAS_MIN_POR_PROCESO = 16
+
+def _preparar_lienzo(filas, columnas, forma, dpi):
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import ListedColormap
+
+    clave = (filas, columnas, forma, dpi)
+    if _lienzo.get("clave") == clave:
+        return _lienzo
+
+    alto_celda, ancho_celda = forma
+    fig = Figure(figsize=(columnas * 2.2, filas * max(0.9, 0.07 * alto_celda) + 0.4), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0.0, 0.0, 1.0, 1.0 - 0.4 / fig.get_figheight()])
+    ax.set_axis_off()
+    vacio = mosaico(np.zeros((0, alto_celda, ancho_celda), dtype=np.uint8), columnas, filas)
+    imagen = ax.imshow(vacio, aspect="auto", interpolation="nearest",
+                       cmap=ListedColormap(COLORES), vmin=0, vmax=len(COLORES) - 1)
+    etiquetas = [
+        ax.text(c * (ancho_celda + 1) + 0.5, r * (alto_celda + 1) - 0.5, "", fontsize=6, va="top", ha="left",
+                color="#c0392b")
+        for r in range(filas) for c in range(columnas)
+    ]
+    titulo = fig.suptitle("", fontsize=9, y=1.0, va="top")
+    _lienzo.clear()
+    _lienzo.update(clave=clave, fig=fig, canvas=canvas, imagen=imagen, etiquetas=etiquetas, titulo=titulo)
+    return _lienzo
+
+def _calentar_worker(filas, columnas, forma, dpi):
+    _preparar_lienzo(filas, columnas, forma, dpi)
+
+def _render_hoja(genes, fitness, inicio, pmin, pmax, filas, columnas, path, titulo, dpi):
+    mats, _, _ = matrices_pianoroll(genes, pmin, pmax)
+    lz = _preparar_lienzo(filas, columnas, mats.shape[1:], dpi)
+    lz["imagen"].set_data(mosaico(mats, columnas, filas))
+    for k, txt in enumerate(lz["etiquetas"]):
+        if k < len(genes):
+            fit = "" if fitness is None else f" {fitness[k]:.2f}"
+            txt.set_text(f"#{inicio + k}{fit}")
+            txt.set_visible(True)
+        else:
+            txt.set_visible(False)
+    lz["titulo"].set_text(titulo)
+    with open(path, "wb") as f:
+        lz["canvas"].print_png(f)
+    return path
+
+def render_hojas(genes, fitness=None, directorio=HOJAS_DIR, filas=6, columnas=5,
+                 procesos=None, dpi=100, titulo="", prefijo="hoja"):
+    # Lote de genomas -> PNGs con una rejilla filas x columnas de piano rolls (misma escala de pitch)
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+    from ga.tensorial import notas_activas
+
+    g = np.asarray(genes, dtype=np.int8)
+    fit = None if fitness is None else np.asarray(fitness, dtype=np.float64)
+    if g.ndim != 2 or len(g) == 0:
+        print("No hay melodías para dibujar.")
+        return []
+    if fit is not None and np.isnan(fit).all():
+        fit = None
+
+    activa = notas_activas(g)
+    pitches = activa[activa >= 0]
+    pmin = int(pitches.min()) if pitches.size else cfg.RANGO_MIN
+    pmax = int(pitches.max()) if pitches.size else cfg.RANGO_MAX
+
+    os.makedirs(directorio, exist_ok=True)
+    por_hoja = filas * columnas
+    n_hojas = -(-len(g) // por_hoja)
+    trabajos = []
+    for h in range(n_hojas):
+        a, b = h * por_hoja, min(len(g), (h + 1) * por_hoja)
+        path = os.path.join(directorio, f"{prefijo}_{h:04d}.png")
+        txt = f"{titulo} {a}-{b - 1} / {len(g)}".strip()
+        trabajos.append((g[a:b], None if fit is None else fit[a:b], a, pmin, pmax, filas, columnas, path, txt, dpi))
+
+    forma = (pmax - pmin + 1, g.shape[1])
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    procesos = min(procesos, n_hojas // HOJAS_MIN_POR_PROCESO)
+    if procesos <= 1:
+        paths = [_render_hoja(*t) for t in trabajos]
+    else:
+        # Lienzo creado al arrancar cada worker (con fork heredan además los imports de aquí)
+        _preparar_lienzo(filas, columnas, forma, dpi)
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_calentar_worker,
+                                 initargs=(filas, columnas, forma, dpi)) as pool:
+            paths = list(pool.map(_render_hoja, *zip(*trabajos)))
+    print(f"✅ Guardadas {len(paths)} hojas ({len(g)} melodías) en {directorio}")
+    return paths
+
+def render_genes_bin(path, directorio=None, **kwargs):
+    # Hojas de un archivo de genomas (logs/top_k/genes.bin, logs/archivo/genes.bin, exportar_lote...)
+    from ga.archivo_genes import abrir_genes
+
+    filas = abrir_genes(path)
+    if directorio is None:
+        directorio = os.path.join(HOJAS_DIR, os.path.basename(os.path.dirname(os.path.abspath(path))))
+    return render_hojas(filas["genes"], filas["fitness"], directorio=directorio,
+                        titulo=kwargs.pop("titulo", path), **kwargs)
+
 if __name__ == "__main__":
-    genes = cargar_genes(GENES_PATH)
-    plot_pianoroll(genes)
+    # python plot_pianoroll.py                  -> mejor melodía (logs/mejor_genes.txt)
+    # python plot_pianoroll.py a/genes.bin ...  -> hojas de contactos de cada archivo de genomas
+    if len(sys.argv) > 1:
+        for p in sys.argv[1:]:
+            render_genes_bin(p)
+    else:
+        genes = cargar_genes(GENES_PATH)
+        plot_pianoroll(genes)
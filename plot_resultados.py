@@ -1,9 +1,12 @@
 import csv
 import os
-import matplotlib.pyplot as plt
+import sys
 
 CSV_PATH = os.path.join("logs", "ga_run.csv")
 
+# Ancho de las figuras en píxeles: las curvas se reducen a min/max por píxel antes de dibujar
+ANCHO_PX = 1200
+
 def leer_csv(path):
     rows = []
     with open(path, "r", encoding="utf-8") as f:
@@ -18,14 +21,32 @@ def leer_csv(path):
             })
     return rows
 
-def plot_fitness(rows):
-    gens = [x["gen"] for x in rows]
-    bg = [x["best_global"] for x in rows]
-    bg_gen = [x["best_gen"] for x in rows]
+def leer_historial(columnas, runs=None, directorio=None):
+    # Sólo se abren (memory-map) las columnas pedidas: {columna: [array por run]}
+    from ga.historial import HistorialRuns, HISTORIAL_DIR
+
+    hist = HistorialRuns(directorio or HISTORIAL_DIR)
+    return {c: hist.series(c, runs) for c in columnas}
+
+def _columna(datos, k):
+    # datos: filas de leer_csv o {columna: array} de un run del historial
+    import numpy as np
+
+    if isinstance(datos, dict):
+        return np.asarray(datos[k])
+    return np.asarray([x[k] for x in datos])
+
+def _reducida(datos, k, ancho_px=ANCHO_PX):
+    from ga.historial import reducir_minmax
+
+    return reducir_minmax(_columna(datos, "gen"), _columna(datos, k), ancho_px)
+
+def plot_fitness(rows, ancho_px=ANCHO_PX):
+    import matplotlib.pyplot as plt
 
     plt.figure()
-    plt.plot(gens, bg, label="Mejor global")
-    plt.plot(gens, bg_gen, label="Mejor de la generación", alpha=0.7)
+    plt.plot(*_reducida(rows, "best_global", ancho_px), label="Mejor global")
+    plt.plot(*_reducida(rows, "best_gen", ancho_px), label="Mejor de la generación", alpha=0.7)
     plt.xlabel("Generación")
     plt.ylabel("Fitness")
     plt.title("Evolución del fitness")
@@ -35,12 +56,11 @@ def plot_fitness(rows):
     plt.close()
     print(f"✅ Guardado: {out}")
 
-def plot_pmut(rows):
-    gens = [x["gen"] for x in rows]
-    pm = [x["p_mut"] for x in rows]
+def plot_pmut(rows, ancho_px=ANCHO_PX):
+    import matplotlib.pyplot as plt
 
     plt.figure()
-    plt.plot(gens, pm)
+    plt.plot(*_reducida(rows, "p_mut", ancho_px))
     plt.xlabel("Generación")
     plt.ylabel("p_mut")
     plt.title("Evolución de la probabilidad de mutación")
@@ -49,7 +69,50 @@ def plot_pmut(rows):
     plt.close()
     print(f"✅ Guardado: {out}")
 
+def plot_curvas(columna="best_global", runs=None, directorio=None, ancho_px=ANCHO_PX):
+    # Curvas de muchas ejecuciones superpuestas (una sola LineCollection)
+    import numpy as np
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from ga.historial import reducir_minmax
+
+    datos = leer_historial(("gen", columna), runs, directorio)
+    if not datos["gen"]:
+        print("No hay ejecuciones en el historial.")
+        return
+
+    # Cada run se reduce a su fracción del ancho (más generaciones -> más cubos)
+    g_max = max(len(g) for g in datos["gen"])
+    segmentos = []
+    for g, y in zip(datos["gen"], datos[columna]):
+        xs, ys = reducir_minmax(g, y, max(1, ancho_px * len(g) // g_max))
+        segmentos.append(np.column_stack([xs, ys]))
+
+    fig, ax = plt.subplots()
+    alpha = max(0.05, min(1.0, 20.0 / len(segmentos)))
+    ax.add_collection(LineCollection(segmentos, linewidths=0.8, alpha=alpha))
+    ax.autoscale()
+    ax.set_xlabel("Generación")
+    ax.set_ylabel(columna)
+    ax.set_title(f"{columna} en {len(segmentos)} ejecuciones")
+    out = os.path.join("logs", f"curvas_{columna}.png")
+    fig.savefig(out, dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    print(f"✅ Guardado: {out}")
+
 if __name__ == "__main__":
-    rows = leer_csv(CSV_PATH)
+    # python plot_resultados.py          -> última ejecución + curvas de todas (historial) o CSV
+    # python plot_resultados.py 3 7 12   -> curvas de esas ejecuciones del historial
+    from ga.historial import HistorialRuns
+
+    hist = HistorialRuns()
+    if len(hist):
+        runs = [int(a) for a in sys.argv[1:]] or None
+        ultimo = len(hist) - 1 if runs is None else runs[-1]
+        datos = leer_historial(("gen", "best_global", "best_gen", "p_mut"), [ultimo])
+        rows = {k: v[0] for k, v in datos.items()}
+        plot_curvas("best_global", runs)
+    else:
+        rows = leer_csv(CSV_PATH)
     plot_fitness(rows)
     plot_pmut(rows)
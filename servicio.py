@@ -0,0 +1,530 @@
+# servicio.py
+
+"""
+Servicio local de generación de melodías (asyncio + HTTP/1.1 mínimo).
+
+    python servicio.py                       -> escucha en SERVICIO_HOST:SERVICIO_PUERTO
+    python servicio.py unix:/tmp/ga.sock     -> escucha en un socket Unix
+    python servicio.py --cliente trabajo.json [puerto | unix:/ruta]
+    python servicio.py --cliente lote.json    [puerto | unix:/ruta]   ({"trabajos": [...]} -> /lotes)
+
+Rutas:
+    POST /trabajos   cuerpo JSON (ver ServicioMelodias.enviar)
+    POST /lotes      muchos trabajos en un GA vectorizado (ver ServicioMelodias.enviar_lote)
+    GET  /estado     contadores del servicio
+
+Los workers del pool se mantienen vivos (imports y cachés calientes) y los
+contextos musicales de los MIDI recibidos se guardan por hash de contenido.
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import time
+import base64
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Optional
+
+import config as cfg
+
+from ga.aleatorio import SemillaRNG
+from ga.fitness import PesosFitness, calcular_fitness
+from ga.motor import ejecutar_ga
+from ga.presets import SLIDERS, pesos_desde_sliders
+from musica.acordes import chord_pitch_classes
+from musica.midi_importer import MidiImporter
+from musica.tonalidad import tonic_to_pitch_class
+from musica.smf_writer import genes_a_smf
+
+MAX_CUERPO = 4 * 1024 * 1024
+ESTADOS_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class ErrorServicio(Exception):
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# =========================================================
+# Trabajo en los procesos del pool
+# =========================================================
+
+def _calentar_worker() -> None:
+    """Primera evaluación en frío fuera del camino de las peticiones."""
+    calcular_fitness([cfg.REST] * cfg.LONGITUD_MELODIA)
+
+
+def _contexto_de_midi(data: bytes, compases: int) -> dict:
+    info = MidiImporter.cargar_bytes(data, compases_esperados=compases)
+    return _normalizar_contexto(info.bpm, info.tonica, info.modo, info.acordes)
+
+
+def _trabajo_ga(contexto: dict, pesos: PesosFitness, generaciones: int, semilla: str) -> dict:
+    cfg.TEMPO = contexto["bpm"]
+    cfg.TONICA = contexto["tonica"]
+    cfg.MODO = contexto["modo"]
+    cfg.ACORDES = list(contexto["acordes"])
+
+    semilla = SemillaRNG.desde(semilla)
+    genes, fit = ejecutar_ga(pesos, generaciones=generaciones, csv_path=None, verbose=False, semilla=semilla)
+    return {"genes": genes, "fitness": fit, "semilla": str(semilla), "midi": genes_a_smf(genes, bpm=contexto["bpm"])}
+
+
+def _trabajo_lote(contextos: list, pesos: list, generaciones: int, semilla: str) -> dict:
+    # numpy sólo en los workers que reciben lotes
+    from ga.tensorial import TrabajoGA, ejecutar_ga_lote
+
+    trabajos = [TrabajoGA(c["tonica"], c["modo"], list(c["acordes"]), p) for c, p in zip(contextos, pesos)]
+    res = ejecutar_ga_lote(trabajos, generaciones=generaciones, semilla=semilla, verbose=False)
+    return {
+        "semilla": res.semilla,
+        "resultados": [{"genes": g, "fitness": f, "midi": genes_a_smf(g, bpm=c["bpm"])}
+                       for (g, f), c in zip(res.resultados(), contextos)],
+    }
+
+
+def _normalizar_contexto(bpm, tonica, modo, acordes) -> dict:
+    """
+    Mismos valores por defecto y relleno de acordes que cfg.aplicar_midi_input.
+    Cualquier valor que el GA no pueda usar (tónica o acorde desconocidos, tipos
+    incorrectos) se rechaza aquí con ValueError, antes de llegar al pool.
+    """
+    try:
+        acordes = list(acordes) if acordes else list(cfg.ACORDES)
+        acordes = (acordes + [acordes[-1]] * cfg.COMPASES)[:cfg.COMPASES]
+        modo = (modo or cfg.MODO).strip().lower()
+        tonica = (tonica or cfg.TONICA).strip()
+        bpm = int(bpm) if bpm is not None else cfg.TEMPO
+        tonic_to_pitch_class(tonica)
+        for acorde in acordes:
+            try:
+                chord_pitch_classes(acorde)
+            except (ValueError, AttributeError) as e:
+                raise ValueError(f"Acorde no soportado: {acorde!r}") from e
+    except (TypeError, AttributeError) as e:
+        raise ValueError(f"Contexto no válido: {e}") from e
+    if modo not in ("mayor", "menor"):
+        raise ValueError(f"Modo no soportado: {modo}")
+    if bpm <= 0:
+        raise ValueError(f"bpm no válido: {bpm}")
+    return {
+        "bpm": bpm,
+        "tonica": tonica,
+        "modo": modo,
+        "acordes": acordes,
+    }
+
+
+# =========================================================
+# Servicio
+# =========================================================
+
+class ServicioMelodias:
+    """
+    Cola de trabajos GA con:
+    - límite de trabajos simultáneos (procesos del pool) y de trabajos en vuelo (max_cola)
+    - fusión de peticiones idénticas en curso (una sola ejecución, varias respuestas)
+    - caché LRU acotada de resultados y de contextos de MIDI ya analizados
+    - plazo por petición: al vencer se responde 504, pero el trabajo sigue y su
+      resultado queda en caché para la siguiente petición igual
+    """
+
+    def __init__(self, procesos: int = 2, max_cola: int = 64, max_cache: int = 256, max_contextos: int = 128):
+        self.procesos = procesos
+        self.max_cola = max_cola
+        self.max_cache = max_cache
+        self.max_contextos = max_contextos
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._limite: Optional[asyncio.Semaphore] = None
+        self._en_vuelo: dict[str, asyncio.Task] = {}
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._contextos: OrderedDict[str, dict] = OrderedDict()
+        self._en_curso = 0
+        self.contadores = {"peticiones": 0, "nueva": 0, "fusionada": 0, "cache": 0,
+                           "plazo_vencido": 0, "rechazadas": 0, "lotes": 0}
+
+    def iniciar(self) -> None:
+        """
+        Arranca y calienta el pool antes de aceptar conexiones: con fork, un worker
+        creado más tarde heredaría los sockets de clientes abiertos y su respuesta
+        no terminaría nunca (el cliente espera el cierre de la conexión).
+        """
+        self._pool = ProcessPoolExecutor(max_workers=self.procesos)
+        for f in [self._pool.submit(_calentar_worker) for _ in range(self.procesos)]:
+            f.result()
+        self._limite = asyncio.Semaphore(self.procesos)
+
+    def cerrar(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    @staticmethod
+    def _lru_poner(cache: OrderedDict, clave: str, valor, maximo: int) -> None:
+        cache[clave] = valor
+        cache.move_to_end(clave)
+        while len(cache) > maximo:
+            cache.popitem(last=False)
+
+    async def _contexto(self, trabajo: dict) -> dict:
+        if "midi_b64" not in trabajo:
+            try:
+                return _normalizar_contexto(trabajo.get("bpm"), trabajo.get("tonica"),
+                                            trabajo.get("modo"), trabajo.get("acordes"))
+            except ValueError as e:
+                raise ErrorServicio(400, str(e)) from e
+
+        data = base64.b64decode(trabajo["midi_b64"])
+        clave = hashlib.sha256(data).hexdigest()
+        if clave in self._contextos:
+            self._contextos.move_to_end(clave)
+            return self._contextos[clave]
+
+        loop = asyncio.get_running_loop()
+        try:
+            ctx = await loop.run_in_executor(self._pool, _contexto_de_midi, data, cfg.COMPASES)
+        except ValueError as e:
+            raise ErrorServicio(400, f"MIDI no válido: {e}") from e
+        self._lru_poner(self._contextos, clave, ctx, self.max_contextos)
+        return ctx
+
+    @staticmethod
+    def _pesos(trabajo: dict) -> PesosFitness:
+        if "pesos" in trabajo:
+            return PesosFitness(**trabajo["pesos"])
+        sliders = {**SLIDERS, **trabajo.get("sliders", {})}
+        return pesos_desde_sliders(**sliders)[0]
+
+    async def _ejecutar(self, clave: str, contexto: dict, pesos: PesosFitness,
+                        generaciones: int, semilla: str) -> dict:
+        try:
+            async with self._limite:
+                self._en_curso += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    res = await loop.run_in_executor(self._pool, _trabajo_ga, contexto, pesos, generaciones, semilla)
+                finally:
+                    self._en_curso -= 1
+            self._lru_poner(self._cache, clave, res, self.max_cache)
+            return res
+        finally:
+            del self._en_vuelo[clave]
+
+    @staticmethod
+    def _generaciones(trabajo: dict) -> int:
+        generaciones = int(trabajo.get("generaciones", cfg.GENERACIONES))
+        if not 1 <= generaciones <= cfg.SERVICIO_MAX_GENERACIONES:
+            raise ValueError(f"generaciones debe estar entre 1 y {cfg.SERVICIO_MAX_GENERACIONES}")
+        return generaciones
+
+    async def enviar(self, trabajo: dict) -> dict:
+        """
+        trabajo (JSON):
+        - contexto: "midi_b64" (SMF en base64) o "tonica" / "modo" / "acordes" / "bpm"
+        - fitness: "sliders" {consonancia, suavidad, sincopa, repeticion, aire: 0..100} o "pesos" (PesosFitness)
+        - "generaciones" (def cfg.GENERACIONES, máx. cfg.SERVICIO_MAX_GENERACIONES),
+          "semilla" (opcional, int o "entropia/i/j"), "plazo_s" (def 60)
+        La respuesta incluye la semilla usada (con la misma semilla, el mismo resultado en /trabajos;
+        /lotes usa otro motor y otro generador).
+        Sin semilla se deriva una del contenido de la petición: peticiones iguales sin
+        semilla comparten resultado (se fusionan y se cachean como las que la llevan).
+        """
+        self.contadores["peticiones"] += 1
+        t0 = time.perf_counter()
+
+        if not isinstance(trabajo, dict):
+            raise ErrorServicio(400, f"El trabajo debe ser un objeto JSON, no {type(trabajo).__name__}")
+        try:
+            pesos = self._pesos(trabajo)
+            generaciones = self._generaciones(trabajo)
+            semilla = trabajo.get("semilla")
+            semilla = str(SemillaRNG.desde(semilla)) if semilla is not None else None
+            plazo = float(trabajo.get("plazo_s", 60.0))
+        except (TypeError, ValueError) as e:
+            raise ErrorServicio(400, str(e)) from e
+        contexto = await self._contexto(trabajo)
+
+        clave = hashlib.sha256(json.dumps(
+            [contexto, asdict(pesos), generaciones], sort_keys=True
+        ).encode("utf-8")).digest()
+        if semilla is None:
+            # Semilla determinista por contenido: misma petición, misma clave
+            semilla = str(SemillaRNG(int.from_bytes(clave[:8], "little") >> 1))
+        clave = hashlib.sha256(clave + semilla.encode("ascii")).hexdigest()
+
+        if clave in self._cache:
+            self._cache.move_to_end(clave)
+            res, origen = self._cache[clave], "cache"
+        else:
+            tarea = self._en_vuelo.get(clave)
+            if tarea is not None:
+                origen = "fusionada"
+            else:
+                if len(self._en_vuelo) >= self.max_cola:
+                    self.contadores["rechazadas"] += 1
+                    raise ErrorServicio(503, f"Cola llena ({self.max_cola} trabajos en vuelo)")
+                tarea = asyncio.create_task(self._ejecutar(clave, contexto, pesos, generaciones, semilla))
+                self._en_vuelo[clave] = tarea
+                origen = "nueva"
+
+            try:
+                # shield: el plazo de un cliente no cancela el trabajo compartido
+                res = await asyncio.wait_for(asyncio.shield(tarea), timeout=plazo)
+            except asyncio.TimeoutError as e:
+                self.contadores["plazo_vencido"] += 1
+                raise ErrorServicio(504, f"Plazo de {plazo:.1f} s vencido (el trabajo sigue en curso)") from e
+
+        self.contadores[origen] += 1
+        return {
+            "genes": res["genes"],
+            "fitness": res["fitness"],
+            "semilla": res["semilla"],
+            "midi_b64": base64.b64encode(res["midi"]).decode("ascii"),
+            "contexto": contexto,
+            "origen": origen,
+            "ms": round((time.perf_counter() - t0) * 1000.0, 1),
+        }
+
+    async def enviar_lote(self, peticion: dict) -> dict:
+        """
+        peticion (JSON): "trabajos" (lista de hasta cfg.SERVICIO_MAX_LOTE objetos con el
+        contexto y el fitness de enviar), "generaciones", "semilla" y "plazo_s" (def 600)
+        comunes. Todos los trabajos evolucionan juntos en un GA vectorizado
+        (ga/tensorial.py: ejecutar_ga_lote) en un solo proceso del pool; es otro motor,
+        así que sus resultados no coinciden con los de /trabajos con la misma semilla.
+        Sin semilla se deriva una del contenido. Los lotes no se fusionan ni se cachean.
+        """
+        self.contadores["peticiones"] += 1
+        t0 = time.perf_counter()
+
+        if not isinstance(peticion, dict) or not isinstance(peticion.get("trabajos"), list):
+            raise ErrorServicio(400, 'El lote debe ser un objeto JSON con una lista "trabajos"')
+        trabajos = peticion["trabajos"]
+        if not 1 <= len(trabajos) <= cfg.SERVICIO_MAX_LOTE:
+            raise ErrorServicio(400, f"Un lote lleva entre 1 y {cfg.SERVICIO_MAX_LOTE} trabajos")
+        if not all(isinstance(t, dict) for t in trabajos):
+            raise ErrorServicio(400, "Cada trabajo del lote debe ser un objeto JSON")
+        try:
+            pesos = [self._pesos(t) for t in trabajos]
+            generaciones = self._generaciones(peticion)
+            semilla = peticion.get("semilla")
+            semilla = str(SemillaRNG.desde(semilla)) if semilla is not None else None
+            plazo = float(peticion.get("plazo_s", 600.0))
+        except (TypeError, ValueError) as e:
+            raise ErrorServicio(400, str(e)) from e
+        contextos = [await self._contexto(t) for t in trabajos]
+
+        if semilla is None:
+            clave = hashlib.sha256(json.dumps(
+                [contextos, [asdict(p) for p in pesos], generaciones], sort_keys=True
+            ).encode("utf-8")).digest()
+            semilla = str(SemillaRNG(int.from_bytes(clave[:8], "little") >> 1))
+
+        if len(self._en_vuelo) >= self.max_cola:
+            self.contadores["rechazadas"] += 1
+            raise ErrorServicio(503, f"Cola llena ({self.max_cola} trabajos en vuelo)")
+
+        async def _ejecutar_lote() -> dict:
+            async with self._limite:
+                self._en_curso += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self._pool, _trabajo_lote, contextos, pesos,
+                                                      generaciones, semilla)
+                finally:
+                    self._en_curso -= 1
+
+        # Cuenta en la cola como un trabajo más (clave única: nadie se fusiona con un lote)
+        clave = f"lote/{time.monotonic_ns()}"
+        self._en_vuelo[clave] = asyncio.current_task()
+        try:
+            res = await asyncio.wait_for(_ejecutar_lote(), timeout=plazo)
+        except asyncio.TimeoutError as e:
+            self.contadores["plazo_vencido"] += 1
+            raise ErrorServicio(504, f"Plazo de {plazo:.1f} s vencido (el resultado del lote se descarta)") from e
+        finally:
+            del self._en_vuelo[clave]
+
+        self.contadores["lotes"] += 1
+        return {
+            "semilla": res["semilla"],
+            "resultados": [
+                {"genes": r["genes"], "fitness": r["fitness"], "contexto": c,
+                 "midi_b64": base64.b64encode(r["midi"]).decode("ascii")}
+                for r, c in zip(res["resultados"], contextos)
+            ],
+            "ms": round((time.perf_counter() - t0) * 1000.0, 1),
+        }
+
+    def estado(self) -> dict:
+        return {
+            **self.contadores,
+            "en_curso": self._en_curso,
+            "en_cola": len(self._en_vuelo) - self._en_curso,
+            "cache_resultados": len(self._cache),
+            "cache_contextos": len(self._contextos),
+        }
+
+    # -----------------------------------------------------
+    # HTTP
+    # -----------------------------------------------------
+
+    async def _manejar(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                metodo, ruta, cuerpo = await _leer_peticion(reader)
+                if metodo == "GET" and ruta == "/estado":
+                    estado, resp = 200, self.estado()
+                elif metodo == "POST" and ruta == "/trabajos":
+                    estado, resp = 200, await self.enviar(json.loads(cuerpo or b"{}"))
+                elif metodo == "POST" and ruta == "/lotes":
+                    estado, resp = 200, await self.enviar_lote(json.loads(cuerpo or b"{}"))
+                else:
+                    raise ErrorServicio(404, f"Ruta desconocida: {metodo} {ruta}")
+            except ErrorServicio as e:
+                estado, resp = e.estado, {"error": str(e)}
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                estado, resp = 400, {"error": f"JSON no válido: {e}"}
+            except Exception as e:
+                estado, resp = 500, {"error": f"{type(e).__name__}: {e}"}
+
+            writer.write(_respuesta(estado, resp))
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def servir(self, host: str = "127.0.0.1", puerto: int = 8765, unix: Optional[str] = None) -> None:
+        self.iniciar()
+        try:
+            if unix is not None:
+                servidor = await asyncio.start_unix_server(self._manejar, path=unix)
+                print(f"🎧 Servicio escuchando en unix:{unix}")
+            else:
+                servidor = await asyncio.start_server(self._manejar, host, puerto)
+                print(f"🎧 Servicio escuchando en http://{host}:{puerto}")
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            self.cerrar()
+
+
+async def _leer_peticion(reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+    linea = (await reader.readline()).decode("latin-1").split()
+    if len(linea) < 2:
+        raise ErrorServicio(400, "Línea de petición HTTP no válida")
+    metodo, ruta = linea[0].upper(), linea[1]
+
+    longitud = 0
+    while True:
+        cab = await reader.readline()
+        if cab in (b"\r\n", b"\n", b""):
+            break
+        nombre, _, valor = cab.decode("latin-1").partition(":")
+        if nombre.strip().lower() == "content-length":
+            try:
+                longitud = int(valor.strip())
+            except ValueError as e:
+                raise ErrorServicio(400, f"Content-Length no válido: {valor.strip()!r}") from e
+            if longitud < 0:
+                raise ErrorServicio(400, f"Content-Length no válido: {longitud}")
+
+    if longitud > MAX_CUERPO:
+        raise ErrorServicio(413, f"Cuerpo de {longitud} bytes (máximo {MAX_CUERPO})")
+    cuerpo = await reader.readexactly(longitud) if longitud else b""
+    return metodo, ruta, cuerpo
+
+
+def _respuesta(estado: int, datos: dict) -> bytes:
+    cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+    cabecera = (f"HTTP/1.1 {estado} {ESTADOS_HTTP.get(estado, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(cuerpo)}\r\n"
+                f"Connection: close\r\n\r\n")
+    return cabecera.encode("latin-1") + cuerpo
+
+
+# =========================================================
+# Cliente local
+# =========================================================
+
+async def solicitar(
+    trabajo: Optional[dict] = None,
+    host: str = "127.0.0.1",
+    puerto: int = 8765,
+    unix: Optional[str] = None,
+    ruta: str = "/trabajos",
+) -> tuple[int, dict]:
+    """POST a ruta con el trabajo dado (o GET /estado si es None). Devuelve (estado HTTP, JSON)."""
+    if unix is not None:
+        reader, writer = await asyncio.open_unix_connection(unix)
+    else:
+        reader, writer = await asyncio.open_connection(host, puerto)
+
+    if trabajo is None:
+        peticion = b"GET /estado HTTP/1.1\r\nHost: local\r\n\r\n"
+    else:
+        cuerpo = json.dumps(trabajo).encode("utf-8")
+        peticion = (f"POST {ruta} HTTP/1.1\r\nHost: local\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(cuerpo)}\r\n\r\n").encode("latin-1") + cuerpo
+    writer.write(peticion)
+    await writer.drain()
+
+    datos = await reader.read()
+    writer.close()
+    cabecera, _, cuerpo = datos.partition(b"\r\n\r\n")
+    estado = int(cabecera.split(b" ", 2)[1])
+    return estado, json.loads(cuerpo)
+
+
+def _destino(arg: Optional[str]) -> dict:
+    if arg is None:
+        return {"puerto": cfg.SERVICIO_PUERTO}
+    if arg.startswith("unix:"):
+        return {"unix": arg[len("unix:"):]}
+    return {"puerto": int(arg)}
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    if args and args[0] == "--cliente":
+        with open(args[1], "r", encoding="utf-8") as f:
+            trabajo = json.load(f)
+        lote = isinstance(trabajo, dict) and "trabajos" in trabajo
+        estado, resp = asyncio.run(solicitar(trabajo, host=cfg.SERVICIO_HOST, ruta="/lotes" if lote else "/trabajos",
+                                             **_destino(args[2] if len(args) > 2 else None)))
+        if estado != 200:
+            print(f"❌ {estado}: {resp.get('error')}")
+            sys.exit(1)
+        if lote:
+            for i, r in enumerate(resp["resultados"]):
+                with open(f"resultado_{i:03d}.mid", "wb") as f:
+                    f.write(base64.b64decode(r["midi_b64"]))
+            media = sum(r["fitness"] for r in resp["resultados"]) / len(resp["resultados"])
+            print(f"✅ {len(resp['resultados'])} trabajos | fitness medio={media:.3f} | {resp['ms']} ms "
+                  f"-> resultado_000.mid ...")
+            sys.exit(0)
+        with open("resultado.mid", "wb") as f:
+            f.write(base64.b64decode(resp["midi_b64"]))
+        print(f"✅ fitness={resp['fitness']:.3f} | origen={resp['origen']} | {resp['ms']} ms -> resultado.mid")
+        sys.exit(0)
+
+    servicio = ServicioMelodias(
+        procesos=cfg.SERVICIO_PROCESOS,
+        max_cola=cfg.SERVICIO_MAX_COLA,
+        max_cache=cfg.SERVICIO_MAX_CACHE,
+    )
+    try:
+        asyncio.run(servicio.servir(host=cfg.SERVICIO_HOST, **_destino(args[0] if args else None)))
+    except KeyboardInterrupt:
+        print("\n👋 Servicio detenido")
@@ -0,0 +1,20 @@
+# tests/test_arranque.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arranque
+
+
+def test_arranque_solo_ga_sin_librerias_pesadas():
+    ms, pesados = arranque.medir_arranque(arranque.CODIGO_GA, repeticiones=3)
+    assert not pesados, f"'{arranque.CODIGO_GA}' carga {pesados}"
+    assert ms <= arranque.PRESUPUESTO_GA_MS, f"{ms:.1f} ms > {arranque.PRESUPUESTO_GA_MS:.0f} ms"
+
+
+def test_import_main_sin_librerias_pesadas():
+    ms, pesados = arranque.medir_arranque(arranque.CODIGO_MAIN, repeticiones=3)
+    assert not pesados, f"'{arranque.CODIGO_MAIN}' carga {pesados} (deben importarse dentro de main())"
+    assert ms <= arranque.PRESUPUESTO_MAIN_MS, f"{ms:.1f} ms > {arranque.PRESUPUESTO_MAIN_MS:.0f} ms"